@@ -8,12 +8,12 @@ including credential storage, token refresh, and secure access.
 import os
 import pickle
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, Resource
 
 # Gmail API scope - readonly access only
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
@@ -116,6 +116,19 @@ class GmailAuthenticator:
         service = build('gmail', 'v1', credentials=creds)
         return service
 
+    def get_service_factory(self) -> Callable[[], Resource]:
+        """
+        Get a factory that builds independent Gmail API service objects
+
+        Every service built by the factory has its own HTTP transport, so one
+        can be created per worker thread (httplib2 is not thread-safe).
+
+        Returns:
+            Callable returning a new Gmail API service object
+        """
+        creds = self.authenticate()
+        return lambda: build('gmail', 'v1', credentials=creds)
+
     def is_authenticated(self) -> bool:
         """
         Check if valid credentials exist
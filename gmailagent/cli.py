@@ -5,6 +5,7 @@ This module provides the CLI interface for GmailAgent using Click.
 Handles all user commands and orchestrates the email export workflow.
 """
 
+import itertools
 import sys
 from pathlib import Path
 from typing import Optional
@@ -14,7 +15,12 @@ import click
 from .auth import GmailAuthenticator, setup_credentials
 from .gmail_client import GmailClient
 from .url_extractor import extract_urls_from_emails
-from .excel_exporter import export_emails_to_excel
+from .excel_exporter import ExcelExporter, export_emails_to_excel
+from .export_formats import EXCEL_EXTENSION, EXPORT_FORMATS, get_export_format
+from .message_cache import MessageCache, DEFAULT_CACHE_SIZE_MB
+from .message_filter import MessageFilter
+from .pipeline import stream_emails_to_excel
+from .sync_state import SyncStateStore
 
 
 @click.group()
@@ -103,9 +109,31 @@ def auth(credentials: Optional[str]):
 @click.option('--before', help='Filter emails before date (YYYY-MM-DD or YYYY/MM/DD)')
 @click.option('--newer-than', help='Filter emails newer than (e.g., 7d for 7 days, 2m for 2 months)')
 @click.option('--older-than', help='Filter emails older than (e.g., 7d for 7 days, 2m for 2 months)')
-@click.option('--output', type=click.Path(), help='Custom output file path (overrides auto-naming)')
+@click.option('--output', type=click.Path(),
+              help='Custom output file path (overrides auto-naming); the extension selects the format: '
+                   f"{', '.join([EXCEL_EXTENSION] + list(EXPORT_FORMATS))}")
 @click.option('--limit', default=1000, help='Maximum number of emails to retrieve (default: 1000)')
-def export(folder, label, tag, from_email, to_email, subject, after, before, newer_than, older_than, output, limit):
+@click.option('--concurrency', default=1, type=click.IntRange(min=1),
+              help='Number of parallel workers fetching emails (default: 1, batched requests)')
+@click.option('--shards', default=1, type=click.IntRange(min=1),
+              help='Split the --after/--newer-than date range into this many windows whose message '
+                   'lists are fetched in parallel (default: 1)')
+@click.option('--incremental', is_flag=True,
+              help='Only fetch emails that arrived since the last export with the same filters '
+                   'and merge them into that export (written to --output instead, if given)')
+@click.option('--no-cache', is_flag=True, help='Do not use or update the local message cache')
+@click.option('--cache-size', default=DEFAULT_CACHE_SIZE_MB, type=click.IntRange(min=1),
+              help=f'Maximum size of the local message cache in MB (default: {DEFAULT_CACHE_SIZE_MB})')
+@click.option('--subject-regex', help='Only export emails whose subject matches this regular expression '
+                                     '(headers are checked before downloading full emails)')
+@click.option('--sender', 'senders', multiple=True,
+              help='Only export emails from this sender or domain (repeatable; headers are checked '
+                   'before downloading full emails)')
+@click.option('--stream', is_flag=True,
+              help='Stream emails straight into the Excel file without holding them all in memory '
+                   '(rows keep Gmail\'s newest-first order)')
+def export(folder, label, tag, from_email, to_email, subject, after, before, newer_than, older_than, output, limit,
+           concurrency, shards, incremental, no_cache, cache_size, subject_regex, senders, stream):
     """
     Export emails to Excel with URL extraction
 
@@ -117,9 +145,16 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
       gmailagent export --folder "INBOX" --from "boss@company.com"
       gmailagent export --tag "clients" --subject "invoice"
       gmailagent export --label "Important" --output custom.xlsx
+      gmailagent export --label "homework" --output homework.parquet
       gmailagent export --label "homework" --after "2025-11-01"
       gmailagent export --subject "Assignment" --newer-than "7d"
       gmailagent export --label "homework" --subject "Lesson 19" --after "2025-12-01"
+      gmailagent export --label "homework" --concurrency 8
+      gmailagent export --label "homework" --newer-than "1y" --shards 8 --stream
+      gmailagent export --label "homework" --incremental
+      gmailagent export --label "homework" --no-cache
+      gmailagent export --label "homework" --subject-regex "lesson ?1[0-9]" --sender "@university.edu"
+      gmailagent export --label "homework" --after "2025-01-01" --stream
     """
     click.echo("=" * 60)
     click.echo("GmailAgent - Email Export")
@@ -135,6 +170,19 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
             click.echo("Export cancelled.")
             return
 
+    try:
+        message_filter = MessageFilter(subject_regex, list(senders))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--subject-regex'")
+
+    if output:
+        try:
+            export_format = get_export_format(output)
+            if export_format:
+                export_format.check_available()
+        except (ValueError, ImportError) as e:
+            raise click.BadParameter(str(e), param_hint="'--output'")
+
     try:
         # Authenticate
         click.echo("Authenticating with Gmail API...")
@@ -143,8 +191,10 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
         click.echo("[OK] Authenticated successfully")
         click.echo()
 
-        # Initialize Gmail client
-        client = GmailClient(service)
+        # Initialize Gmail client (one HTTP transport per worker thread)
+        service_factory = authenticator.get_service_factory() if concurrency > 1 or shards > 1 else None
+        cache = None if no_cache else MessageCache(max_size_mb=cache_size)
+        client = GmailClient(service, service_factory=service_factory, cache=cache)
 
         # Get active filters
         filters = client.get_active_filters(
@@ -167,6 +217,45 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
                 click.echo(f"  - {key}: {value}")
             click.echo()
 
+        if message_filter:
+            click.echo(f"Message filter (checked on headers first): {message_filter}")
+            click.echo()
+
+        query = client.build_query(
+            folder=folder,
+            label=label,
+            tag=tag,
+            from_email=from_email,
+            to_email=to_email,
+            subject=subject,
+            after=after,
+            before=before,
+            newer_than=newer_than,
+            older_than=older_than
+        )
+        sync_store = SyncStateStore()
+        # The client-side filter changes the exported set, so it is part of the sync key
+        sync_key = f"{query} {message_filter}".strip() if message_filter else query
+
+        if incremental:
+            sync_state = sync_store.get(sync_key)
+            if not sync_state or not Path(sync_state['output_file']).exists():
+                click.echo("No previous export found for these filters. Running a full export.")
+                click.echo()
+            elif _export_incremental(client, query, sync_key, sync_store, sync_state, limit, concurrency,
+                                     message_filter, output):
+                return
+
+        # Record the mailbox position before listing, so nothing that
+        # arrives during the export is missed by the next incremental run
+        history_id = client.get_history_id()
+
+        if stream:
+            result = _export_streaming(client, query, filters, output, limit, concurrency, shards, message_filter)
+            if result and history_id:
+                sync_store.save(sync_key, history_id, result['message_ids'], result['output_file'])
+            return
+
         # Retrieve emails
         click.echo(f"Retrieving emails (max: {limit})...")
         emails = client.retrieve_emails(
@@ -180,7 +269,10 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
             before=before,
             newer_than=newer_than,
             older_than=older_than,
-            max_results=limit
+            max_results=limit,
+            concurrency=concurrency,
+            message_filter=message_filter or None,
+            shards=shards
         )
 
         if not emails:
@@ -201,16 +293,19 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
         click.echo(f"[OK] Extracted {total_urls} URLs from {emails_with_urls} emails")
         click.echo()
 
-        # Export to Excel
-        click.echo("Generating Excel file...")
+        # Export to Excel (or the format of the output file)
+        click.echo("Generating export file...")
         output_file = export_emails_to_excel(
             emails=emails,
             filters=filters,
             output_path=output
         )
-        click.echo(f"[OK] Excel file created")
+        click.echo(f"[OK] Export file created")
         click.echo()
 
+        if history_id:
+            sync_store.save(sync_key, history_id, [email['id'] for email in emails], output_file)
+
         # Display results
         click.echo("=" * 60)
         click.echo(f"[OK] Exported {len(emails)} emails to: {output_file}")
@@ -231,6 +326,151 @@ def export(folder, label, tag, from_email, to_email, subject, after, before, new
         sys.exit(1)
 
 
+def _export_streaming(client, query, filters, output, limit, concurrency, shards, message_filter):
+    """
+    Export emails through the streaming pipeline (list, fetch, extract URLs, write row)
+
+    Args:
+        client: GmailClient instance
+        query: Gmail search query
+        filters: Active filters for filename generation
+        output: Custom output path (or None)
+        limit: Maximum number of emails
+        concurrency: Number of parallel fetch workers
+        shards: Number of date windows listed in parallel
+        message_filter: Client-side MessageFilter (may be empty)
+
+    Returns:
+        Pipeline result dictionary, or None if no emails were found
+    """
+    click.echo(f"Retrieving emails (max: {limit}, streaming)...")
+    click.echo(f"Search query: {query if query else '(all emails)'}")
+    windows = client.plan_queries(query, shards)
+    if len(windows) > 1:
+        click.echo(f"Listing {len(windows)} date windows in parallel")
+
+    # Emails are fetched while the message list is still being retrieved
+    message_ids = client.iter_message_ids(query, limit, shards=shards)
+    first_id = next(message_ids, None)
+
+    if first_id is None:
+        click.echo()
+        click.echo("No emails found matching the specified filters.")
+        return None
+
+    click.echo("Streaming to export file...")
+    result = stream_emails_to_excel(
+        client,
+        itertools.chain([first_id], message_ids),
+        filters,
+        output_path=output,
+        concurrency=concurrency,
+        message_filter=message_filter or None
+    )
+
+    if not result['emails']:
+        click.echo()
+        click.echo("No emails found matching the specified filters.")
+        return None
+
+    click.echo(f"[OK] Extracted {result['urls']} URLs from {result['emails_with_urls']} emails")
+    click.echo()
+    click.echo("=" * 60)
+    click.echo(f"[OK] Exported {result['emails']} emails to: {result['output_file']}")
+    click.echo("=" * 60)
+    return result
+
+
+def _export_incremental(client, query, sync_key, sync_store, sync_state, limit, concurrency,
+                        message_filter, output=None) -> bool:
+    """
+    Merge emails that arrived since the last export into that export
+
+    With output, the merged export is written there (in the format of its
+    extension) and becomes the export later incremental runs merge into.
+
+    Args:
+        client: GmailClient instance
+        query: Gmail search query of the export
+        sync_key: Key of the export's state in sync_store
+        sync_store: SyncStateStore holding the export's state
+        sync_state: State recorded by the previous export
+        limit: Maximum number of emails
+        concurrency: Number of parallel fetch workers
+        message_filter: Client-side MessageFilter (may be empty)
+        output: Custom output path (or None to update the previous export)
+
+    Returns:
+        True if the export was updated, False if a full export is needed
+    """
+    known_ids = set(sync_state['message_ids'])
+    click.echo(f"Incremental export (last sync: {sync_state['updated']})")
+
+    emails, history_id = client.retrieve_new_emails(
+        query,
+        sync_state['history_id'],
+        known_ids,
+        max_results=limit,
+        concurrency=concurrency,
+        message_filter=message_filter or None
+    )
+
+    if emails is None:
+        click.echo("Falling back to a full export.")
+        click.echo()
+        return False
+
+    output_file = sync_state['output_file']
+
+    if not emails:
+        if output:
+            output_file = ExcelExporter().merge_into_excel([], output_file, output)
+        sync_store.save(sync_key, history_id, known_ids, output_file)
+        click.echo()
+        click.echo(f"No new emails since the last export. Export is up to date: {output_file}")
+        return True
+
+    click.echo(f"[OK] Retrieved {len(emails)} new emails")
+    click.echo()
+
+    click.echo("Extracting URLs from email bodies...")
+    emails = extract_urls_from_emails(emails)
+
+    click.echo("Merging into existing export file...")
+    output_file = ExcelExporter().merge_into_excel(emails, output_file, output)
+    sync_store.save(sync_key, history_id, known_ids | {email['id'] for email in emails}, output_file)
+
+    click.echo("=" * 60)
+    click.echo(f"[OK] Added {len(emails)} emails to: {output_file}")
+    click.echo("=" * 60)
+    return True
+
+
+@cli.command()
+@click.argument('source', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', type=click.Path(), help='Excel file path (default: SOURCE with an .xlsx extension)')
+def render(source: str, output: Optional[str]):
+    """
+    Render an export as a styled Excel file
+
+    Turns a .csv, .jsonl, .parquet or .sqlite export into the Excel file
+    the export command writes by default.
+
+    Examples:
+      gmailagent render exports/homework.parquet
+      gmailagent render exports/homework.sqlite --output homework.xlsx
+    """
+    try:
+        if not get_export_format(source):
+            raise click.BadParameter("Already an Excel file", param_hint="'SOURCE'")
+        output_file = ExcelExporter().create_excel_from_export(source, output)
+    except (ValueError, ImportError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"[OK] Excel file created: {output_file}")
+
+
 @cli.command()
 def list_labels():
     """
@@ -387,7 +627,8 @@ def info():
     # Check if exports directory exists
     exports_dir = Path("./exports")
     if exports_dir.exists():
-        files = list(exports_dir.glob("*.xlsx"))
+        extensions = {EXCEL_EXTENSION, *EXPORT_FORMATS}
+        files = [path for path in exports_dir.iterdir() if path.suffix.lower() in extensions]
         click.echo(f"Exported Files: {len(files)}")
     else:
         click.echo("Exported Files: 0")
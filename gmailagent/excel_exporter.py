@@ -2,7 +2,9 @@
 Excel Export Module
 
 This module handles Excel file generation with smart filename generation
-based on active filters and organized folder structure.
+based on active filters and organized folder structure. Exports to a .csv,
+.jsonl, .parquet or .sqlite path are written by the matching export format
+instead (see export_formats), and can be rendered to Excel afterwards.
 """
 
 import os
@@ -10,18 +12,51 @@ import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 
+from .export_formats import get_export_format
+from .url_extractor import select_repository
+
+# Namespace of row IDs derived from Gmail message IDs (UUIDv5), so a message
+# keeps its row ID across exports
+ROW_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://mail.google.com/mail/#message')
+
+
+def row_id(message_id: Optional[str]) -> str:
+    """
+    Get the row ID of a Gmail message
+
+    Args:
+        message_id: Gmail message ID
+
+    Returns:
+        UUIDv5 of the message ID (a random UUID if the ID is unknown)
+    """
+    if not message_id:
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(ROW_ID_NAMESPACE, message_id))
+
 
 class ExcelExporter:
     """Export emails to Excel with smart naming and formatting"""
 
     DEFAULT_EXPORTS_DIR = "./exports"
 
+    # Columns of the Emails sheet; Repo holds the GitHub repository the URLs
+    # resolve to (see url_extractor.select_repository)
+    HEADERS = ["ID", "Date", "Subject", "URL", "Repo", "Status", "Message ID", "Thread ID"]
+
+    # Raw Gmail IDs, kept for joins across exports but hidden in Excel
+    HIDDEN_COLUMNS = {'G', 'H'}
+
+    # Column widths for streamed exports (in HEADERS order)
+    STREAMING_COLUMN_WIDTHS = {'A': 40, 'B': 21, 'C': 60, 'D': 80, 'E': 60, 'F': 10, 'G': 18, 'H': 18}
+
     def __init__(self, exports_dir: Optional[str] = None):
         """
         Initialize Excel exporter
@@ -131,13 +166,16 @@ class ExcelExporter:
         """
         Generate Excel file from email data
 
+        The file format follows the extension of output_path (see
+        export_formats); generated filenames are Excel files.
+
         Args:
             emails: List of email dictionaries
             filters: Active filters for filename generation
             output_path: Custom output path (overrides auto-generation)
 
         Returns:
-            Path to the created Excel file
+            Path to the created file
         """
         # Ensure exports folder exists
         self.ensure_exports_folder()
@@ -149,14 +187,230 @@ class ExcelExporter:
             filename = self.generate_filename(filters)
             output_file = self.exports_dir / filename
 
+        # Sort emails by date (newest first)
+        sorted_emails = sorted(emails, key=lambda x: x.get('date', datetime.now()), reverse=True)
+        rows = [self._email_to_row(email) for email in sorted_emails]
+
+        self._write_rows(rows, output_file)
+
+        return str(output_file)
+
+    def create_excel_streaming(
+        self,
+        emails: Iterable[Dict],
+        filters: Dict[str, str],
+        output_path: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Generate Excel file from a stream of emails using a write-only workbook
+
+        Rows are written as they arrive and never kept in memory, so they
+        are not re-sorted: they stay in the order of the input (Gmail lists
+        messages newest first). Column widths are fixed, since they cannot
+        be measured before the rows are written. Other formats are streamed
+        too (see create_excel).
+
+        Args:
+            emails: Iterable of email dictionaries (bodies are not needed)
+            filters: Active filters for filename generation
+            output_path: Custom output path (overrides auto-generation)
+
+        Returns:
+            Tuple of (path to the created file, number of rows written)
+        """
+        self.ensure_exports_folder()
+
+        if output_path:
+            output_file = Path(output_path)
+        else:
+            output_file = self.exports_dir / self.generate_filename(filters)
+
+        export_format = get_export_format(output_file)
+        if export_format:
+            rows = (self._email_to_row(email) for email in emails)
+            return str(output_file), export_format.write(self.HEADERS, rows, output_file)
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Emails")
+
+        # Layout must be set before any row is written
+        ws.freeze_panes = "A2"
+        for column_letter, width in self.STREAMING_COLUMN_WIDTHS.items():
+            ws.column_dimensions[column_letter].width = width
+            ws.column_dimensions[column_letter].hidden = column_letter in self.HIDDEN_COLUMNS
+
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=12)
+        header_row = []
+        for header in self.HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header_row.append(cell)
+        ws.append(header_row)
+
+        count = 0
+        for email in emails:
+            ws.append(self._email_to_row(email))
+            count += 1
+
+        wb.save(output_file)
+
+        return str(output_file), count
+
+    def merge_into_excel(self, emails: List[Dict], existing_path: str, output_path: Optional[str] = None) -> str:
+        """
+        Add emails to a previously exported Excel file
+
+        Existing rows are kept as they are (exports from before the Repo
+        column get it filled in from their URLs); the new rows are added,
+        replacing earlier rows of the same Gmail message, and the sheet is
+        re-sorted by date (newest first). Exports in other formats are
+        merged the same way.
+
+        Args:
+            emails: List of new email dictionaries
+            existing_path: Path to a file written by create_excel
+            output_path: Where to write the merged export, in the format of
+                its extension (default: update existing_path in place)
+
+        Returns:
+            Path to the updated file
+        """
+        existing_file = Path(existing_path)
+        headers, existing_rows = self.read_rows(existing_file)
+
+        repo_idx, url_idx = self.HEADERS.index("Repo"), self.HEADERS.index("URL")
+        if "Repo" not in headers:
+            for row in existing_rows:
+                row[repo_idx] = select_repository(str(row[url_idx] or '').split(', ')) or ""
+
+        # A message exported again replaces its earlier row
+        new_rows = [self._email_to_row(email) for email in emails]
+        message_idx = self.HEADERS.index("Message ID")
+        new_ids = {row[message_idx] for row in new_rows if row[message_idx]}
+        existing_rows = [row for row in existing_rows if row[message_idx] not in new_ids]
+
+        rows = existing_rows + new_rows
+        # Dates are stored as "YYYY-MM-DD HH:MM:SS", which sorts chronologically
+        rows.sort(key=lambda row: str(row[1] or ''), reverse=True)
+
+        output_file = Path(output_path) if output_path else existing_file
+        self._write_rows(rows, output_file)
+
+        return str(output_file)
+
+    def create_excel_from_export(self, source_path: str, output_path: Optional[str] = None) -> str:
+        """
+        Render an export written in another format as a styled Excel file
+
+        Args:
+            source_path: Path to a .csv, .jsonl, .parquet or .sqlite export
+            output_path: Excel file path (default: source path with .xlsx)
+
+        Returns:
+            Path to the created Excel file
+        """
+        source_file = Path(source_path)
+        output_file = Path(output_path) if output_path else source_file.with_suffix('.xlsx')
+        if get_export_format(output_file):
+            raise ValueError(f"Not an Excel file: {output_file}")
+
+        _, rows = self.read_rows(source_file)
+        self._write_workbook(rows, output_file)
+
+        return str(output_file)
+
+    def read_rows(self, path: Path) -> Tuple[List[str], List[List]]:
+        """
+        Read the rows of an export in any format
+
+        Args:
+            path: Path to a file written by create_excel
+
+        Returns:
+            Tuple of (the file's column names, rows in HEADERS order)
+        """
+        export_format = get_export_format(path)
+        if export_format:
+            headers, rows = export_format.read(path)
+        else:
+            wb = load_workbook(path, read_only=True)
+            try:
+                values = wb.active.iter_rows(values_only=True)
+                headers = list(next(values, ()))
+                rows = [row for row in values if any(row)]
+            finally:
+                wb.close()
+
+        if headers == self.HEADERS:
+            return headers, [list(row) for row in rows]
+        # Map by header, so exports written before a column was added still line up
+        return headers, [[dict(zip(headers, row)).get(header) for header in self.HEADERS] for row in rows]
+
+    def _email_to_row(self, email: Dict) -> List:
+        """
+        Build an Excel data row for an email
+
+        Args:
+            email: Email dictionary
+
+        Returns:
+            Row values in HEADERS order
+        """
+        # Stable ID: the same message gets the same ID in every export
+        email_id = row_id(email.get('id'))
+
+        # Format date
+        date = email.get('date')
+        if date:
+            date_str = date.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            date_str = ""
+
+        # Get subject
+        subject = email.get('subject', '(No Subject)')
+
+        # Format URLs (comma-separated)
+        urls = email.get('urls', [])
+        url_str = ', '.join(urls) if urls else ""
+
+        # Resolved repository (empty if no URL points to one)
+        repo = email.get('repo') or ""
+
+        # Row with Status = "ready"
+        return [email_id, date_str, subject, url_str, repo, "ready", email.get('id'), email.get('thread_id')]
+
+    def _write_rows(self, rows: List[List], output_file: Path):
+        """
+        Write data rows in the format of the output file's extension
+
+        Args:
+            rows: Data rows (see _email_to_row)
+            output_file: Destination path
+        """
+        export_format = get_export_format(output_file)
+        if export_format:
+            export_format.write(self.HEADERS, rows, output_file)
+        else:
+            self._write_workbook(rows, output_file)
+
+    def _write_workbook(self, rows: List[List], output_file: Path):
+        """
+        Write the styled Emails sheet
+
+        Args:
+            rows: Data rows (see _email_to_row)
+            output_file: Destination path
+        """
         # Create workbook
         wb = Workbook()
         ws = wb.active
         ws.title = "Emails"
 
         # Header row
-        headers = ["ID", "Date", "Subject", "URL", "Status"]
-        ws.append(headers)
+        ws.append(self.HEADERS)
 
         # Style header row
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -167,34 +421,14 @@ class ExcelExporter:
             cell.font = header_font
             cell.alignment = Alignment(horizontal="center", vertical="center")
 
-        # Sort emails by date (newest first)
-        sorted_emails = sorted(emails, key=lambda x: x.get('date', datetime.now()), reverse=True)
-
         # Data rows
-        for email in sorted_emails:
-            # Generate unique UUID
-            email_id = str(uuid.uuid4())
-
-            # Format date
-            date = email.get('date')
-            if date:
-                date_str = date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                date_str = ""
-
-            # Get subject
-            subject = email.get('subject', '(No Subject)')
-
-            # Format URLs (comma-separated)
-            urls = email.get('urls', [])
-            url_str = ', '.join(urls) if urls else ""
-
-            # Add row with Status = "ready"
-            row = [email_id, date_str, subject, url_str, "ready"]
+        for row in rows:
             ws.append(row)
 
         # Auto-adjust column widths
         self._adjust_column_widths(ws)
+        for column_letter in self.HIDDEN_COLUMNS:
+            ws.column_dimensions[column_letter].hidden = True
 
         # Freeze header row
         ws.freeze_panes = "A2"
@@ -202,8 +436,6 @@ class ExcelExporter:
         # Save workbook
         wb.save(output_file)
 
-        return str(output_file)
-
     def _adjust_column_widths(self, ws):
         """
         Auto-adjust column widths based on content
@@ -0,0 +1,222 @@
+"""
+Export Formats Module
+
+This module writes and reads the rows of an email export (see
+ExcelExporter.HEADERS) as CSV, JSON Lines, Parquet or SQLite files. These
+are much faster to write and to read back than a styled Excel workbook,
+which ExcelExporter keeps for presentation. The format of an export is
+chosen from the extension of its file.
+"""
+
+import csv
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Extension of the styled Excel export (written by ExcelExporter itself)
+EXCEL_EXTENSION = '.xlsx'
+
+
+def _cell(value):
+    """Empty cells are stored as null, so they read back as None in every format (as in Excel)"""
+    return None if value == '' else value
+
+
+class ExportFormat(ABC):
+    """Write and read export rows in one file format"""
+
+    name = ''
+    extension = ''
+
+    def check_available(self):
+        """Raise ImportError if the libraries of the format are not installed"""
+
+    @abstractmethod
+    def write(self, headers: Sequence[str], rows: Iterable[Sequence], path: Path) -> int:
+        """
+        Write rows to a file, replacing it if it exists
+
+        Args:
+            headers: Column names
+            rows: Iterable of rows in headers order (consumed as it is written)
+            path: Destination path
+
+        Returns:
+            Number of rows written
+        """
+
+    @abstractmethod
+    def read(self, path: Path) -> Tuple[List[str], List[List]]:
+        """
+        Read an export back
+
+        Args:
+            path: Path to a file written by write
+
+        Returns:
+            Tuple of (column names, rows)
+        """
+
+
+class CSVFormat(ExportFormat):
+    """Comma-separated values with a header row"""
+
+    name = 'CSV'
+    extension = '.csv'
+
+    def write(self, headers: Sequence[str], rows: Iterable[Sequence], path: Path) -> int:
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def read(self, path: Path) -> Tuple[List[str], List[List]]:
+        with open(path, encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            # CSV has no null: empty fields are read as None
+            return headers, [[value or None for value in row] for row in reader]
+
+
+class JSONLinesFormat(ExportFormat):
+    """One JSON object per row, keyed by column name"""
+
+    name = 'JSON Lines'
+    extension = '.jsonl'
+
+    def write(self, headers: Sequence[str], rows: Iterable[Sequence], path: Path) -> int:
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                record = {header: _cell(value) for header, value in zip(headers, row)}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                count += 1
+        return count
+
+    def read(self, path: Path) -> Tuple[List[str], List[List]]:
+        headers: List[str] = []
+        rows = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record: Dict = json.loads(line)
+                if not headers:
+                    headers = list(record)
+                rows.append([record.get(header) for header in headers])
+        return headers, rows
+
+
+class ParquetFormat(ExportFormat):
+    """Apache Parquet with string columns (requires pyarrow)"""
+
+    name = 'Parquet'
+    extension = '.parquet'
+
+    # Rows per row group; only one group is held in memory while writing
+    ROW_GROUP_SIZE = 10000
+
+    def check_available(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet exports. Install with: pip install pyarrow")
+
+    def write(self, headers: Sequence[str], rows: Iterable[Sequence], path: Path) -> int:
+        self.check_available()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(header, pa.string()) for header in headers])
+        rows = iter(rows)
+        count = 0
+        with pq.ParquetWriter(str(path), schema) as writer:
+            while True:
+                group = list(islice(rows, self.ROW_GROUP_SIZE))
+                if not group:
+                    break
+                columns = [
+                    [None if row[i] is None or row[i] == '' else str(row[i]) for row in group]
+                    for i in range(len(headers))
+                ]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                count += len(group)
+        return count
+
+    def read(self, path: Path) -> Tuple[List[str], List[List]]:
+        self.check_available()
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(str(path))
+        columns = table.to_pydict()
+        return table.column_names, [list(row) for row in zip(*columns.values())]
+
+
+class SQLiteFormat(ExportFormat):
+    """SQLite database with the rows in an 'emails' table"""
+
+    name = 'SQLite'
+    extension = '.sqlite'
+
+    TABLE = 'emails'
+
+    def write(self, headers: Sequence[str], rows: Iterable[Sequence], path: Path) -> int:
+        path.unlink(missing_ok=True)
+        columns = ', '.join(f'"{header}" TEXT' for header in headers)
+        placeholders = ', '.join('?' * len(headers))
+
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.execute(f'CREATE TABLE {self.TABLE} ({columns})')
+                cursor = conn.executemany(
+                    f'INSERT INTO {self.TABLE} VALUES ({placeholders})',
+                    ([_cell(value) for value in row] for row in rows)
+                )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def read(self, path: Path) -> Tuple[List[str], List[List]]:
+        conn = sqlite3.connect(path)
+        try:
+            cursor = conn.execute(f'SELECT * FROM {self.TABLE} ORDER BY rowid')
+            headers = [column[0] for column in cursor.description]
+            return headers, [list(row) for row in cursor]
+        finally:
+            conn.close()
+
+
+EXPORT_FORMATS = {
+    export_format.extension: export_format
+    for export_format in (CSVFormat(), JSONLinesFormat(), ParquetFormat(), SQLiteFormat())
+}
+
+
+def get_export_format(path) -> Optional[ExportFormat]:
+    """
+    Get the format of an export file from its extension
+
+    Args:
+        path: Export file path
+
+    Returns:
+        ExportFormat instance, or None for a styled Excel file (.xlsx)
+
+    Raises:
+        ValueError: If the extension is not a supported export format
+    """
+    extension = Path(path).suffix.lower()
+    if extension == EXCEL_EXTENSION:
+        return None
+    if extension not in EXPORT_FORMATS:
+        supported = ', '.join([EXCEL_EXTENSION] + list(EXPORT_FORMATS))
+        raise ValueError(f"Unsupported export format '{extension or Path(path).name}' (supported: {supported})")
+    return EXPORT_FORMATS[extension]
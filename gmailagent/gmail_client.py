@@ -6,25 +6,73 @@ emails with various filters and parsing email content.
 """
 
 import base64
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from email.utils import parsedate_to_datetime
-from typing import List, Dict, Optional, Any
+from itertools import islice
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Set, Tuple
 
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
+from .message_cache import MessageCache
+from .message_filter import MessageFilter
+from .query_planner import plan_date_windows
+from .throttle import (
+    TokenBucket,
+    is_rate_limit_error,
+    MESSAGES_GET_UNITS,
+    MESSAGES_LIST_UNITS,
+    HISTORY_LIST_UNITS,
+)
+
 
 class GmailClient:
     """Gmail API client wrapper for email retrieval and filtering"""
 
-    def __init__(self, service: Resource):
+    # Gmail accepts up to 100 calls per batch but recommends 50 or fewer
+    DEFAULT_BATCH_SIZE = 50
+
+    # Headers requested in metadata-only fetches
+    METADATA_HEADERS = ['Subject', 'From', 'To', 'Date']
+
+    # Retries for a single message after rate-limit responses
+    MAX_RATE_LIMIT_RETRIES = 5
+    MAX_BACKOFF_SECONDS = 32
+
+    def __init__(
+        self,
+        service: Resource,
+        service_factory: Optional[Callable[[], Resource]] = None,
+        throttle: Optional[TokenBucket] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        cache: Optional[MessageCache] = None
+    ):
         """
         Initialize Gmail client
 
         Args:
             service: Authenticated Gmail API service object
+            service_factory: Optional callable building a new service object.
+                Required for concurrent fetching: each worker thread gets its
+                own HTTP transport, since httplib2 is not thread-safe.
+            throttle: Token bucket shared by concurrent workers
+                (default: Gmail's per-user quota)
+            sleep: Sleep function used for rate-limit backoff (injectable for tests)
+            cache: Optional on-disk cache of parsed messages; cached messages
+                are not fetched again
         """
         self.service = service
+        self.service_factory = service_factory
+        self.throttle = throttle or TokenBucket()
+        self.sleep = sleep
+        self.cache = cache
+        self._local = threading.local()
 
     def list_labels(self) -> List[Dict[str, str]]:
         """
@@ -123,11 +171,33 @@ class GmailClient:
 
         return ' '.join(query_parts) if query_parts else ''
 
+    def plan_queries(self, query: str, shards: int) -> List[str]:
+        """
+        Split a query into queries over disjoint date windows
+
+        Args:
+            query: Gmail search query with an after:/newer_than: lower bound
+            shards: Number of date windows
+
+        Returns:
+            Window queries, newest window first (just the query itself if
+            it has no date range to split)
+        """
+        queries = []
+        for after, before in plan_date_windows(query, shards):
+            window = self.build_query(
+                after=str(after) if after is not None else None,
+                before=str(before) if before is not None else None
+            )
+            queries.append(' '.join(part for part in [query, window] if part))
+        return queries
+
     def get_messages(
         self,
         query: str = '',
         max_results: int = 1000,
-        include_spam_trash: bool = False
+        include_spam_trash: bool = False,
+        shards: int = 1
     ) -> List[str]:
         """
         Get list of message IDs matching the query
@@ -136,19 +206,119 @@ class GmailClient:
             query: Gmail search query
             max_results: Maximum number of messages to retrieve
             include_spam_trash: Whether to include spam and trash
+            shards: Number of date windows listed in parallel (see iter_message_ids)
 
         Returns:
             List of message IDs
         """
-        message_ids = []
+        return list(self.iter_message_ids(query, max_results, include_spam_trash, shards))
+
+    def iter_message_ids(
+        self,
+        query: str = '',
+        max_results: int = 1000,
+        include_spam_trash: bool = False,
+        shards: int = 1
+    ) -> Iterator[str]:
+        """
+        Get message IDs matching the query as they are listed
+
+        messages.list pages can only be fetched one after another, so with
+        shards > 1 the query's date range is split into windows (see
+        plan_queries) that are listed concurrently. IDs still come out
+        newest window first, and those of the newest window as soon as its
+        first page arrives.
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of messages to retrieve
+            include_spam_trash: Whether to include spam and trash
+            shards: Number of date windows listed in parallel (1 lists the
+                query page by page; queries without an after:/newer_than:
+                term are never split)
+
+        Yields:
+            Message IDs, without duplicates
+
+        Raises:
+            ValueError: If the query is split but the client has no service_factory
+        """
+        queries = self.plan_queries(query, shards)
+        if len(queries) == 1:
+            count = 0
+            for page in self._list_pages(query, max_results, include_spam_trash, self.service):
+                for message_id in page[:max_results - count]:
+                    count += 1
+                    yield message_id
+            return
+
+        if self.service_factory is None:
+            raise ValueError(
+                "Parallel listing requires a service_factory "
+                "(httplib2 transports cannot be shared between threads)"
+            )
+
+        pages: List[queue.Queue] = [queue.Queue() for _ in queries]
+        stop = threading.Event()
+
+        def list_window(idx: int, window_query: str):
+            try:
+                for page in self._list_pages(window_query, max_results, include_spam_trash,
+                                             self._thread_service(), stop):
+                    pages[idx].put(page)
+            finally:
+                pages[idx].put(None)
+
+        seen: Set[str] = set()
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = [executor.submit(list_window, idx, window) for idx, window in enumerate(queries)]
+            try:
+                for idx, future in enumerate(futures):
+                    for page in iter(pages[idx].get, None):
+                        for message_id in page:
+                            # Adjacent windows overlap by up to a second
+                            if message_id in seen:
+                                continue
+                            seen.add(message_id)
+                            yield message_id
+                            if len(seen) >= max_results:
+                                return
+                    future.result()
+            finally:
+                # Windows still listing stop after their current page
+                stop.set()
+
+    def _list_pages(
+        self,
+        query: str,
+        max_results: int,
+        include_spam_trash: bool,
+        service: Resource,
+        stop: Optional[threading.Event] = None
+    ) -> Iterator[List[str]]:
+        """
+        List the pages of message IDs of a single query
+
+        Args:
+            query: Gmail search query
+            max_results: Maximum number of messages to list
+            include_spam_trash: Whether to include spam and trash
+            service: Service object to use
+            stop: Optional event that ends the listing before the next page
+
+        Yields:
+            Lists of message IDs, one per page
+        """
+        listed = 0
 
         try:
             page_token = None
-            while len(message_ids) < max_results:
-                results = self.service.users().messages().list(
+            while listed < max_results and not (stop and stop.is_set()):
+                self.throttle.acquire(MESSAGES_LIST_UNITS)
+                results = service.users().messages().list(
                     userId='me',
                     q=query,
-                    maxResults=min(500, max_results - len(message_ids)),
+                    maxResults=min(500, max_results - listed),
                     pageToken=page_token,
                     includeSpamTrash=include_spam_trash
                 ).execute()
@@ -157,7 +327,8 @@ class GmailClient:
                 if not messages:
                     break
 
-                message_ids.extend([msg['id'] for msg in messages])
+                listed += len(messages)
+                yield [msg['id'] for msg in messages]
 
                 page_token = results.get('nextPageToken')
                 if not page_token:
@@ -166,31 +337,334 @@ class GmailClient:
         except HttpError as error:
             print(f"Error retrieving messages: {error}")
 
-        return message_ids[:max_results]
+    def get_history_id(self) -> Optional[str]:
+        """
+        Get the mailbox's current history ID
+
+        Returns:
+            History ID string, or None on error
+        """
+        try:
+            profile = self.service.users().getProfile(userId='me').execute()
+            return profile.get('historyId')
+        except HttpError as error:
+            print(f"Error retrieving mailbox profile: {error}")
+            return None
+
+    def get_history_changes(self, start_history_id: str) -> Tuple[Optional[List[str]], Optional[str]]:
+        """
+        Get IDs of messages added to the mailbox (or labelled) since a history ID
+
+        Args:
+            start_history_id: History ID recorded at the previous sync
+
+        Returns:
+            Tuple of (message_ids, latest_history_id). message_ids is None
+            when Gmail no longer has history that old (HTTP 404), in which
+            case a full export is needed.
+        """
+        message_ids: List[str] = []
+        seen = set()
+        latest_history_id = start_history_id
+
+        try:
+            page_token = None
+            while True:
+                self.throttle.acquire(HISTORY_LIST_UNITS)
+                results = self.service.users().history().list(
+                    userId='me',
+                    startHistoryId=start_history_id,
+                    historyTypes=['messageAdded', 'labelAdded'],
+                    pageToken=page_token
+                ).execute()
+
+                for record in results.get('history', []):
+                    changes = record.get('messagesAdded', []) + record.get('labelsAdded', [])
+                    for change in changes:
+                        message_id = change.get('message', {}).get('id')
+                        if message_id and message_id not in seen:
+                            seen.add(message_id)
+                            message_ids.append(message_id)
+
+                latest_history_id = results.get('historyId', latest_history_id)
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+
+        except HttpError as error:
+            if getattr(error.resp, 'status', None) == 404:
+                print("Mailbox history has expired since the last sync.")
+                return None, None
+            print(f"Error retrieving mailbox history: {error}")
+            return None, None
+
+        return message_ids, latest_history_id
 
-    def get_message_details(self, message_id: str) -> Optional[Dict[str, Any]]:
+    def retrieve_new_emails(
+        self,
+        query: str,
+        start_history_id: str,
+        known_ids: Set[str],
+        max_results: int = 1000,
+        progress_callback: Optional[callable] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 1,
+        message_filter: Optional[MessageFilter] = None
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Retrieve emails matching a query that arrived since a previous sync
+
+        Candidates come from the mailbox history, which is not filtered:
+        their headers are fetched to date them, the query is listed from the
+        oldest candidate on, and full content is only fetched for candidates
+        the listing (and message_filter) confirms.
+
+        Args:
+            query: Gmail search query used by the previous export
+            start_history_id: History ID recorded at the previous sync
+            known_ids: Message IDs already exported
+            max_results: Maximum number of emails (the query check itself
+                is not limited, so no matching candidate is missed)
+            progress_callback: Optional callback function for progress updates
+            batch_size: Number of messages fetched per batch request
+            concurrency: Number of worker threads (see retrieve_emails)
+            message_filter: Optional client-side predicate on message headers
+
+        Returns:
+            Tuple of (emails, latest_history_id). emails is None when the
+            history has expired and a full export is required.
+        """
+        print("Fetching mailbox changes since last sync...")
+        changed_ids, latest_history_id = self.get_history_changes(start_history_id)
+        if changed_ids is None:
+            return None, None
+
+        candidates = [mid for mid in changed_ids if mid not in known_ids]
+        if not candidates:
+            print("No new messages since last sync.")
+            return [], latest_history_id
+
+        # Headers are enough to date the candidates (cached messages need no request)
+        cached = self.cache.get_many(candidates) if self.cache else {}
+        missing = [mid for mid in candidates if mid not in cached]
+        metadata = list(cached.values()) + [
+            meta for meta in self._fetch_details(missing, lambda done: None, batch_size, concurrency, 'metadata')
+            if meta
+        ]
+        if message_filter:
+            metadata = [meta for meta in metadata if message_filter.matches(meta)]
+        if not metadata:
+            return [], latest_history_id
+
+        # Only messages at least as new as the oldest candidate can match,
+        # so the query check lists a window bounded by the new mail
+        oldest = min(int(meta['date'].timestamp()) for meta in metadata)
+        window_query = ' '.join(part for part in [query, f'after:{oldest - 1}'] if part)
+        matching = set(self.get_messages(window_query, sys.maxsize))
+
+        dated = {meta['id'] for meta in metadata}
+        new_ids = [mid for mid in candidates if mid in dated and mid in matching][:max_results]
+        new_emails = self.fetch_emails(new_ids, progress_callback, batch_size, concurrency) if new_ids else []
+        print(f"Found {len(new_emails)} new messages matching filters.")
+
+        return new_emails, latest_history_id
+
+    def get_message_details(self, message_id: str, message_format: str = 'full') -> Optional[Dict[str, Any]]:
         """
         Get full details of a single message
 
         Args:
             message_id: Gmail message ID
+            message_format: 'full', or 'metadata' for headers only (empty bodies)
 
         Returns:
             Dictionary with message details or None on error
         """
         try:
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-
+            message = self._message_request(message_id, message_format=message_format).execute()
             return self._parse_message(message)
 
         except HttpError as error:
             print(f"Error retrieving message {message_id}: {error}")
             return None
 
+    def get_messages_details_batch(
+        self,
+        message_ids: List[str],
+        message_format: str = 'full'
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get full details of several messages in a single batch request
+
+        Args:
+            message_ids: Gmail message IDs (at most 100, Gmail's batch limit)
+            message_format: 'full', or 'metadata' for headers only (empty bodies)
+
+        Returns:
+            List of parsed messages in the same order as message_ids,
+            with None for messages that could not be retrieved
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        rate_limited = False
+
+        def on_response(request_id, response, exception):
+            nonlocal rate_limited
+            if exception is not None:
+                if isinstance(exception, HttpError) and is_rate_limit_error(exception):
+                    # Leave unanswered so it is retried with backoff below
+                    rate_limited = True
+                    return
+                message_id = message_ids[int(request_id)]
+                print(f"Error retrieving message {message_id}: {exception}")
+                results[request_id] = None
+            else:
+                results[request_id] = self._parse_message(response)
+
+        batch = self.service.new_batch_http_request(callback=on_response)
+        for idx, message_id in enumerate(message_ids):
+            batch.add(self._message_request(message_id, message_format=message_format), request_id=str(idx))
+
+        # Every call in a batch is charged against the per-user quota
+        self.throttle.acquire(MESSAGES_GET_UNITS * len(message_ids))
+        try:
+            batch.execute()
+        except HttpError as error:
+            print(f"Error executing batch request: {error}")
+
+        if rate_limited:
+            self.throttle.slow_down()
+
+        # Messages the batch never answered (rate-limited items, or the
+        # whole batch failed) are retried one by one with backoff, so each
+        # failure is still reported
+        details = []
+        for idx, message_id in enumerate(message_ids):
+            key = str(idx)
+            if key in results:
+                details.append(results[key])
+            else:
+                details.append(self._get_message_details_throttled(message_id, self.service, message_format))
+
+        return details
+
+    def get_messages_details_concurrent(
+        self,
+        message_ids: List[str],
+        concurrency: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        message_format: str = 'full'
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get full details of messages using a pool of worker threads
+
+        Calls are paced by the client's token bucket, and messages that hit
+        Gmail's rate limit are retried with exponential backoff.
+
+        Args:
+            message_ids: Gmail message IDs
+            concurrency: Number of worker threads
+            progress_callback: Optional callback called with (done, total)
+                as each message completes
+            message_format: 'full', or 'metadata' for headers only (empty bodies)
+
+        Returns:
+            List of parsed messages in the same order as message_ids,
+            with None for messages that could not be retrieved
+
+        Raises:
+            ValueError: If the client has no service_factory
+        """
+        if self.service_factory is None:
+            raise ValueError(
+                "Concurrent fetching requires a service_factory "
+                "(httplib2 transports cannot be shared between threads)"
+            )
+
+        details: List[Optional[Dict[str, Any]]] = [None] * len(message_ids)
+        total = len(message_ids)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(self._get_message_details_throttled, message_id, None, message_format): idx
+                for idx, message_id in enumerate(message_ids)
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                details[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback(done, total)
+
+        return details
+
+    def _get_message_details_throttled(
+        self,
+        message_id: str,
+        service: Optional[Resource] = None,
+        message_format: str = 'full'
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a single message, respecting the quota throttle and retrying
+        rate-limit responses with backoff
+
+        Args:
+            message_id: Gmail message ID
+            service: Service object to use (default: the current worker
+                thread's own service)
+            message_format: 'full', or 'metadata' for headers only
+
+        Returns:
+            Parsed message dictionary or None on error
+        """
+        service = service or self._thread_service()
+
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self.throttle.acquire(MESSAGES_GET_UNITS)
+            try:
+                message = self._message_request(message_id, service, message_format).execute()
+                self.throttle.speed_up()
+                return self._parse_message(message)
+
+            except HttpError as error:
+                if not is_rate_limit_error(error) or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    print(f"Error retrieving message {message_id}: {error}")
+                    return None
+
+                # Slow every worker down and back off this one (with jitter)
+                self.throttle.slow_down()
+                backoff = min(2 ** attempt, self.MAX_BACKOFF_SECONDS)
+                self.sleep(backoff + random.uniform(0, 1))
+
+        return None
+
+    def _thread_service(self) -> Resource:
+        """Get the service object owned by the current thread"""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self.service_factory()
+            self._local.service = service
+        return service
+
+    def _message_request(
+        self,
+        message_id: str,
+        service: Optional[Resource] = None,
+        message_format: str = 'full'
+    ):
+        """Build the messages.get request for a single message"""
+        service = service or self.service
+        if message_format == 'metadata':
+            return service.users().messages().get(
+                userId='me',
+                id=message_id,
+                format='metadata',
+                metadataHeaders=self.METADATA_HEADERS
+            )
+        return service.users().messages().get(
+            userId='me',
+            id=message_id,
+            format=message_format
+        )
+
     def _parse_message(self, message: Dict) -> Dict[str, Any]:
         """
         Parse Gmail message into structured format
@@ -310,7 +784,11 @@ class GmailClient:
         newer_than: Optional[str] = None,
         older_than: Optional[str] = None,
         max_results: int = 1000,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 1,
+        message_filter: Optional[MessageFilter] = None,
+        shards: int = 1
     ) -> List[Dict[str, Any]]:
         """
         Retrieve emails with filters
@@ -328,6 +806,15 @@ class GmailClient:
             older_than: Relative date filter
             max_results: Maximum number of emails
             progress_callback: Optional callback function for progress updates
+            batch_size: Number of messages fetched per batch request
+                (1 disables batching and fetches messages one at a time)
+            concurrency: Number of worker threads fetching messages in
+                parallel (values above 1 replace batching with a throttled
+                thread pool)
+            message_filter: Optional client-side predicate. Headers are
+                fetched first and full content only for matching messages.
+            shards: Number of date windows listed in parallel (see
+                iter_message_ids; needs a service_factory)
 
         Returns:
             List of email dictionaries
@@ -350,7 +837,7 @@ class GmailClient:
 
         # Get message IDs
         print("Fetching message IDs...")
-        message_ids = self.get_messages(query, max_results)
+        message_ids = self.get_messages(query, max_results, shards=shards)
 
         if not message_ids:
             print("No messages found matching filters.")
@@ -358,22 +845,169 @@ class GmailClient:
 
         print(f"Found {len(message_ids)} messages. Retrieving details...")
 
-        # Retrieve message details
-        emails = []
-        total = len(message_ids)
+        return self.fetch_emails(message_ids, progress_callback, batch_size, concurrency, message_filter)
+
+    def fetch_emails(
+        self,
+        message_ids: List[str],
+        progress_callback: Optional[callable] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 1,
+        message_filter: Optional[MessageFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve details of the given messages, skipping failed ones
 
-        for idx, msg_id in enumerate(message_ids, 1):
-            email = self.get_message_details(msg_id)
-            if email:
-                emails.append(email)
+        With a message_filter the fetch has two phases: headers only
+        (format='metadata') for every uncached message, then full content
+        only for messages that pass the filter.
 
-            # Progress callback
+        Args:
+            message_ids: Gmail message IDs
+            progress_callback: Optional callback function for progress updates
+            batch_size: Number of messages fetched per batch request
+            concurrency: Number of worker threads (see retrieve_emails)
+            message_filter: Optional client-side predicate on message headers
+
+        Returns:
+            List of email dictionaries, in the order of message_ids
+        """
+        total = len(message_ids)
+        cached = self.cache.get_many(message_ids) if self.cache else {}
+        if cached:
+            print(f"Found {len(cached)}/{total} messages in local cache.")
+
+        # Cache hits count as already processed
+        def report(done):
+            idx = len(cached) + done
             if progress_callback:
                 progress_callback(idx, total)
             elif idx % 10 == 0 or idx == total:
                 print(f"Processing: {idx}/{total} emails...")
 
-        return emails
+        if cached:
+            report(0)
+
+        missing = [message_id for message_id in message_ids if message_id not in cached]
+
+        if message_filter:
+            cached = {mid: email for mid, email in cached.items() if message_filter.matches(email)}
+            if missing:
+                metadata = self._fetch_details(missing, report, batch_size, concurrency, 'metadata')
+                missing = [meta['id'] for meta in metadata if meta and message_filter.matches(meta)]
+                print(f"{len(missing)} messages match the message filter. Retrieving content...")
+            fetched = self._fetch_details(missing, lambda done: None, batch_size, concurrency)
+        else:
+            fetched = self._fetch_details(missing, report, batch_size, concurrency)
+
+        fetched = [email for email in fetched if email]
+
+        if self.cache and fetched:
+            self.cache.put_many(fetched)
+
+        by_id = dict(cached)
+        by_id.update((email['id'], email) for email in fetched)
+        return [by_id[message_id] for message_id in message_ids if message_id in by_id]
+
+    def iter_emails(
+        self,
+        message_ids: Iterable[str],
+        progress_callback: Optional[callable] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 1,
+        message_filter: Optional[MessageFilter] = None,
+        window_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Retrieve emails lazily, one window of messages at a time
+
+        Only one window of parsed emails is held in memory, so callers that
+        consume the generator row by row use memory bounded by the window
+        rather than by the number of messages. message_ids may be an
+        iterator (see iter_message_ids): the first window is fetched as soon
+        as its IDs are listed.
+
+        Args:
+            message_ids: Gmail message IDs (a list, or an iterator of them)
+            progress_callback: Optional callback function for progress updates
+                (called with total None while message_ids is an iterator)
+            batch_size: Number of messages fetched per batch request
+            concurrency: Number of worker threads (see retrieve_emails)
+            message_filter: Optional client-side predicate on message headers
+            window_size: Messages fetched per window (default: enough to keep
+                every batch request or worker busy)
+
+        Yields:
+            Email dictionaries, in the order of message_ids
+        """
+        window_size = window_size or max(batch_size, 1) * max(concurrency, 1)
+        total = len(message_ids) if isinstance(message_ids, (list, tuple)) else None
+        message_ids = iter(message_ids)
+        start = 0
+
+        while True:
+            window = list(islice(message_ids, window_size))
+            if not window:
+                break
+
+            def report(done, window_total, offset=start):
+                idx = offset + done
+                if progress_callback:
+                    progress_callback(idx, total)
+                elif total is None and idx % 10 == 0:
+                    print(f"Processing: {idx} emails...")
+                elif total is not None and (idx % 10 == 0 or idx == total):
+                    print(f"Processing: {idx}/{total} emails...")
+
+            for email in self.fetch_emails(window, report, batch_size, concurrency, message_filter):
+                yield email
+
+            start += len(window)
+
+    def _fetch_details(
+        self,
+        message_ids: List[str],
+        report: Callable[[int], None],
+        batch_size: int,
+        concurrency: int,
+        message_format: str = 'full'
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch messages from the API (batched, or with a worker pool)
+
+        Args:
+            message_ids: Gmail message IDs
+            report: Called with the number of messages processed so far
+            batch_size: Number of messages fetched per batch request
+            concurrency: Number of worker threads
+            message_format: 'full', or 'metadata' for headers only
+
+        Returns:
+            List of parsed messages in the order of message_ids, None for failures
+        """
+        if not message_ids:
+            return []
+
+        if concurrency > 1:
+            return self.get_messages_details_concurrent(
+                message_ids, concurrency, lambda done, total: report(done), message_format
+            )
+
+        batch_size = max(1, min(batch_size, 100))
+        details: List[Optional[Dict[str, Any]]] = []
+
+        for start in range(0, len(message_ids), batch_size):
+            chunk = message_ids[start:start + batch_size]
+            if batch_size == 1:
+                chunk_details = [self.get_message_details(chunk[0], message_format)]
+            else:
+                chunk_details = self.get_messages_details_batch(chunk, message_format)
+
+            for email in chunk_details:
+                details.append(email)
+                report(len(details))
+
+        return details
 
     def get_active_filters(
         self,
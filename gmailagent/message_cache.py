@@ -0,0 +1,147 @@
+"""
+Message Cache Module
+
+This module provides a persistent on-disk cache of parsed Gmail messages
+keyed by message ID. Received messages never change, so a cached copy can
+replace the messages.get call on every later export. The cache is bounded
+by size and evicts the least recently used messages.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from .auth import DEFAULT_CONFIG_DIR
+
+DEFAULT_CACHE_DIR = DEFAULT_CONFIG_DIR / 'cache'
+DEFAULT_CACHE_SIZE_MB = 256
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+
+class MessageCache:
+    """SQLite-backed LRU cache of parsed messages"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: float = DEFAULT_CACHE_SIZE_MB):
+        """
+        Initialize message cache
+
+        Args:
+            cache_dir: Directory holding the cache database (default: ~/.gmailagent/cache)
+            max_size_mb: Maximum total size of cached messages in megabytes
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'messages.sqlite'
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS messages ('
+            '  id TEXT PRIMARY KEY,'
+            '  data TEXT NOT NULL,'
+            '  size INTEGER NOT NULL,'
+            '  last_access REAL NOT NULL'
+            ')'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON messages (last_access)')
+        self.conn.commit()
+
+    def get_many(self, message_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached messages and mark them as recently used
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            Dictionary of message ID to parsed message, for cache hits only
+        """
+        hits: Dict[str, Dict[str, Any]] = {}
+        now = time.time()
+
+        for start in range(0, len(message_ids), _SQL_CHUNK):
+            chunk = message_ids[start:start + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT id, data FROM messages WHERE id IN ({placeholders})', chunk
+            ).fetchall()
+            for message_id, data in rows:
+                hits[message_id] = self._decode(data)
+            self.conn.execute(
+                f'UPDATE messages SET last_access = ? WHERE id IN ({placeholders})', [now] + chunk
+            )
+
+        self.conn.commit()
+        return hits
+
+    def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a single cached message"""
+        return self.get_many([message_id]).get(message_id)
+
+    def put_many(self, emails: List[Dict[str, Any]]):
+        """
+        Store parsed messages, then evict old entries beyond the size limit
+
+        Args:
+            emails: Parsed message dictionaries (as returned by GmailClient)
+        """
+        now = time.time()
+        rows = []
+        for email in emails:
+            data = self._encode(email)
+            rows.append((email['id'], data, len(data.encode('utf-8')), now))
+
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO messages (id, data, size, last_access) VALUES (?, ?, ?, ?)', rows
+        )
+        self.conn.commit()
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used messages until the cache fits max_bytes"""
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM messages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_delete = []
+        for message_id, size in self.conn.execute('SELECT id, size FROM messages ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            to_delete.append(message_id)
+            total -= size
+
+        for start in range(0, len(to_delete), _SQL_CHUNK):
+            chunk = to_delete[start:start + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            self.conn.execute(f'DELETE FROM messages WHERE id IN ({placeholders})', chunk)
+        self.conn.commit()
+
+    def size_bytes(self) -> int:
+        """Total size of cached messages in bytes"""
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM messages').fetchone()[0]
+
+    def clear(self):
+        """Remove all cached messages"""
+        self.conn.execute('DELETE FROM messages')
+        self.conn.commit()
+
+    def close(self):
+        """Close the cache database"""
+        self.conn.close()
+
+    def _encode(self, email: Dict[str, Any]) -> str:
+        data = dict(email)
+        if isinstance(data.get('date'), datetime):
+            data['date'] = data['date'].isoformat()
+        return json.dumps(data, ensure_ascii=False)
+
+    def _decode(self, data: str) -> Dict[str, Any]:
+        email = json.loads(data)
+        if email.get('date'):
+            email['date'] = datetime.fromisoformat(email['date'])
+        return email
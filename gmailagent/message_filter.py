@@ -0,0 +1,67 @@
+"""
+Message Filter Module
+
+This module provides a client-side predicate on message headers. It lets
+GmailClient fetch only headers for every message and download full content
+only for messages that pass the filter.
+"""
+
+import re
+from typing import Dict, List, Optional, Any
+
+
+class MessageFilter:
+    """Client-side filter on subject and sender headers"""
+
+    def __init__(self, subject_pattern: Optional[str] = None, senders: Optional[List[str]] = None):
+        """
+        Initialize message filter
+
+        Args:
+            subject_pattern: Regular expression searched in the subject (case-insensitive)
+            senders: Sender allow-list. An entry matches if it appears in the
+                From header (case-insensitive), so full addresses and domains
+                like "@university.edu" both work.
+
+        Raises:
+            ValueError: If subject_pattern is not a valid regular expression
+        """
+        try:
+            self.subject_regex = re.compile(subject_pattern, re.IGNORECASE) if subject_pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid subject pattern '{subject_pattern}': {e}")
+
+        self.senders = [sender.strip().lower() for sender in (senders or []) if sender.strip()]
+
+    def matches(self, email: Dict[str, Any]) -> bool:
+        """
+        Check whether a message passes the filter
+
+        Args:
+            email: Parsed message (only 'subject' and 'from' are used)
+
+        Returns:
+            True if the message matches every configured condition
+        """
+        if self.subject_regex and not self.subject_regex.search(email.get('subject', '')):
+            return False
+
+        if self.senders:
+            sender = email.get('from', '').lower()
+            if not any(allowed in sender for allowed in self.senders):
+                return False
+
+        return True
+
+    def __str__(self) -> str:
+        """Short description, e.g. for console output and sync state keys"""
+        parts = []
+        if self.subject_regex:
+            parts.append(f"subject~/{self.subject_regex.pattern}/")
+        if self.senders:
+            parts.append(f"sender:{','.join(self.senders)}")
+        return ' '.join(parts)
+
+    def __bool__(self) -> bool:
+        """A filter without conditions matches everything and is skipped"""
+        return bool(self.subject_regex or self.senders)
@@ -0,0 +1,90 @@
+"""
+Streaming Export Pipeline Module
+
+This module chains email retrieval, URL extraction and Excel writing as
+generators: fetch -> parse -> extract URLs -> drop bodies -> write row.
+Peak memory is bounded by the fetch window instead of the mailbox size.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .excel_exporter import ExcelExporter
+from .gmail_client import GmailClient
+from .message_filter import MessageFilter
+from .url_extractor import URLExtractor, select_repository
+
+
+def extract_urls_streaming(emails: Iterable[Dict[str, Any]], stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """
+    Add 'urls' and 'repo' to each email and drop its bodies
+
+    Args:
+        emails: Iterable of email dictionaries with 'body_plain' and 'body_html'
+        stats: Dictionary updated with 'emails', 'emails_with_urls' and 'urls' counts
+
+    Yields:
+        Email dictionaries with 'urls', 'repo' and without body content
+    """
+    extractor = URLExtractor()
+
+    for email in emails:
+        email['urls'] = extractor.extract_from_email(
+            email.pop('body_plain', ''),
+            email.pop('body_html', '')
+        )
+        email['repo'] = select_repository(email['urls'])
+
+        stats['emails'] += 1
+        stats['urls'] += len(email['urls'])
+        if email['urls']:
+            stats['emails_with_urls'] += 1
+
+        yield email
+
+
+def stream_emails_to_excel(
+    client: GmailClient,
+    message_ids: Iterable[str],
+    filters: Dict[str, str],
+    output_path: Optional[str] = None,
+    exports_dir: Optional[str] = None,
+    progress_callback: Optional[callable] = None,
+    batch_size: int = GmailClient.DEFAULT_BATCH_SIZE,
+    concurrency: int = 1,
+    message_filter: Optional[MessageFilter] = None
+) -> Dict[str, Any]:
+    """
+    Export messages to Excel without holding all emails in memory
+
+    Args:
+        client: GmailClient instance
+        message_ids: Gmail message IDs, in the desired row order (may be an
+            iterator still listing them, see GmailClient.iter_message_ids)
+        filters: Active filters for filename generation
+        output_path: Custom output path (optional)
+        exports_dir: Custom exports directory (optional)
+        progress_callback: Optional callback function for progress updates
+        batch_size: Number of messages fetched per batch request
+        concurrency: Number of worker threads
+        message_filter: Optional client-side predicate on message headers
+
+    Returns:
+        Dictionary with 'output_file', 'message_ids' (of exported emails),
+        'emails', 'emails_with_urls' and 'urls'
+    """
+    stats = {'emails': 0, 'emails_with_urls': 0, 'urls': 0}
+    exported_ids: List[str] = []
+
+    def remember_ids(emails):
+        for email in emails:
+            exported_ids.append(email['id'])
+            yield email
+
+    emails = client.iter_emails(message_ids, progress_callback, batch_size, concurrency, message_filter)
+    rows = remember_ids(extract_urls_streaming(emails, stats))
+
+    output_file, _ = ExcelExporter(exports_dir).create_excel_streaming(rows, filters, output_path)
+
+    result: Dict[str, Any] = {'output_file': output_file, 'message_ids': exported_ids}
+    result.update(stats)
+    return result
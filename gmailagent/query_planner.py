@@ -0,0 +1,110 @@
+"""
+Query Planner Module
+
+This module splits the date range of a Gmail search query into disjoint
+time windows. messages.list pages must be fetched one after another within
+a query, but the windows are independent queries, so GmailClient can list
+them concurrently.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# Lengths of newer_than:/older_than: units; months and years are rounded up,
+# which only makes the planned range a little wider than the query's
+RELATIVE_UNITS = {'d': timedelta(days=1), 'm': timedelta(days=31), 'y': timedelta(days=366)}
+
+DATE_TERM = re.compile(r'(?<!\S)(after|before|newer_than|older_than):(\S+)', re.IGNORECASE)
+
+# Window bounds in epoch seconds; None leaves that side to the query itself
+Window = Tuple[Optional[int], Optional[int]]
+
+
+def _parse_date(value: str) -> Optional[int]:
+    """Epoch seconds of an after:/before: value (a date or epoch seconds)"""
+    if value.isdigit():
+        return int(value)
+    for date_format in ('%Y/%m/%d', '%Y-%m-%d'):
+        try:
+            # Gmail reads dates as midnight Pacific time; local midnight is
+            # close enough, since the query's own terms bound the first and
+            # last windows
+            return int(datetime.strptime(value, date_format).timestamp())
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_relative(value: str, now: float) -> Optional[int]:
+    """Epoch seconds of a newer_than:/older_than: value (e.g. 7d, 2m, 1y)"""
+    match = re.fullmatch(r'(\d+)([dmy])', value.lower())
+    if not match:
+        return None
+    return int(now - (RELATIVE_UNITS[match.group(2)] * int(match.group(1))).total_seconds())
+
+
+def get_date_range(query: str, now: Optional[float] = None) -> Tuple[Optional[int], int]:
+    """
+    Get the date range a Gmail search query covers
+
+    Args:
+        query: Gmail search query (as built by GmailClient.build_query)
+        now: Current time in epoch seconds (default: time.time())
+
+    Returns:
+        Tuple of (start, end) in epoch seconds. start is None when the query
+        has no lower date bound; end defaults to now.
+    """
+    now = time.time() if now is None else now
+    start, end = None, int(now)
+
+    for term, value in DATE_TERM.findall(query):
+        term = term.lower()
+        if term in ('after', 'before'):
+            bound = _parse_date(value)
+        else:
+            bound = _parse_relative(value, now)
+        if bound is None:
+            continue
+        if term in ('after', 'newer_than'):
+            start = bound if start is None else max(start, bound)
+        else:
+            end = min(end, bound)
+
+    return start, end
+
+
+def plan_date_windows(query: str, shards: int, now: Optional[float] = None) -> List[Window]:
+    """
+    Split the date range of a query into equal time windows, newest first
+
+    Each window starts a second before the next older one ends, so no
+    message falls between two windows (Gmail compares epoch bounds at
+    second precision); listings must drop the duplicates this can cause.
+    The newest window has no upper bound and the oldest no lower bound:
+    the query's own date terms bound them.
+
+    Args:
+        query: Gmail search query
+        shards: Number of windows wanted
+        now: Current time in epoch seconds (default: time.time())
+
+    Returns:
+        List of (after, before) epoch-second bounds, newest window first.
+        A single (None, None) window if the query has no date range to split.
+    """
+    start, end = get_date_range(query, now)
+    if shards <= 1 or start is None or end - start < shards:
+        return [(None, None)]
+
+    step = (end - start) / shards
+    boundaries = [int(start + step * i) for i in range(1, shards)]
+
+    windows: List[Window] = []
+    uppers = [None] + boundaries[::-1]
+    lowers = boundaries[::-1] + [None]
+    for upper, lower in zip(uppers, lowers):
+        windows.append((lower - 1 if lower is not None else None, upper))
+    return windows
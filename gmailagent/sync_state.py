@@ -0,0 +1,83 @@
+"""
+Sync State Module
+
+This module persists, per search query, the Gmail history ID and the
+message IDs of the last export, so later exports can fetch only the
+messages that arrived since then.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any
+
+from .auth import DEFAULT_CONFIG_DIR
+
+DEFAULT_SYNC_STATE_FILE = DEFAULT_CONFIG_DIR / 'sync_state.json'
+
+
+class SyncStateStore:
+    """JSON-backed store of export sync state keyed by search query"""
+
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        Initialize sync state store
+
+        Args:
+            state_path: Path to the state JSON file (default: ~/.gmailagent/sync_state.json)
+        """
+        self.state_path = Path(state_path) if state_path else DEFAULT_SYNC_STATE_FILE
+
+    @staticmethod
+    def query_key(query: str) -> str:
+        """Stable key for a search query (the filter set of an export)"""
+        return hashlib.sha1(query.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read sync state: {e}")
+            return {}
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the sync state recorded for a query
+
+        Args:
+            query: Gmail search query
+
+        Returns:
+            Dictionary with 'history_id', 'message_ids', 'output_file' and
+            'updated', or None if the query was never exported
+        """
+        return self._load().get(self.query_key(query))
+
+    def save(self, query: str, history_id: str, message_ids: Iterable[str], output_file: str):
+        """
+        Record the sync state of an export
+
+        Args:
+            query: Gmail search query
+            history_id: Mailbox history ID taken before the export started
+            message_ids: IDs of all messages contained in the export
+            output_file: Path of the exported file
+        """
+        state = self._load()
+        state[self.query_key(query)] = {
+            'query': query,
+            'history_id': history_id,
+            'message_ids': sorted(set(message_ids)),
+            'output_file': str(Path(output_file).resolve()),
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(self.state_path)
@@ -0,0 +1,126 @@
+"""
+Request Throttling Module
+
+This module provides a thread-safe token bucket that keeps concurrent
+Gmail API calls within the per-user quota, and adapts its rate when
+Gmail answers with rate-limit errors.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from googleapiclient.errors import HttpError
+
+# Gmail API per-user quota (quota units per second) and per-method costs
+# See: https://developers.google.com/gmail/api/reference/quota
+USER_QUOTA_UNITS_PER_SECOND = 250
+MESSAGES_GET_UNITS = 5
+MESSAGES_LIST_UNITS = 5
+HISTORY_LIST_UNITS = 2
+
+
+class TokenBucket:
+    """Token bucket rate limiter with additive-increase/multiplicative-decrease"""
+
+    def __init__(
+        self,
+        rate: float = USER_QUOTA_UNITS_PER_SECOND,
+        capacity: Optional[float] = None,
+        min_rate: float = MESSAGES_GET_UNITS,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Refill rate in quota units per second (also the maximum rate)
+            capacity: Maximum burst size in quota units (default: one second of rate)
+            min_rate: Lowest rate the bucket slows down to
+            cooldown: Seconds after a decrease during which further
+                rate-limit responses do not decrease the rate again
+            clock: Monotonic clock function (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.cooldown = cooldown
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._last_decrease: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, units: float = MESSAGES_GET_UNITS):
+        """
+        Block until the requested quota units are available, then consume them
+
+        Args:
+            units: Quota units the next API call costs
+        """
+        # Reserve the units up front; a negative balance is the time this
+        # caller has to wait before its call fits within the rate
+        with self._lock:
+            self._refill()
+            self.tokens -= units
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+
+    def slow_down(self):
+        """
+        Halve the refill rate after a rate-limit response
+
+        Workers throttled by the same burst report their 429s together, so
+        the rate is decreased at most once per cooldown window.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+
+    def speed_up(self):
+        """Recover the refill rate gradually after a successful call"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + MESSAGES_GET_UNITS / 10)
+
+
+def is_rate_limit_error(error: HttpError) -> bool:
+    """
+    Check whether an API error is a (user) rate-limit response
+
+    Gmail signals quota exhaustion with 429, or with 403 and a
+    rateLimitExceeded / userRateLimitExceeded reason.
+
+    Args:
+        error: Error raised by the Gmail API client
+
+    Returns:
+        True if the request should be retried after backing off
+    """
+    status = getattr(error.resp, 'status', None)
+    if status == 429:
+        return True
+    if status == 403:
+        content = error.content or b''
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='ignore')
+        return 'ratelimitexceeded' in content.lower()
+    return False
@@ -3,27 +3,125 @@ URL Extraction Module
 
 This module extracts URLs from email bodies (both plain text and HTML).
 Supports multiple URL formats and handles various edge cases.
+
+HTML is scanned in a single streaming pass (html.parser) that collects
+anchor hrefs and document text together; the BeautifulSoup engine, which
+builds a full document tree first, is kept for comparison.
 """
 
+import posixpath
 import re
-from typing import List, Set
-from urllib.parse import urlparse
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+# Elements whose text BeautifulSoup's get_text() leaves out (code, styles,
+# templates and ruby annotations)
+SKIPPED_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Kinds of URLs told apart by resolve_github_url()
+URL_KIND_REPOSITORY = 'repository'    # A repository (or one of its pages, e.g. issues)
+URL_KIND_DEEP_LINK = 'deep_link'      # A directory or file inside a repository
+URL_KIND_GITHUB = 'github'            # GitHub, but no repository (profile, gist, settings)
+URL_KIND_OTHER = 'other'              # Not GitHub
+
+GITHUB_HOSTS = {'github.com', 'www.github.com'}
+RAW_HOSTS = {'raw.githubusercontent.com'}
+
+# First path segments of github.com that are not user or organization names
+RESERVED_OWNERS = {
+    'about', 'apps', 'collections', 'contact', 'enterprise', 'explore', 'features',
+    'login', 'marketplace', 'new', 'notifications', 'orgs', 'organizations', 'pricing',
+    'pulls', 'issues', 'search', 'security', 'settings', 'signup', 'sponsors', 'topics',
+    'trending', 'users'
+}
+
+_OWNER = re.compile(r'^[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?$')
+_REPO = re.compile(r'^[\w.-]+$')
+
 
-from bs4 import BeautifulSoup
+class LinkTextParser(HTMLParser):
+    """Single-pass collector of anchor hrefs and visible text (builds no tree)"""
+
+    def __init__(self):
+        """Initialize parser"""
+        # References are resolved here, the way BeautifulSoup does it
+        super().__init__(convert_charrefs=False)
+        self.hrefs: List[str] = []
+        self.text: List[str] = []
+        self._open_tags: List[str] = []
+        self._skipping = 0  # Open SKIPPED_TEXT_TAGS elements
+
+    def handle_starttag(self, tag, attrs):
+        self._collect_href(tag, attrs)
+        self._open_tags.append(tag)
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skipping += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <tag/> is opened and closed at once
+        self._collect_href(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # Like the tree builder: close the innermost open element of that
+        # name and everything opened inside it; ignore stray end tags
+        if tag not in self._open_tags:
+            return
+        while True:
+            closed = self._open_tags.pop()
+            if closed in SKIPPED_TEXT_TAGS:
+                self._skipping -= 1
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.text.append(data)
+
+    def handle_entityref(self, name):
+        # Unknown names stay literal (without the semicolon)
+        self.handle_data(unescape(f"&{name};") if f"{name};" in html5 else f"&{name}")
+
+    def handle_charref(self, name):
+        self.handle_data(unescape(f"&#{name};"))
+
+    def unknown_decl(self, data):
+        # CDATA sections count as text, even inside skipped elements
+        if data.upper().startswith('CDATA['):
+            self.text.append(data[len('CDATA['):])
+
+    def _collect_href(self, tag, attrs):
+        if tag != 'a':
+            return
+        href = dict(attrs).get('href')
+        if href is not None and href.startswith(('http://', 'https://')):
+            self.hrefs.append(href)
 
 
 class URLExtractor:
     """Extract URLs from email content"""
 
+    # HTML engines: 'stream' (single html.parser pass) or 'soup' (BeautifulSoup tree)
+    ENGINES = ('stream', 'soup')
+
     # Comprehensive URL regex pattern
     URL_PATTERN = re.compile(
         r'http[s]?://'  # http:// or https://
         r'(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'  # domain and path
     )
 
-    def __init__(self):
-        """Initialize URL extractor"""
-        pass
+    def __init__(self, engine: str = 'stream'):
+        """
+        Initialize URL extractor
+
+        Args:
+            engine: HTML engine, 'stream' or 'soup' (both find the same URLs)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Invalid HTML engine '{engine}' (choose from {', '.join(self.ENGINES)})")
+        self.engine = engine
 
     def extract_from_text(self, text: str) -> List[str]:
         """
@@ -45,6 +143,9 @@ class URLExtractor:
         """
         Extract URLs from HTML content
 
+        Collects the http(s) hrefs of anchor tags, then the URLs in the
+        document text (adjacent text nodes joined, as get_text() does).
+
         Args:
             html: HTML content
 
@@ -54,21 +155,17 @@ class URLExtractor:
         if not html:
             return []
 
-        urls = []
-
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if self.engine == 'soup':
+                hrefs, text = self._scan_html_soup(html)
+            else:
+                parser = LinkTextParser()
+                parser.feed(html)
+                parser.close()
+                hrefs, text = parser.hrefs, ''.join(parser.text)
 
-            # Extract from anchor tags
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith(('http://', 'https://')):
-                    urls.append(href)
-
-            # Also check for URLs in plain text within HTML
-            text = soup.get_text()
-            text_urls = self.extract_from_text(text)
-            urls.extend(text_urls)
+            # Cleaned once below (cleaning is idempotent)
+            urls = hrefs + self.URL_PATTERN.findall(text)
 
         except Exception as e:
             print(f"Warning: Error parsing HTML: {e}")
@@ -77,6 +174,25 @@ class URLExtractor:
 
         return self._clean_urls(urls)
 
+    def _scan_html_soup(self, html: str) -> Tuple[List[str], str]:
+        """
+        Collect anchor hrefs and document text with BeautifulSoup
+
+        Args:
+            html: HTML content
+
+        Returns:
+            Tuple of (http(s) hrefs, document text)
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+        hrefs = [
+            link['href'] for link in soup.find_all('a', href=True)
+            if link['href'].startswith(('http://', 'https://'))
+        ]
+        return hrefs, soup.get_text()
+
     def extract_from_email(self, body_plain: str, body_html: str) -> List[str]:
         """
         Extract URLs from email body (tries HTML first, then plain text)
@@ -169,7 +285,8 @@ def extract_urls_from_emails(emails: List[dict]) -> List[dict]:
         emails: List of email dictionaries with 'body_plain' and 'body_html' keys
 
     Returns:
-        List of email dictionaries with added 'urls' key
+        List of email dictionaries with added 'urls' and 'repo' keys
+        (see select_repository)
     """
     extractor = URLExtractor()
 
@@ -179,6 +296,7 @@ def extract_urls_from_emails(emails: List[dict]) -> List[dict]:
 
         urls = extractor.extract_from_email(body_plain, body_html)
         email['urls'] = urls
+        email['repo'] = select_repository(urls)
 
     return emails
 
@@ -197,3 +315,105 @@ def format_urls_for_excel(urls: List[str]) -> str:
         return ''
 
     return ', '.join(urls)
+
+
+def resolve_github_url(url: str) -> Dict[str, str]:
+    """
+    Classify a URL and map GitHub links to their repository
+
+    Deep links such as /tree/main/hw3, /blob/main/hw3/app.py and
+    raw.githubusercontent.com files resolve to the repository plus the
+    directory they point into. Branch names are taken to be one path segment.
+
+    Args:
+        url: URL found in an email
+
+    Returns:
+        Dictionary with keys: kind (one of the URL_KIND_* constants),
+        repo (canonical https://github.com/owner/repo, '' if none),
+        ref (branch or commit of a deep link, else '') and subpath
+        (directory inside the repository, '' for the whole repository)
+    """
+    resolved = {'kind': URL_KIND_OTHER, 'repo': '', 'ref': '', 'subpath': ''}
+
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or '').lower()
+    segments = [unquote(segment) for segment in parsed.path.split('/') if segment]
+
+    if host in RAW_HOSTS:
+        # raw.githubusercontent.com/owner/repo/ref/path/to/file
+        kind = URL_KIND_DEEP_LINK
+        owner_repo, ref, path, is_file = segments[:2], segments[2:3], segments[3:], True
+    elif host in GITHUB_HOSTS:
+        owner_repo, rest = segments[:2], segments[2:]
+        if rest[:1] in (['tree'], ['blob']) and len(rest) >= 2:
+            kind = URL_KIND_DEEP_LINK
+            ref, path, is_file = rest[1:2], rest[2:], rest[0] == 'blob'
+        else:
+            kind = URL_KIND_REPOSITORY
+            ref, path, is_file = [], [], False
+    else:
+        if host.endswith('.github.com'):
+            resolved['kind'] = URL_KIND_GITHUB
+        return resolved
+
+    resolved['kind'] = URL_KIND_GITHUB
+    if len(owner_repo) < 2:
+        return resolved
+
+    owner, repo = owner_repo
+    if repo.lower().endswith('.git'):
+        repo = repo[:-len('.git')]
+    if owner.lower() in RESERVED_OWNERS or not _OWNER.match(owner) or not _REPO.match(repo) or repo in ('.', '..'):
+        return resolved
+
+    # Files resolve to their directory; '.' and '..' cannot leave the repository
+    if is_file:
+        path = path[:-1]
+    subpath = posixpath.normpath('/'.join(path)) if path else ''
+    if subpath in ('.', '') or subpath.startswith('..'):
+        subpath = ''
+
+    resolved.update(
+        kind=kind if subpath else URL_KIND_REPOSITORY,
+        repo=f"https://github.com/{owner.lower()}/{repo.lower()}",
+        ref=ref[0] if ref and subpath else '',
+        subpath=subpath
+    )
+    return resolved
+
+
+def repo_link(resolved: Dict[str, str]) -> str:
+    """
+    Format a resolved repository for the Repo column
+
+    Args:
+        resolved: Result of resolve_github_url()
+
+    Returns:
+        Canonical repository URL, or a /tree/<ref>/<subpath> link if the URL
+        pointed into a directory ('' if there is no repository)
+    """
+    if not resolved['repo']:
+        return ''
+    if resolved['subpath']:
+        return f"{resolved['repo']}/tree/{resolved['ref'] or 'HEAD'}/{quote(resolved['subpath'])}"
+    return resolved['repo']
+
+
+def select_repository(urls: List[str]) -> Optional[str]:
+    """
+    Pick the submitted repository from the URLs of an email
+
+    Args:
+        urls: URLs in the order they were found
+
+    Returns:
+        Repo column value of the first URL that resolves to a GitHub
+        repository, or None if there is none
+    """
+    for url in urls:
+        link = repo_link(resolve_github_url(url))
+        if link:
+            return link
+    return None
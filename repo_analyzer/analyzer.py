@@ -3,14 +3,34 @@ Main orchestrator for Repository Analyzer Agent.
 Coordinates Excel reading, repository cloning, metrics calculation, and output generation.
 """
 
+import multiprocessing
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from .excel_manager import ExcelManager
 from .repo_manager import RepositoryManager
+from .retry_queue import RetryQueue
+from .mirror_cache import MirrorCache, HEAD_REF, normalize_repo_url, split_repo_link
+from .results_store import ResultsStore
+from .line_count_cache import LineCountCache
+from .file_table_store import FileTableStore, sidecar_path
+from .similarity import SimilarityIndex, find_similar_pairs
+from .timing import Tracer, trace_path
+from .progress_journal import ProgressJournal, journal_path
 from .metrics_calculator import MetricsCalculator
-from .config import STATUS_SUCCESS, STATUS_ERROR, VERSION
+from .config import (
+    STATUS_SUCCESS,
+    STATUS_ERROR,
+    VERSION,
+    MIRROR_CACHE_SIZE_MB,
+    DEFAULT_METRICS_BACKEND,
+    STATUS_TOO_LARGE,
+    STATUS_INVALID_URL,
+    RETRY_ATTEMPTS,
+    LINE_LIMIT
+)
 from .errors import (
     ExcelError,
     RepositoryError,
@@ -19,28 +39,113 @@ from .errors import (
 )
 
 
+def calculate_metrics(
+    repo_path: str,
+    treeish: Optional[str] = None,
+    use_line_cache: bool = False,
+    similarity: bool = False,
+    subpath: str = ''
+) -> Dict:
+    """
+    Calculate metrics for a cloned repository (runs in a worker process).
+
+    Args:
+        repo_path: Path to the cloned repository, or to a bare mirror if treeish is set
+        treeish: Commit to read from the mirror's object store instead of the file system
+        use_line_cache: Reuse line counts of files seen in other repositories
+        similarity: Also compute the MinHash signature of the code
+        subpath: Only analyze this subdirectory ('' = whole repository)
+
+    Returns:
+        Metrics dict (see MetricsCalculator.calculate)
+    """
+    line_cache = LineCountCache() if use_line_cache else None
+    try:
+        calculator = MetricsCalculator(line_cache=line_cache, similarity=similarity)
+        if treeish:
+            return calculator.calculate_tree(repo_path, treeish, subpath)
+        return calculator.calculate(repo_path, subpath)
+    finally:
+        if line_cache is not None:
+            line_cache.close()
+
+
+def _metrics_context() -> multiprocessing.context.BaseContext:
+    """
+    Get the start method for metrics worker processes.
+
+    Clone threads are running (and may hold locks) when the process pool
+    starts its workers; a forked worker inherits such a lock in the held
+    state and hangs, so workers come from a fork server where available.
+
+    Returns:
+        Multiprocessing context ('forkserver', else the platform default)
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context()
+
+
 class RepositoryAnalyzer:
     """Main analyzer orchestrator."""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        workers: int = 1,
+        use_cache: bool = True,
+        cache_size_mb: float = MIRROR_CACHE_SIZE_MB,
+        metrics_backend: str = DEFAULT_METRICS_BACKEND,
+        similarity: bool = False,
+        allow_local_repos: bool = False
+    ):
         """
         Initialize analyzer.
 
         Args:
             verbose: Enable verbose output
+            workers: Number of repositories processed in parallel
+                (1 = sequential; clones run in threads, metrics in processes)
+            use_cache: Keep repositories in the persistent mirror cache and
+                reuse stored results of unchanged repositories
+            cache_size_mb: Maximum size of the mirror cache in megabytes
+            metrics_backend: 'tree' reads files straight from the mirror's
+                commit tree (needs use_cache); 'checkout' extracts them first
+            similarity: Report similar submissions (MinHash/LSH); the index
+                persists across runs if use_cache is set. Off by default,
+                since it reads every file even when line counts are cached
+            allow_local_repos: Accept file:// URLs and local repository paths
+                (benchmark mode)
         """
         self.verbose = verbose
+        self.workers = max(1, workers)
+        self.mirror_cache = MirrorCache(max_size_mb=cache_size_mb) if use_cache else None
+        self.results_store = ResultsStore() if use_cache else None
+        self.treeish = HEAD_REF if use_cache and metrics_backend == 'tree' else None
+        self.reused_results = 0
+        self.line_cache_hits = 0
+        self.line_cache_lookups = 0
         self.excel_manager = ExcelManager()
         self.repo_manager = None  # Created when needed
-        self.metrics_calculator = MetricsCalculator()
-
-    def analyze(self, input_path: str, output_path: str = None) -> Dict:
+        self.line_cache = LineCountCache() if use_cache else None
+        self.similarity = similarity
+        self.similarity_index_path = None if use_cache else ':memory:'
+        self.allow_local_repos = allow_local_repos
+        self.metrics_calculator = MetricsCalculator(line_cache=self.line_cache, similarity=similarity)
+        self.tracer = Tracer()
+
+    def analyze(self, input_path: str, output_path: str = None, resume: bool = False) -> Dict:
         """
         Analyze repositories from Excel file.
 
+        Every finished repository is recorded in a progress journal, which is
+        removed once the output is written.
+
         Args:
             input_path: Path to input Excel file
             output_path: Path to output Excel file (optional, auto-generated if None)
+            resume: Replay results recorded by an interrupted run of the same
+                input file and process only the remaining repositories
 
         Returns:
             Dict with summary statistics
@@ -53,6 +158,8 @@ class RepositoryAnalyzer:
         print()
 
         start_time = time.time()
+        journal = ProgressJournal(journal_path(input_path))
+        self.tracer = Tracer()
 
         try:
             # Step 1: Read input Excel
@@ -61,9 +168,32 @@ class RepositoryAnalyzer:
             print(f"Found {len(original_data)} repository URLs")
             print()
 
-            # Step 2: Process repositories (SEQUENTIAL for Phase 1)
+            # Step 2: Process repositories (skipping those finished by an interrupted run)
+            completed = journal.load() if resume else {}
+            results = [completed.get((row.get('row_index'), row['url'])) for row in original_data]
+            pending = [idx for idx, result in enumerate(results) if result is None]
+            if resume:
+                print(f"Resuming: {len(original_data) - len(pending)} of {len(original_data)} "
+                      f"repositories already analyzed")
+                print()
+
+            journal.open(resume=resume)
+            pending_data = [original_data[idx] for idx in pending]
+
+            def record(idx: int, result: Dict):
+                row = pending_data[idx]
+                journal.append(row.get('row_index'), row['url'], result)
+
             print("Processing repositories...")
-            results = self._process_repositories_sequential(original_data)
+            self.reused_results = 0
+            self.line_cache_hits = 0
+            self.line_cache_lookups = 0
+            processed = self._process_unique_repositories(pending_data, on_result=record)
+
+            for idx, result in zip(pending, processed):
+                results[idx] = result
+
+            similar_pairs = self._find_similar_pairs(results, Path(input_path).stem)
 
             # Step 3: Write output Excel
             if output_path is None:
@@ -73,66 +203,501 @@ class RepositoryAnalyzer:
 
             print()
             print("Writing output...")
-            self.excel_manager.write_output(
-                output_path,
-                original_data,
-                results,
-                processing_time
-            )
+            with self.tracer.span('excel_write'):
+                self.excel_manager.write_output(
+                    output_path,
+                    original_data,
+                    results,
+                    processing_time,
+                    line_cache_stats=self._line_cache_stats(),
+                    similar_pairs=similar_pairs,
+                    timing={
+                        'stages': self.tracer.stage_summary(),
+                        'repos': self.tracer.repo_breakdown()
+                    }
+                )
+            self._write_file_tables(output_path, original_data, results)
+            self.tracer.write_chrome_trace(trace_path(output_path))
+
+            # The output holds every result now; a later run starts from scratch
+            journal.remove()
 
             # Step 4: Display summary
-            summary = self._generate_summary(results, processing_time)
+            summary = self._generate_summary(results, processing_time, similar_pairs)
             self._display_summary(summary, output_path)
 
             return summary
 
         finally:
+            journal.close()
+
+            # Mirrors are only evicted once no metrics read them anymore
+            if self.mirror_cache:
+                self.mirror_cache.evict()
+
             # Cleanup temporary files
             if self.repo_manager:
                 print()
                 self.repo_manager.cleanup()
 
-    def _process_repositories_sequential(self, data: List[Dict]) -> List[Dict]:
+    def _find_similar_pairs(self, results: List[Dict], label: str) -> Optional[List[Dict]]:
+        """
+        Index the run's signatures and find similar submissions.
+
+        Args:
+            results: Processing results
+            label: Label of this run in the index (input file name)
+
+        Returns:
+            Candidate pairs (see similarity.find_similar_pairs), or None if
+            similarity is disabled
+        """
+        if not self.similarity:
+            return None
+
+        index = SimilarityIndex(self.similarity_index_path)
+        try:
+            return find_similar_pairs(index, results, label)
+        finally:
+            index.close()
+
+    def _write_file_tables(self, output_path: str, original_data: List[Dict], results: List[Dict]):
+        """
+        Store per-file line counts next to the output workbook (for regrade).
+
+        Args:
+            output_path: Path to the output Excel file
+            original_data: Original data from input Excel
+            results: Processing results
+        """
+        store = FileTableStore(sidecar_path(output_path))
+        try:
+            store.write(original_data, results, LINE_LIMIT)
+        finally:
+            store.close()
+
+    def _process_unique_repositories(
+        self,
+        data: List[Dict],
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Analyze each distinct repository once and fan results out to its rows.
+
+        Rows whose URLs canonicalize to the same repository (resubmissions,
+        .git suffixes, trailing slashes, /tree/<branch> links) share a single
+        clone and analysis. Rows with a Repo column use it instead of the URL:
+        rows without a repository are reported as invalid without any network
+        access, and /tree/<ref>/<path> links analyze only that directory.
+
+        Args:
+            data: List of repository data from Excel
+            on_result: Called with (row index in data, result) as each row finishes
+
+        Returns:
+            List of results for each row, in input order
+        """
+        rows_by_repo: Dict[Tuple[str, str], List[int]] = {}
+        invalid = []
+        for idx, row in enumerate(data):
+            link = row.get('repo', row['url'])
+            if not link:
+                invalid.append(idx)
+                continue
+            url, subpath = split_repo_link(link)
+            rows_by_repo.setdefault((normalize_repo_url(url), subpath), []).append(idx)
+
+        unique_data = [{'url': url, 'subpath': subpath} for url, subpath in rows_by_repo]
+        row_groups = list(rows_by_repo.values())
+
+        duplicates = len(data) - len(invalid) - len(unique_data)
+        if duplicates:
+            print(f"{duplicates} duplicate submission(s) share a repository with another row")
+            print()
+
+        results: List[Optional[Dict]] = [None] * len(data)
+
+        if invalid:
+            print(f"{len(invalid)} row(s) without a GitHub repository link skipped")
+            print()
+        for idx in invalid:
+            results[idx] = self._new_result(data[idx]['url'])
+            results[idx]['status'] = STATUS_INVALID_URL
+            results[idx]['error'] = 'No GitHub repository link found'
+            if on_result:
+                on_result(idx, results[idx])
+
+        def fan_out(unique_idx: int, result: Dict):
+            for idx in row_groups[unique_idx]:
+                results[idx] = dict(result, url=data[idx]['url'])
+                if on_result:
+                    on_result(idx, results[idx])
+
+        if self.workers > 1:
+            self._process_repositories_parallel(unique_data, on_result=fan_out)
+        else:
+            self._process_repositories_sequential(unique_data, on_result=fan_out)
+
+        return results
+
+    def _process_repositories_sequential(
+        self,
+        data: List[Dict],
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
         """
         Process repositories sequentially (Phase 1 MVP).
 
         Args:
             data: List of repository data from Excel
+            on_result: Called with (row index in data, result) as each repository finishes
 
         Returns:
             List of results for each repository
         """
         # Initialize repository manager
-        self.repo_manager = RepositoryManager()
+        self.repo_manager = self._create_repo_manager()
 
         print(f"Temporary directory: {self.repo_manager.get_temp_dir()}")
         print()
 
-        results = []
         total = len(data)
+        results: List[Optional[Dict]] = [None] * total
+        retry_queue = RetryQueue()
+
+        def process(idx: int, attempt: int):
+            url = data[idx]['url']
+            result = self._process_single_repository(
+                url,
+                retry=lambda error: self._defer_retry(retry_queue, idx, url, error, attempt),
+                subpath=data[idx].get('subpath', '')
+            )
+            if result is not None:
+                results[idx] = result
+                if on_result:
+                    on_result(idx, result)
+                self._display_result(result)
+            print()
 
-        for idx, repo_data in enumerate(data, start=1):
-            url = repo_data['url']
-            print(f"[{idx}/{total}] Analyzing {url}...")
+        for idx, repo_data in enumerate(data):
+            print(f"[{idx + 1}/{total}] Analyzing {self._describe(repo_data)}...")
+            process(idx, 1)
 
-            result = self._process_single_repository(url)
-            results.append(result)
+        # Deferred retries only wait once the rest of the batch is done
+        while retry_queue:
+            time.sleep(retry_queue.time_until_next())
+            for idx, attempt in retry_queue.pop_ready():
+                print(f"[{idx + 1}/{total}] Retrying {self._describe(data[idx])} "
+                      f"(attempt {attempt}/{RETRY_ATTEMPTS})...")
+                process(idx, attempt)
 
-            # Display result
-            if result['status'] == STATUS_SUCCESS:
-                grade = result['grade']
-                print(f"  Grade: {grade:.2f}%")
-            else:
-                error = result['error']
-                print(f"  Error: {error}")
+        return results
 
-            print()
+    def _process_repositories_parallel(
+        self,
+        data: List[Dict],
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Process repositories in parallel.
+
+        Clones are network-bound and run in a thread pool; metrics are
+        CPU/disk-bound and run in a process pool as soon as each clone
+        finishes. Transiently failed clones are resubmitted once their
+        backoff expires. Each repository is finished (on_result) as soon as
+        its metrics complete, while other clones are still running. Results
+        keep the input row order.
 
+        Args:
+            data: List of repository data from Excel
+            on_result: Called with (row index in data, result) as each repository finishes
+
+        Returns:
+            List of results for each repository, in input order
+        """
+        self.repo_manager = self._create_repo_manager()
+
+        print(f"Temporary directory: {self.repo_manager.get_temp_dir()}")
+        print(f"Workers: {self.workers}")
+        print()
+
+        total = len(data)
+        results: List[Optional[Dict]] = [None] * total
+        retry_queue = RetryQueue()
+        done = 0
+
+        def finish(idx: int, result: Dict, reused_commit: Optional[str] = None):
+            nonlocal done
+            done += 1
+            results[idx] = result
+            if on_result:
+                on_result(idx, result)
+            print(f"[{done}/{total}] {self._describe(data[idx])}")
+            if reused_commit:
+                self._record_reused(reused_commit)
+            self._display_result(result)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as clone_pool, \
+                ProcessPoolExecutor(max_workers=self.workers,
+                                    mp_context=_metrics_context()) as metrics_pool:
+            clone_futures = {
+                clone_pool.submit(self._clone_or_reuse, repo_data['url'], repo_data.get('subpath', '')): (idx, 1)
+                for idx, repo_data in enumerate(data)
+            }
+            metrics_futures = {}
+
+            # Clones and metrics share one wait, so every row is finished
+            # (and journaled) as soon as its metrics are done
+            while clone_futures or metrics_futures or retry_queue:
+                for idx, attempt in retry_queue.pop_ready():
+                    print(f"  Retrying {self._describe(data[idx])} (attempt {attempt}/{RETRY_ATTEMPTS})")
+                    future = clone_pool.submit(
+                        self._clone_or_reuse, data[idx]['url'], data[idx].get('subpath', '')
+                    )
+                    clone_futures[future] = (idx, attempt)
+
+                if not clone_futures and not metrics_futures:
+                    time.sleep(retry_queue.time_until_next())
+                    continue
+
+                finished, _ = wait(
+                    list(clone_futures) + list(metrics_futures),
+                    timeout=retry_queue.time_until_next(),
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in finished:
+                    if future in metrics_futures:
+                        idx, commit_sha = metrics_futures.pop(future)
+                        finish(idx, self._metrics_result(future, data[idx], commit_sha))
+                        continue
+
+                    idx, attempt = clone_futures.pop(future)
+                    url = data[idx]['url']
+                    result = self._new_result(url)
+
+                    try:
+                        commit_sha, stored, local_path, success, error = future.result()
+                    except Exception as e:
+                        commit_sha, stored = None, None
+                        local_path, success, error = None, False, f"Unexpected error: {str(e)}"
+
+                    if stored is not None:
+                        self._apply_metrics(result, stored)
+                        finish(idx, result, reused_commit=commit_sha)
+                        continue
+
+                    if not success:
+                        if self._defer_retry(retry_queue, idx, url, error, attempt):
+                            continue
+                        result['error'] = error
+                        result['status'] = self._determine_status_from_error(error)
+                        finish(idx, result)
+                        continue
+
+                    future = metrics_pool.submit(
+                        calculate_metrics, local_path, self.treeish, self.line_cache is not None, self.similarity,
+                        data[idx].get('subpath', '')
+                    )
+                    metrics_futures[future] = (idx, commit_sha)
+
+        print()
         return results
 
-    def _process_single_repository(self, url: str) -> Dict:
+    def _metrics_result(self, future, repo_data: Dict, commit_sha: Optional[str]) -> Dict:
         """
-        Process a single repository: clone, calculate metrics, grade.
+        Build the result of a finished metrics future and store its metrics.
+
+        Args:
+            future: Completed future of calculate_metrics
+            repo_data: Repository data with 'url' and optional 'subpath'
+            commit_sha: Remote HEAD resolved before cloning (None if unknown)
+
+        Returns:
+            Result dict for the repository
+        """
+        url = repo_data['url']
+        result = self._new_result(url)
+
+        try:
+            metrics = future.result()
+            self.tracer.add_metrics_timings(url, metrics.pop('timings'))
+            self._record_line_cache_stats(metrics)
+            self._apply_metrics(result, metrics)
+            self._store_metrics(url, commit_sha, metrics, repo_data.get('subpath', ''))
+        except MetricsCalculationError as e:
+            result['error'] = f"Metrics calculation failed: {str(e)}"
+            result['status'] = STATUS_ERROR
+        except Exception as e:
+            result['error'] = f"Unexpected error: {str(e)}"
+            result['status'] = STATUS_ERROR
+
+        return result
+
+    def _create_repo_manager(self) -> RepositoryManager:
+        """
+        Create the repository manager for a run.
+
+        Returns:
+            RepositoryManager that extracts working files unless metrics
+            are read from the mirror's commit tree
+        """
+        return RepositoryManager(
+            mirror_cache=self.mirror_cache,
+            checkout=self.treeish is None,
+            allow_local=self.allow_local_repos
+        )
+
+    def _clone_or_reuse(
+        self,
+        url: str,
+        subpath: str = ''
+    ) -> Tuple[Optional[str], Optional[Dict], Optional[str], bool, str]:
+        """
+        Reuse the stored result of an unchanged repository, or clone it.
+
+        Args:
+            url: Repository URL
+            subpath: Subdirectory the result must cover ('' = whole repository)
+
+        Returns:
+            Tuple of (commit_sha, stored_metrics, local_path, success, error_message);
+            stored_metrics is None unless the remote HEAD was analyzed before
+        """
+        with self.tracer.span('resolve', url):
+            commit_sha, stored = self._lookup_stored_result(url, subpath)
+        if stored is not None:
+            return commit_sha, stored, None, True, ""
+
+        with self.tracer.span('clone', url):
+            local_path, success, error = self.repo_manager.clone(url)
+        return commit_sha, None, local_path, success, error
+
+    def _defer_retry(self, retry_queue: RetryQueue, idx: int, url: str, error: str, attempt: int) -> bool:
+        """
+        Queue a failed clone for a later retry if the failure is transient.
+
+        Args:
+            retry_queue: Queue of (row index, attempt) pairs of the run
+            idx: Input row index of the repository
+            url: Repository URL
+            error: Error message of the failed attempt
+            attempt: Number of the attempt that failed (1 = first)
+
+        Returns:
+            True if a retry was scheduled
+        """
+        delay = self.repo_manager.retry_delay(url, error, attempt)
+        if delay is None:
+            return False
+
+        retry_queue.schedule((idx, attempt + 1), delay)
+        print(f"  {error} - retry {attempt}/{RETRY_ATTEMPTS - 1} deferred by {delay:.1f}s")
+        return True
+
+    def _lookup_stored_result(self, url: str, subpath: str = '') -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Resolve the remote HEAD and look up metrics stored for it.
+
+        Args:
+            url: Repository URL
+            subpath: Subdirectory the metrics cover ('' = whole repository)
+
+        Returns:
+            Tuple of (commit_sha, stored_metrics); both None without a results store
+        """
+        if self.results_store is None:
+            return None, None
+
+        commit_sha = self.repo_manager.resolve_head(url)
+        if commit_sha is None:
+            return None, None
+
+        stored = self.results_store.get(url, commit_sha, subpath)
+        # Results stored by runs without similarity have no signature
+        if self.similarity and stored and stored.get('total_files') and not stored.get('minhash'):
+            return commit_sha, None
+
+        return commit_sha, stored
+
+    def _store_metrics(self, url: str, commit_sha: Optional[str], metrics: Dict, subpath: str = ''):
+        """
+        Remember metrics for the analyzed commit.
+
+        Args:
+            url: Repository URL
+            commit_sha: Remote HEAD resolved before cloning (None if unknown)
+            metrics: Metrics dict from MetricsCalculator.calculate
+            subpath: Subdirectory the metrics cover ('' = whole repository)
+        """
+        if self.results_store is not None and commit_sha:
+            self.results_store.put(url, commit_sha, metrics, subpath)
+
+    def _record_line_cache_stats(self, metrics: Dict):
+        """
+        Add the line count cache hits of one repository to the run totals.
+
+        Args:
+            metrics: Metrics dict from MetricsCalculator.calculate
+        """
+        self.line_cache_hits += metrics.get('line_cache_hits', 0)
+        self.line_cache_lookups += metrics.get('line_cache_lookups', 0)
+
+    def _line_cache_stats(self) -> Optional[Dict]:
+        """
+        Get line count cache statistics of the run.
+
+        Returns:
+            Dict with keys: hits, lookups, hit_rate (percent), or None
+            if the cache is disabled
+        """
+        if self.line_cache is None:
+            return None
+
+        lookups = self.line_cache_lookups
+        hit_rate = (self.line_cache_hits / lookups * 100) if lookups else 0.0
+        return {'hits': self.line_cache_hits, 'lookups': lookups, 'hit_rate': hit_rate}
+
+    def _record_reused(self, commit_sha: str):
+        """
+        Count and report a stored result reused for an unchanged repository.
+
+        Args:
+            commit_sha: Remote HEAD commit the result was calculated for
+        """
+        self.reused_results += 1
+        print(f"  Unchanged since last run (commit {commit_sha[:7]}), reusing result")
+
+    def _describe(self, repo_data: Dict) -> str:
+        """
+        Describe a repository (and the subdirectory analyzed) for progress output.
+
+        Args:
+            repo_data: Repository data with 'url' and optional 'subpath'
+
+        Returns:
+            URL, followed by the subdirectory in parentheses if there is one
+        """
+        subpath = repo_data.get('subpath')
+        return f"{repo_data['url']} ({subpath})" if subpath else repo_data['url']
+
+    def _display_result(self, result: Dict):
+        """
+        Display the outcome of a single repository.
+
+        Args:
+            result: Result dict for the repository
+        """
+        if result['status'] == STATUS_SUCCESS:
+            grade = result['grade']
+            print(f"  Grade: {grade:.2f}%")
+        else:
+            error = result['error']
+            print(f"  Error: {error}")
+
+    def _new_result(self, url: str) -> Dict:
+        """
+        Create an empty (failed) result for a repository.
 
         Args:
             url: Repository URL
@@ -141,7 +706,7 @@ class RepositoryAnalyzer:
             Dict with keys: url, grade, total_files, files_under_130,
                            total_lines, status, error
         """
-        result = {
+        return {
             'url': url,
             'grade': 0.0,
             'total_files': 0,
@@ -151,30 +716,79 @@ class RepositoryAnalyzer:
             'error': ''
         }
 
+    def _apply_metrics(self, result: Dict, metrics: Dict):
+        """
+        Fill a result from calculated metrics.
+
+        Args:
+            result: Result dict to update
+            metrics: Metrics dict from MetricsCalculator.calculate
+        """
+        for field in ('file_table', 'minhash'):
+            if metrics.get(field):
+                result[field] = metrics[field]
+
+        # Edge case: no code files
+        if metrics['total_files'] == 0:
+            result['error'] = 'No code files found in repository'
+            result['status'] = 'No Code Files'
+            return
+
+        result['grade'] = metrics['grade']
+        result['total_files'] = metrics['total_files']
+        result['files_under_130'] = metrics['files_under_130']
+        result['total_lines'] = metrics['total_lines']
+        result['status'] = STATUS_SUCCESS
+
+    def _process_single_repository(
+        self,
+        url: str,
+        retry: Optional[Callable[[str], bool]] = None,
+        subpath: str = ''
+    ) -> Optional[Dict]:
+        """
+        Process a single repository: clone, calculate metrics, grade.
+
+        Args:
+            url: Repository URL
+            retry: Called with the error of a failed clone; returns True if
+                the clone was deferred for a later retry
+            subpath: Only analyze this subdirectory ('' = whole repository)
+
+        Returns:
+            Dict with keys: url, grade, total_files, files_under_130,
+                           total_lines, status, error
+            (None if the clone was deferred for a retry)
+        """
+        result = self._new_result(url)
+
         try:
-            # Step 1: Clone repository
-            local_path, success, error = self.repo_manager.clone(url)
+            # Step 1: Clone repository, unless this commit was analyzed before
+            commit_sha, stored, local_path, success, error = self._clone_or_reuse(url, subpath)
+
+            if stored is not None:
+                self._record_reused(commit_sha)
+                self._apply_metrics(result, stored)
+                return result
 
             if not success:
+                if retry is not None and retry(error):
+                    return None
                 result['error'] = error
                 result['status'] = self._determine_status_from_error(error)
                 return result
 
             # Step 2: Calculate metrics
-            metrics = self.metrics_calculator.calculate(local_path)
-
-            # Step 3: Check for edge case (no code files)
-            if metrics['total_files'] == 0:
-                result['error'] = 'No code files found in repository'
-                result['status'] = 'No Code Files'
-                return result
+            if self.treeish:
+                metrics = self.metrics_calculator.calculate_tree(local_path, self.treeish, subpath)
+            else:
+                metrics = self.metrics_calculator.calculate(local_path, subpath)
+            self.tracer.add_metrics_timings(url, metrics.pop('timings'))
+            self._record_line_cache_stats(metrics)
+            self._store_metrics(url, commit_sha, metrics, subpath)
 
-            # Step 4: Populate results
-            result['grade'] = metrics['grade']
-            result['total_files'] = metrics['total_files']
-            result['files_under_130'] = metrics['files_under_130']
-            result['total_lines'] = metrics['total_lines']
-            result['status'] = STATUS_SUCCESS
+            # Step 3: Populate results (handles repos without code files)
+            self._apply_metrics(result, metrics)
 
             return result
 
@@ -204,6 +818,8 @@ class RepositoryAnalyzer:
             return 'Not Found'
         elif 'timeout' in error_lower:
             return 'Timeout'
+        elif 'too large' in error_lower:
+            return STATUS_TOO_LARGE
         elif 'access denied' in error_lower or 'forbidden' in error_lower:
             return 'Access Denied'
         elif 'network' in error_lower or 'connection' in error_lower:
@@ -213,13 +829,19 @@ class RepositoryAnalyzer:
         else:
             return STATUS_ERROR
 
-    def _generate_summary(self, results: List[Dict], processing_time: float) -> Dict:
+    def _generate_summary(
+        self,
+        results: List[Dict],
+        processing_time: float,
+        similar_pairs: Optional[List[Dict]] = None
+    ) -> Dict:
         """
         Generate summary statistics.
 
         Args:
             results: Processing results
             processing_time: Total processing time in seconds
+            similar_pairs: Candidate pairs of similar submissions, or None
 
         Returns:
             Summary dict
@@ -237,6 +859,9 @@ class RepositoryAnalyzer:
             'successful': successful,
             'failed': failed,
             'avg_grade': avg_grade,
+            'reused': self.reused_results,
+            'line_cache': self._line_cache_stats(),
+            'similar_pairs': len(similar_pairs or []),
             'processing_time': processing_time
         }
 
@@ -259,6 +884,19 @@ class RepositoryAnalyzer:
         if summary['successful'] > 0:
             print(f"Average Grade: {summary['avg_grade']:.2f}%")
 
+        if summary['similar_pairs'] > 0:
+            print(f"Similar Submission Pairs: {summary['similar_pairs']} (see Similarity sheet)")
+
+        if summary['reused'] > 0:
+            print(f"Unchanged (reused): {summary['reused']}/{summary['total_repos']}")
+
+        line_cache = summary['line_cache']
+        if line_cache and line_cache['lookups'] > 0:
+            print(
+                f"Line Count Cache Hit Rate: {line_cache['hit_rate']:.1f}% "
+                f"({line_cache['hits']}/{line_cache['lookups']} files)"
+            )
+
         minutes = int(summary['processing_time'] // 60)
         seconds = int(summary['processing_time'] % 60)
         print(f"Processing Time: {minutes}m {seconds}s")
@@ -7,7 +7,8 @@ import click
 from pathlib import Path
 
 from .analyzer import RepositoryAnalyzer
-from .config import VERSION
+from .regrader import regrade_workbook
+from .config import VERSION, MIRROR_CACHE_SIZE_MB, METRICS_BACKENDS, DEFAULT_METRICS_BACKEND, LINE_LIMIT
 from .errors import ExcelError, RepositoryAnalyzerError
 
 
@@ -45,7 +46,55 @@ def cli():
     is_flag=True,
     help='Enable verbose output'
 )
-def analyze(input_path: str, output_path: str, verbose: bool):
+@click.option(
+    '--workers',
+    '-w',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of repositories to clone and analyze in parallel (default: 1)'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Clone and analyze every repository from scratch (no mirror cache, no stored results)'
+)
+@click.option(
+    '--cache-size',
+    'cache_size_mb',
+    default=MIRROR_CACHE_SIZE_MB,
+    type=click.FloatRange(min=0),
+    help=f'Maximum size of the mirror cache in MB (default: {MIRROR_CACHE_SIZE_MB})'
+)
+@click.option(
+    '--metrics-backend',
+    default=DEFAULT_METRICS_BACKEND,
+    type=click.Choice(METRICS_BACKENDS),
+    help='tree: read files from the cached mirror without a checkout; '
+         'checkout: extract files first (always used with --no-cache)'
+)
+@click.option(
+    '--similarity',
+    is_flag=True,
+    help='Check submissions for similar code (Similarity sheet); reads every file, '
+         'even those whose line counts are cached'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Continue an interrupted run of the same input file: reuse its finished '
+         'repositories and analyze only the rest'
+)
+def analyze(
+    input_path: str,
+    output_path: str,
+    verbose: bool,
+    workers: int,
+    no_cache: bool,
+    cache_size_mb: float,
+    metrics_backend: str,
+    similarity: bool,
+    resume: bool
+):
     """
     Analyze repositories from Excel file and generate graded output.
 
@@ -58,6 +107,12 @@ def analyze(input_path: str, output_path: str, verbose: bool):
         python -m repo_analyzer.cli analyze --input homework_emails.xlsx
 
         python -m repo_analyzer.cli analyze -i hw.xlsx -o graded.xlsx
+
+        python -m repo_analyzer.cli analyze -i hw.xlsx --workers 8
+
+        python -m repo_analyzer.cli analyze -i hw.xlsx --resume
+
+        python -m repo_analyzer.cli analyze -i hw.xlsx --similarity
     """
     try:
         # Validate input file
@@ -79,13 +134,21 @@ def analyze(input_path: str, output_path: str, verbose: bool):
                 sys.exit(1)
 
         # Create analyzer
-        analyzer = RepositoryAnalyzer(verbose=verbose)
+        analyzer = RepositoryAnalyzer(
+            verbose=verbose,
+            workers=workers,
+            use_cache=not no_cache,
+            cache_size_mb=cache_size_mb,
+            metrics_backend=metrics_backend,
+            similarity=similarity
+        )
 
         # Run analysis
         try:
             summary = analyzer.analyze(
                 input_path=str(input_path),
-                output_path=str(output_path) if output_path else None
+                output_path=str(output_path) if output_path else None,
+                resume=resume
             )
 
             # Success
@@ -102,6 +165,7 @@ def analyze(input_path: str, output_path: str, verbose: bool):
         except KeyboardInterrupt:
             click.echo()
             click.echo(click.style("Analysis interrupted by user.", fg='yellow'))
+            click.echo("Run again with --resume to continue where it stopped.")
             sys.exit(130)
 
         except Exception as e:
@@ -116,6 +180,62 @@ def analyze(input_path: str, output_path: str, verbose: bool):
         sys.exit(1)
 
 
+@cli.command()
+@click.option(
+    '--input',
+    '-i',
+    'input_path',
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    help='Graded Excel file written by analyze'
+)
+@click.option(
+    '--line-limit',
+    '-l',
+    default=LINE_LIMIT,
+    type=click.IntRange(min=1),
+    help=f'Files with fewer non-empty lines count as under the limit (default: {LINE_LIMIT})'
+)
+@click.option(
+    '--extensions',
+    '-e',
+    help='Comma-separated code extensions to count, e.g. ".py,.js" (default: all analyzed)'
+)
+@click.option(
+    '--output',
+    '-o',
+    'output_path',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Path to regraded Excel file (default: overwrite the input file)'
+)
+def regrade(input_path: str, line_limit: int, extensions: str, output_path: str):
+    """
+    Recompute grades of a graded workbook without cloning.
+
+    Uses the per-file line counts that analyze stores next to the graded
+    workbook (<name>.files.sqlite).
+
+    Example:
+
+        python -m repo_analyzer.cli regrade -i output/hw_graded.xlsx --line-limit 100
+    """
+    allowed_extensions = [ext.strip() for ext in extensions.split(',') if ext.strip()] if extensions else None
+
+    try:
+        summary = regrade_workbook(input_path, line_limit, allowed_extensions, output_path)
+    except RepositoryAnalyzerError as e:
+        click.echo(click.style(f"Regrade Error: {str(e)}", fg='red'))
+        sys.exit(1)
+
+    click.echo(
+        f"Regraded {summary['regraded']}/{summary['total_repos']} repositories "
+        f"with line limit {line_limit} in {summary['processing_time'] * 1000:.0f} ms"
+    )
+    if summary['unchanged']:
+        click.echo(f"Unchanged (failed or without per-file counts): {summary['unchanged']}")
+    click.echo(f"Output: {summary['output_path']}")
+
+
 @cli.command()
 def version():
     """Display version information."""
@@ -2,6 +2,8 @@
 Configuration constants for Repository Analyzer Agent.
 """
 
+from pathlib import Path
+
 # Code file extensions to analyze (case-insensitive)
 CODE_EXTENSIONS = [
     '.py', '.java', '.js', '.ts', '.jsx', '.tsx',
@@ -22,14 +24,52 @@ EXCLUDE_DIRS = [
 LINE_LIMIT = 130
 
 # Git clone settings
-CLONE_TIMEOUT = 300  # 5 minutes in seconds (note: not enforced on Windows)
-RETRY_ATTEMPTS = 1  # Changed to 1 for faster feedback in Phase 1
-RETRY_BACKOFF_BASE = 2  # seconds (exponential: 2s, 4s, 8s)
+CLONE_TIMEOUT = 300  # 5 minutes in seconds (git process tree is killed on expiry)
+LS_REMOTE_TIMEOUT = 30  # seconds
+RETRY_ATTEMPTS = 3  # Retries are deferred, so they no longer hold up the batch
+RETRY_BACKOFF_BASE = 2  # seconds (exponential: 2s, 4s, 8s, jittered)
+RETRY_BACKOFF_MAX = 60  # seconds
+CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive connection failures before a host is no longer retried
+GIT_POLL_INTERVAL = 0.5  # seconds between deadline/size checks of a running git
+
+# Repositories above this size are rejected (GitHub API pre-check) or
+# stopped while downloading
+MAX_REPO_SIZE_MB = 500
+
+# Partial clone filter: large blobs (datasets, binaries) are not downloaded;
+# clones fetch large code files during checkout (under the clone deadline),
+# while mirrors skip them
+PARTIAL_CLONE_FILTER = 'blob:limit=1m'
 
 # Output settings
 OUTPUT_DIR = "output"
 TEMP_DIR_PREFIX = "repoanalyzer_"
 
+# Persistent bare-mirror cache (regrades fetch only the new HEAD commit)
+CACHE_ROOT = Path.home() / '.repoanalyzer'
+MIRROR_CACHE_DIR = CACHE_ROOT / 'mirrors'
+MIRROR_CACHE_SIZE_MB = 2048
+
+# Metrics backends: 'tree' reads blobs from the mirror, 'checkout' walks extracted files
+METRICS_BACKENDS = ['tree', 'checkout']
+DEFAULT_METRICS_BACKEND = 'tree'
+
+# Stored metrics per (repository, commit, metrics settings)
+RESULTS_STORE_PATH = CACHE_ROOT / 'results.sqlite'
+
+# Line counts per git blob ID, shared by all repositories and runs
+LINE_COUNT_CACHE_PATH = CACHE_ROOT / 'line_counts.sqlite'
+
+# Progress journals of analyze runs (for --resume)
+JOURNAL_DIR = CACHE_ROOT / 'journals'
+
+# Similarity index of all submissions (MinHash signatures in LSH buckets)
+SIMILARITY_INDEX_PATH = CACHE_ROOT / 'similarity.sqlite'
+SHINGLE_SIZE = 5  # tokens per shingle
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32  # 4 rows per band: pairs above ~0.5 similarity are very likely candidates
+SIMILARITY_THRESHOLD = 0.5  # minimum estimated Jaccard similarity reported
+
 # Excel column names
 EXCEL_COLUMNS = {
     'input': {
@@ -61,6 +101,7 @@ STATUS_NO_CODE = "No Code Files"
 STATUS_INVALID_URL = "Invalid URL"
 STATUS_NETWORK_ERROR = "Network Error"
 STATUS_FORBIDDEN = "Access Denied"
+STATUS_TOO_LARGE = "Too Large"
 
 # Version
 VERSION = "1.0.0"
@@ -43,6 +43,11 @@ class RepositoryAccessDeniedError(RepositoryError):
     pass
 
 
+class RepositoryTooLargeError(RepositoryError):
+    """Raised when repository exceeds the maximum repository size."""
+    pass
+
+
 class InvalidURLError(RepositoryError):
     """Raised when repository URL is invalid."""
     pass
@@ -61,3 +66,8 @@ class NoCodeFilesError(RepositoryAnalyzerError):
 class MetricsCalculationError(RepositoryAnalyzerError):
     """Raised when metrics calculation fails."""
     pass
+
+
+class FileTableNotFoundError(RepositoryAnalyzerError):
+    """Raised when a graded workbook has no stored per-file line counts."""
+    pass
@@ -4,7 +4,7 @@ Excel manager for reading input and writing output files.
 
 import os
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import statistics
 
@@ -14,7 +14,7 @@ try:
 except ImportError:
     raise ImportError("openpyxl is required. Install with: pip install openpyxl")
 
-from .config import EXCEL_COLUMNS, OUTPUT_DIR, STATUS_SUCCESS
+from .config import EXCEL_COLUMNS, OUTPUT_DIR, STATUS_SUCCESS, LINE_LIMIT
 from .errors import ExcelNotFoundError, ExcelInvalidFormatError
 
 
@@ -29,7 +29,9 @@ class ExcelManager:
             file_path: Path to input Excel file
 
         Returns:
-            List of dicts with keys: id, date, subject, url, row_index
+            List of dicts with keys: id, date, subject, url, row_index and,
+            if the file has a Repo column (written by the Gmail export), repo
+            (resolved repository link, '' if the row has none)
 
         Raises:
             ExcelNotFoundError: If file doesn't exist
@@ -88,6 +90,7 @@ class ExcelManager:
             id_col = headers.get('ID')
             date_col = headers.get('Date')
             subject_col = headers.get('Subject')
+            repo_col = headers.get('Repo')
 
             for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=False), start=2):
                 # Get URL (required)
@@ -112,6 +115,9 @@ class ExcelManager:
                 if subject_col:
                     row_data['subject'] = row[subject_col - 1].value or ''
 
+                if repo_col:
+                    row_data['repo'] = str(row[repo_col - 1].value or '').strip()
+
                 data.append(row_data)
 
             if not data:
@@ -129,7 +135,11 @@ class ExcelManager:
         output_path: str,
         original_data: List[Dict],
         results: List[Dict],
-        processing_time: float
+        processing_time: float,
+        line_cache_stats: Optional[Dict] = None,
+        line_limit: int = LINE_LIMIT,
+        similar_pairs: Optional[List[Dict]] = None,
+        timing: Optional[Dict] = None
     ):
         """
         Write graded results to Excel file.
@@ -139,6 +149,15 @@ class ExcelManager:
             original_data: Original data from input Excel
             results: Processing results for each repository
             processing_time: Total processing time in seconds
+            line_cache_stats: Line count cache statistics (hits, lookups,
+                hit_rate), or None if the cache was disabled
+            line_limit: Line limit the grades were calculated with
+            similar_pairs: Candidate pairs of similar submissions (url,
+                other_url, other_label, similarity), or None to omit the
+                Similarity sheet
+            timing: Stage timings with keys 'stages' (Tracer.stage_summary)
+                and 'repos' (Tracer.repo_breakdown), or None to omit the
+                Timing sheet
 
         Raises:
             ExcelInvalidFormatError: If writing fails
@@ -148,10 +167,18 @@ class ExcelManager:
             wb = Workbook()
 
             # Create results sheet
-            self._create_results_sheet(wb, original_data, results)
+            self._create_results_sheet(wb, original_data, results, line_limit)
 
             # Create summary sheet
-            self._create_summary_sheet(wb, results, processing_time)
+            self._create_summary_sheet(wb, results, processing_time, line_cache_stats)
+
+            # Create similarity sheet
+            if similar_pairs is not None:
+                self._create_similarity_sheet(wb, similar_pairs)
+
+            # Create timing sheet
+            if timing is not None:
+                self._create_timing_sheet(wb, timing)
 
             # Ensure output directory exists
             output_path = Path(output_path)
@@ -163,11 +190,88 @@ class ExcelManager:
         except Exception as e:
             raise ExcelInvalidFormatError(f"Failed to write Excel file: {str(e)}")
 
+    def rewrite_results(
+        self,
+        workbook_path: str,
+        output_path: str,
+        original_data: List[Dict],
+        results: List[Dict],
+        processing_time: float,
+        line_limit: int = LINE_LIMIT
+    ):
+        """
+        Rewrite the results and summary sheets of a graded workbook.
+
+        The other sheets (Similarity, Timing) are copied through unchanged,
+        and the line count cache statistics of the old summary are kept.
+
+        Args:
+            workbook_path: Graded Excel file written by write_output
+            output_path: Path to output Excel file (may be workbook_path)
+            original_data: Original data from input Excel
+            results: Processing results for each repository
+            processing_time: Total processing time in seconds
+            line_limit: Line limit the grades were calculated with
+
+        Raises:
+            ExcelInvalidFormatError: If reading or writing fails
+        """
+        try:
+            wb = load_workbook(workbook_path)
+
+            line_cache_stats = None
+            if 'Summary' in wb.sheetnames:
+                line_cache_stats = self._read_line_cache_stats(wb['Summary'])
+            for name in ('Graded Results', 'Summary'):
+                if name in wb.sheetnames:
+                    del wb[name]
+
+            # Rebuild both sheets in front of the copied ones
+            self._create_results_sheet(wb, original_data, results, line_limit)
+            self._create_summary_sheet(wb, results, processing_time, line_cache_stats)
+            for index, name in enumerate(('Graded Results', 'Summary')):
+                ws = wb[name]
+                wb.move_sheet(ws, offset=index - wb.index(ws))
+            wb.active = 0
+
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            wb.save(output_path)
+
+        except Exception as e:
+            raise ExcelInvalidFormatError(f"Failed to write Excel file: {str(e)}")
+
+    def _read_line_cache_stats(self, ws) -> Optional[Dict]:
+        """
+        Read the line count cache statistics back from a summary sheet.
+
+        Args:
+            ws: Summary worksheet written by _create_summary_sheet
+
+        Returns:
+            Dict with keys hits, lookups and hit_rate, or None if the sheet
+            has no line count cache section
+        """
+        values = {}
+        for row in ws.iter_rows(min_col=1, max_col=2, values_only=True):
+            if isinstance(row[0], str):
+                values[row[0].strip()] = row[1]
+
+        if 'Line Count Cache:' not in values:
+            return None
+        hits, lookups = (int(part) for part in values['Files From Cache:'].split(' of '))
+        return {
+            'hits': hits,
+            'lookups': lookups,
+            'hit_rate': float(values['Hit Rate:'].rstrip('%'))
+        }
+
     def _create_results_sheet(
         self,
         wb: Workbook,
         original_data: List[Dict],
-        results: List[Dict]
+        results: List[Dict],
+        line_limit: int = LINE_LIMIT
     ):
         """
         Create the graded results sheet.
@@ -176,6 +280,7 @@ class ExcelManager:
             wb: Workbook object
             original_data: Original input data
             results: Processing results
+            line_limit: Line limit shown in the files-under-limit header
         """
         # Get or create sheet
         if 'Sheet' in wb.sheetnames:
@@ -193,7 +298,7 @@ class ExcelManager:
             columns['url'],
             columns['grade'],
             columns['total_files'],
-            columns['files_under_130'],
+            columns['files_under_130'].replace(str(LINE_LIMIT), str(line_limit)),
             columns['total_lines'],
             columns['status'],
             columns['error'],
@@ -272,7 +377,8 @@ class ExcelManager:
         self,
         wb: Workbook,
         results: List[Dict],
-        processing_time: float
+        processing_time: float,
+        line_cache_stats: Optional[Dict] = None
     ):
         """
         Create the summary statistics sheet.
@@ -281,6 +387,7 @@ class ExcelManager:
             wb: Workbook object
             results: Processing results
             processing_time: Total processing time in seconds
+            line_cache_stats: Line count cache statistics, or None
         """
         ws = wb.create_sheet('Summary')
 
@@ -338,6 +445,12 @@ class ExcelManager:
         seconds = int(processing_time % 60)
         ws.append([f"  {minutes} minutes {seconds} seconds"])
 
+        if line_cache_stats is not None:
+            ws.append([])
+            ws.append(["Line Count Cache:"])
+            ws.append(["  Hit Rate:", f"{line_cache_stats['hit_rate']:.1f}%"])
+            ws.append(["  Files From Cache:", f"{line_cache_stats['hits']} of {line_cache_stats['lookups']}"])
+
         # Error report
         if failed > 0:
             ws.append([])
@@ -356,6 +469,79 @@ class ExcelManager:
         ws.column_dimensions['A'].width = 30
         ws.column_dimensions['B'].width = 40
 
+    def _create_similarity_sheet(self, wb: Workbook, similar_pairs: List[Dict]):
+        """
+        Create the sheet of similar submission pairs.
+
+        Args:
+            wb: Workbook object
+            similar_pairs: Candidate pairs, most similar first
+        """
+        ws = wb.create_sheet('Similarity')
+        ws.append(['URL', 'Similar To', 'Similar Submission From', 'Estimated Similarity'])
+
+        header_font = Font(bold=True)
+        header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+        for cell in ws[1]:
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal='center')
+
+        for pair in similar_pairs:
+            ws.append([
+                pair['url'],
+                pair['other_url'],
+                pair['other_label'],
+                f"{pair['similarity'] * 100:.1f}%"
+            ])
+
+        ws.column_dimensions['A'].width = 50
+        ws.column_dimensions['B'].width = 50
+        ws.column_dimensions['C'].width = 25
+        ws.column_dimensions['D'].width = 20
+
+    def _create_timing_sheet(self, wb: Workbook, timing: Dict):
+        """
+        Create the sheet of per-stage timings.
+
+        Args:
+            wb: Workbook object
+            timing: Dict with 'stages' (per-stage count, total, p50, p95, max
+                in seconds) and 'repos' (seconds per stage for each repository)
+        """
+        ws = wb.create_sheet('Timing')
+        header_font = Font(bold=True)
+        header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+
+        def append_header(headers: List[str]):
+            ws.append(headers)
+            for cell in ws[ws.max_row]:
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = Alignment(horizontal='center')
+
+        append_header(['Stage', 'Spans', 'Total (s)', 'p50 (s)', 'p95 (s)', 'Max (s)'])
+        for stage in timing['stages']:
+            ws.append([
+                stage['stage'],
+                stage['count'],
+                round(stage['total'], 3),
+                round(stage['p50'], 3),
+                round(stage['p95'], 3),
+                round(stage['max'], 3)
+            ])
+
+        stages = [stage['stage'] for stage in timing['stages'] if stage['stage'] != 'excel_write']
+        if timing['repos']:
+            ws.append([])
+            append_header(['URL'] + [f"{stage} (s)" for stage in stages])
+            for repo in timing['repos']:
+                ws.append([repo['repo']] + [round(repo.get(stage, 0.0), 3) for stage in stages])
+
+        ws.column_dimensions['A'].width = 50
+        for column in 'BCDEFGH':
+            ws.column_dimensions[column].width = 14
+
     def generate_output_path(self, input_path: str) -> str:
         """
         Generate output file path based on input path.
@@ -0,0 +1,189 @@
+"""
+Per-file line counts of graded repositories, stored next to the workbook.
+
+The graded workbook only keeps aggregates such as files_under_130, so a new
+line limit or extension list would otherwise mean cloning and counting every
+repository again. Each repository's code files are kept as a packed table
+(path hash, extension id, line count) in a SQLite sidecar file, from which
+grades can be recomputed in milliseconds.
+"""
+
+import base64
+import hashlib
+import json
+import sqlite3
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .config import CODE_EXTENSIONS
+
+# Extension ids index this list; the sidecar records it, so ids stay valid
+# if CODE_EXTENSIONS changes later
+EXTENSIONS = [ext.lower() for ext in CODE_EXTENSIONS]
+_EXTENSION_IDS = {ext: idx for idx, ext in enumerate(EXTENSIONS)}
+
+# Column typecodes: 64-bit path hash, 16-bit extension id, 32-bit line count
+_COLUMNS = ('Q', 'H', 'I')
+
+
+def pack_file_table(files: Iterable[Tuple[str, int]]) -> str:
+    """
+    Pack the line counts of a repository's code files.
+
+    The table is sorted by path hash, stored column by column as
+    little-endian arrays and base64-encoded, so it passes unchanged through JSON (results store,
+    progress journal).
+
+    Args:
+        files: (path relative to the repository root, line count) pairs
+
+    Returns:
+        Packed table as ASCII text
+    """
+    records = []
+    for path, line_count in files:
+        path = str(path).replace('\\', '/')
+        digest = hashlib.sha1(path.encode('utf-8')).digest()
+        extension_id = _EXTENSION_IDS.get(Path(path).suffix.lower(), len(EXTENSIONS))
+        records.append((int.from_bytes(digest[:8], 'little'), extension_id, line_count))
+
+    # Sorted by path hash, so the table does not depend on traversal order
+    records.sort()
+    path_hashes, extension_ids, lines = (
+        array(typecode, column) for typecode, column in zip(_COLUMNS, zip(*records) if records else ((), (), ()))
+    )
+
+    packed = b''
+    for column in (path_hashes, extension_ids, lines):
+        if sys.byteorder == 'big':
+            column.byteswap()
+        packed += column.tobytes()
+
+    return base64.b64encode(len(lines).to_bytes(4, 'little') + packed).decode('ascii')
+
+
+def unpack_file_table(packed: str) -> Tuple[array, array, array]:
+    """
+    Unpack a table created by pack_file_table().
+
+    Args:
+        packed: Packed table
+
+    Returns:
+        Tuple of arrays (path_hashes, extension_ids, line_counts)
+    """
+    data = base64.b64decode(packed)
+    count = int.from_bytes(data[:4], 'little')
+    offset = 4
+    columns = []
+
+    for typecode in _COLUMNS:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        columns.append(column)
+        offset += size
+
+    return tuple(columns)
+
+
+def sidecar_path(workbook_path: str) -> Path:
+    """
+    Get the file table store belonging to a graded workbook.
+
+    Args:
+        workbook_path: Path to the graded Excel file
+
+    Returns:
+        Path of the sidecar, e.g. hw_graded.files.sqlite for hw_graded.xlsx
+    """
+    return Path(workbook_path).with_suffix('.files.sqlite')
+
+
+class FileTableStore:
+    """SQLite sidecar holding the rows of a graded workbook and their file tables."""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize file table store.
+
+        Args:
+            db_path: Path to the sidecar database
+        """
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS meta ('
+            '  key TEXT PRIMARY KEY,'
+            '  value TEXT NOT NULL'
+            ')'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS rows ('
+            '  position INTEGER PRIMARY KEY,'
+            '  row_data TEXT NOT NULL,'
+            '  result TEXT NOT NULL,'
+            '  file_table TEXT'
+            ')'
+        )
+        self.conn.commit()
+
+    def write(
+        self,
+        original_data: List[Dict],
+        results: List[Dict],
+        line_limit: int,
+        extensions: List[str] = EXTENSIONS
+    ):
+        """
+        Replace the stored rows with those of a graded workbook.
+
+        Args:
+            original_data: Original data from input Excel
+            results: Results for each row (with 'file_table' where available)
+            line_limit: Line limit the results were graded with
+            extensions: Extension table the file tables were packed with
+        """
+        rows = []
+        for position, (row, result) in enumerate(zip(original_data, results)):
+            result = dict(result)
+            file_table = result.pop('file_table', None)
+            rows.append((position, json.dumps(row, default=str), json.dumps(result), file_table))
+
+        with self.conn:
+            self.conn.execute('DELETE FROM rows')
+            self.conn.executemany(
+                'INSERT INTO rows (position, row_data, result, file_table) VALUES (?, ?, ?, ?)', rows
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                [('extensions', json.dumps(extensions)), ('line_limit', str(line_limit))]
+            )
+
+    def read(self) -> Tuple[List[Dict], List[Dict], List[str]]:
+        """
+        Read the stored rows.
+
+        Returns:
+            Tuple of (original_data, results, extensions); results carry their
+            'file_table' (None if it is unknown), extensions maps extension ids
+        """
+        meta = dict(self.conn.execute('SELECT key, value FROM meta'))
+        extensions = json.loads(meta.get('extensions', '[]'))
+
+        original_data, results = [], []
+        for row_data, result, file_table in self.conn.execute(
+            'SELECT row_data, result, file_table FROM rows ORDER BY position'
+        ):
+            original_data.append(json.loads(row_data))
+            results.append(dict(json.loads(result), file_table=file_table))
+
+        return original_data, results, extensions
+
+    def close(self):
+        """Close the sidecar database."""
+        self.conn.close()
@@ -0,0 +1,177 @@
+"""
+Run git commands under a hard deadline and a size cap.
+
+GitPython cannot enforce a timeout on clones (and not at all on Windows), so
+network operations run git directly. On expiry the whole git process tree
+(including git-remote-https and index-pack) is killed.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Set, Union
+
+from git import GitCommandError
+
+from .config import CODE_EXTENSIONS, GIT_POLL_INTERVAL, PARTIAL_CLONE_FILTER
+from .errors import RepositoryTimeoutError, RepositoryTooLargeError
+
+
+def run_git(
+    args: List[str],
+    cwd: Optional[Union[str, Path]] = None,
+    timeout: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    watch_dir: Optional[Union[str, Path]] = None
+) -> str:
+    """
+    Run a git command and return its output.
+
+    Args:
+        args: Git arguments (without the leading 'git')
+        cwd: Working directory
+        timeout: Hard deadline in seconds; the process tree is killed on expiry
+        max_bytes: Kill the process once watch_dir grows beyond this size
+        watch_dir: Directory the command writes to (e.g. the clone target)
+
+    Returns:
+        Standard output of the command
+
+    Raises:
+        GitCommandError: If git exits with an error
+        RepositoryTimeoutError: If the deadline expires
+        RepositoryTooLargeError: If watch_dir grows beyond max_bytes
+    """
+    command = ['git'] + list(args)
+
+    # Never wait for credentials: private repositories fail instead of hanging
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+
+    if sys.platform == 'win32':
+        group_kwargs = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group_kwargs = {'start_new_session': True}
+
+    # Files instead of pipes, so a chatty process cannot block while polled
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            command, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+            stdout=stdout, stderr=stderr, **group_kwargs
+        )
+
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            try:
+                proc.wait(timeout=GIT_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            if deadline is not None and time.monotonic() > deadline:
+                _kill_process_tree(proc)
+                raise RepositoryTimeoutError(f"git {args[0]} timed out after {timeout:.0f}s")
+
+            if max_bytes is not None and watch_dir is not None and dir_size(watch_dir) > max_bytes:
+                _kill_process_tree(proc)
+                raise RepositoryTooLargeError(
+                    f"git {args[0]} stopped: repository exceeds {max_bytes // (1024 * 1024)} MB"
+                )
+
+        stdout.seek(0)
+        stderr.seek(0)
+        output = stdout.read().decode('utf-8', errors='replace')
+
+        if proc.returncode != 0:
+            raise GitCommandError(command, proc.returncode, stderr.read())
+
+    return output
+
+
+def local_blob_ids(
+    git_dir: Union[str, Path],
+    treeish: str,
+    timeout: Optional[float] = None
+) -> Set[str]:
+    """
+    Get the blobs of a commit that can be read without a lazy fetch.
+
+    In a partial clone, reading a blob the clone left out makes git fetch it
+    from the promisor remote, outside run_git's deadline and size cap. The
+    listing itself never fetches (--missing=print): blobs missing locally and
+    blobs over the PARTIAL_CLONE_FILTER size limit are left out.
+
+    Args:
+        git_dir: Path to the repository (e.g. a bare mirror)
+        treeish: Commit or ref to list
+        timeout: Hard deadline in seconds
+
+    Returns:
+        Hex SHAs of the blobs (and trees) present locally within the size limit
+
+    Raises:
+        GitCommandError: If git exits with an error
+        RepositoryTimeoutError: If the deadline expires
+    """
+    output = run_git(
+        ['rev-list', '--objects', '--missing=print', f'--filter={PARTIAL_CLONE_FILTER}',
+         '--filter-print-omitted', treeish],
+        cwd=git_dir,
+        timeout=timeout
+    )
+    # Missing objects are printed as '?<sha>', omitted ones as '~<sha>'
+    return {line.split(' ', 1)[0] for line in output.splitlines() if line and line[0] not in '?~'}
+
+
+def _kill_process_tree(proc: subprocess.Popen):
+    """Kill a git process together with the helpers it spawned."""
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(
+                ['taskkill', '/F', '/T', '/PID', str(proc.pid)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        proc.kill()
+    proc.wait()
+
+
+def dir_size(path: Union[str, Path]) -> int:
+    """
+    Total size of the files below a directory.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        Size in bytes (0 if the directory does not exist)
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def code_path_patterns() -> List[str]:
+    """
+    Sparse-checkout patterns matching code files by extension, case-insensitively.
+
+    For example '*.[pP][yY]' for '.py'.
+
+    Returns:
+        One pattern per entry of CODE_EXTENSIONS
+    """
+    patterns = []
+    for ext in CODE_EXTENSIONS:
+        letters = ''.join(f"[{c.lower()}{c.upper()}]" if c.isalpha() else c for c in ext.lstrip('.'))
+        patterns.append(f"*.{letters}")
+    return patterns
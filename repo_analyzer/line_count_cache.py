@@ -0,0 +1,134 @@
+"""
+Content-addressed cache of per-file line counts.
+
+Students fork the same course template, so most files are byte-identical
+across repositories. Line counts are stored by git blob object ID, which is
+free for files read from a commit tree and computed from the contents for
+files on disk, so identical files are counted once across repositories and
+runs.
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from .config import LINE_COUNT_CACHE_PATH
+from .line_counter import MMAP_THRESHOLD
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+
+def git_blob_id(data: bytes) -> str:
+    """
+    Compute the git blob object ID of file contents (as git hash-object).
+
+    Args:
+        data: File contents
+
+    Returns:
+        Hex SHA-1 object ID
+    """
+    digest = hashlib.sha1(b'blob %d\0' % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def file_blob_id(file_path: Union[str, Path]) -> str:
+    """
+    Compute the git blob object ID of a file on disk.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex SHA-1 object ID
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size < MMAP_THRESHOLD:
+            return git_blob_id(f.read())
+
+        digest = hashlib.sha1(b'blob %d\0' % size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+        return digest.hexdigest()
+
+
+class LineCountCache:
+    """SQLite-backed map of git blob ID to non-empty line count."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize line count cache.
+
+        Args:
+            db_path: Path to the SQLite database (default: ~/.repoanalyzer/line_counts.sqlite)
+        """
+        self.db_path = Path(db_path) if db_path else LINE_COUNT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Metrics worker processes share the database
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS line_counts ('
+            '  blob_id TEXT PRIMARY KEY,'
+            '  lines INTEGER NOT NULL'
+            ')'
+        )
+        self.conn.commit()
+
+    def get_many(self, blob_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Look up line counts of blobs.
+
+        Args:
+            blob_ids: Git blob object IDs
+
+        Returns:
+            Dictionary of blob ID to line count, for cache hits only
+        """
+        blob_ids = list(blob_ids)
+        hits: Dict[str, int] = {}
+
+        for start in range(0, len(blob_ids), _SQL_CHUNK):
+            chunk = blob_ids[start:start + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT blob_id, lines FROM line_counts WHERE blob_id IN ({placeholders})', chunk
+            ).fetchall()
+            hits.update(rows)
+
+        return hits
+
+    def get(self, blob_id: str) -> Optional[int]:
+        """Look up the line count of a single blob."""
+        return self.get_many([blob_id]).get(blob_id)
+
+    def put_many(self, counts: Dict[str, int]):
+        """
+        Store line counts of blobs.
+
+        Args:
+            counts: Dictionary of blob ID to line count
+        """
+        if not counts:
+            return
+
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO line_counts (blob_id, lines) VALUES (?, ?)',
+            counts.items()
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the cache database."""
+        self.conn.close()
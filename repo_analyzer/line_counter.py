@@ -0,0 +1,121 @@
+"""
+Byte-level counter of non-empty lines.
+
+Gives the same counts as reading a file in text mode (UTF-8, errors ignored,
+universal newlines) and keeping lines that are non-empty after str.strip(),
+but works on raw bytes with C-level bytes operations instead of a Python
+loop over decoded lines. Large files are read through mmap in chunks.
+"""
+
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Union
+
+# Files at least this large are mapped instead of read into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# Size of the pieces large files and blob streams are counted in
+CHUNK_SIZE = 1024 * 1024
+
+# ASCII characters that str.strip() removes, apart from the line breaks
+_ASCII_WHITESPACE = b' \t\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# Bytes that only occur in non-ASCII text (or invalid UTF-8)
+_NON_ASCII_BYTES = bytes(range(0x80, 0x100))
+
+# Universal newlines: \r ends a line like \n. Turning \r\n into two breaks
+# only adds empty lines, which are never counted.
+_CR_TO_LF = bytes.maketrans(b'\r', b'\n')
+
+# Blank lines of decoded text (searched in the text prefixed with a line
+# break); \s matches exactly the characters str.strip() removes
+_BLANK_LINE = re.compile(r'\n[^\S\n]*(?=\n|\Z)')
+
+
+def count_nonempty_lines_in_bytes(data: bytes) -> int:
+    """
+    Count non-empty lines in a buffer of complete lines.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Number of lines that are non-empty after stripping whitespace
+    """
+    data = data.translate(_CR_TO_LF)
+
+    # Without ASCII whitespace, the only separators left are line breaks,
+    # so every remaining non-empty run is a non-empty line
+    stripped = data.translate(None, _ASCII_WHITESPACE)
+    count = len(stripped.split())
+
+    if data.isascii():
+        return count
+
+    # A line whose only content is non-ASCII bytes may still be blank: the
+    # bytes can decode to Unicode whitespace (e.g. U+00A0, U+3000) or to
+    # nothing (invalid UTF-8 is ignored). Only then decode the contents.
+    if len(stripped.translate(None, _NON_ASCII_BYTES).split()) == count:
+        return count
+
+    # Invalid UTF-8 never swallows a line break, so decoding keeps the lines
+    text = data.decode('utf-8', errors='ignore')
+    return text.count('\n') + 1 - len(_BLANK_LINE.findall('\n' + text))
+
+
+def count_nonempty_lines_in_chunks(chunks: Iterable[bytes]) -> int:
+    """
+    Count non-empty lines in a stream of byte chunks.
+
+    Chunks may split lines anywhere; each piece is counted up to its last
+    line break and the rest is carried into the next chunk.
+
+    Args:
+        chunks: Consecutive pieces of the contents
+
+    Returns:
+        Number of lines that are non-empty after stripping whitespace
+    """
+    count = 0
+    carry = b''
+
+    for chunk in chunks:
+        buffer = carry + chunk
+        cut = max(buffer.rfind(b'\n'), buffer.rfind(b'\r')) + 1
+        # Only empty lines are added where a \r\n pair is split, so any
+        # line break is a safe place to cut
+        if cut:
+            count += count_nonempty_lines_in_bytes(buffer[:cut])
+        carry = buffer[cut:]
+
+    if carry:
+        count += count_nonempty_lines_in_bytes(carry)
+
+    return count
+
+
+def count_nonempty_lines(file_path: Union[str, Path]) -> int:
+    """
+    Count non-empty lines in a file.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Number of lines that are non-empty after stripping whitespace
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size < MMAP_THRESHOLD:
+            return count_nonempty_lines_in_bytes(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return count_nonempty_lines_in_chunks(
+                mapped[start:start + CHUNK_SIZE] for start in range(0, len(mapped), CHUNK_SIZE)
+            )
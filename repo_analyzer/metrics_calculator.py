@@ -4,30 +4,75 @@ Calculates lines of code, file counts, and grades.
 """
 
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Tuple
-from .config import CODE_EXTENSIONS, EXCLUDE_DIRS, LINE_LIMIT
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from git import Repo
+
+from .config import CODE_EXTENSIONS, EXCLUDE_DIRS, LINE_LIMIT, CLONE_TIMEOUT
 from .errors import MetricsCalculationError
+from .git_runner import local_blob_ids
+from .line_counter import CHUNK_SIZE, count_nonempty_lines, count_nonempty_lines_in_chunks
+from .line_count_cache import LineCountCache, file_blob_id
+from .file_table_store import pack_file_table
+from .similarity import code_shingles, minhash_signature
+from .timing import stage_timer
+
+
+# Git file mode of symbolic links (their blob holds the link target)
+_SYMLINK_MODE = 0o120000
+
+
+def calculate_grade(files_under_limit: int, total_files: int) -> float:
+    """
+    Calculate grade as percentage of files under line limit.
+
+    Formula: (files_under_limit / total_files) * 100
+
+    Args:
+        files_under_limit: Number of files below the line limit
+        total_files: Total number of code files
+
+    Returns:
+        Grade as float (0.00-100.00), rounded to 2 decimal places
+    """
+    if total_files == 0:
+        return 0.00
+
+    percentage = (files_under_limit / total_files) * 100
+    return round(percentage, 2)
 
 
 class MetricsCalculator:
     """Calculate code metrics and grade for a repository."""
 
-    def __init__(self):
-        """Initialize metrics calculator."""
+    def __init__(self, line_cache: Optional[LineCountCache] = None, similarity: bool = False):
+        """
+        Initialize metrics calculator.
+
+        Args:
+            line_cache: Cache of line counts by git blob ID (None = count every file)
+            similarity: Also compute a MinHash signature of the code (see similarity)
+        """
         self.code_extensions = [ext.lower() for ext in CODE_EXTENSIONS]
         self.exclude_dirs = set(EXCLUDE_DIRS)
         self.line_limit = LINE_LIMIT
+        self.line_cache = line_cache
+        self.similarity = similarity
 
-    def calculate(self, repo_path: str) -> Dict:
+    def calculate(self, repo_path: str, subpath: str = '') -> Dict:
         """
         Calculate metrics for a repository.
 
         Args:
             repo_path: Path to the cloned repository
+            subpath: Only analyze this subdirectory ('' = whole repository)
 
         Returns:
-            Dict with keys: total_lines, total_files, files_under_130, grade
+            Dict with keys: total_lines, total_files, files_under_130, grade,
+                file_table
 
         Raises:
             MetricsCalculationError: If calculation fails
@@ -38,40 +83,203 @@ class MetricsCalculator:
             if not repo_path.exists():
                 raise MetricsCalculationError(f"Repository path does not exist: {repo_path}")
 
-            total_lines = 0
-            total_files = 0
-            files_under_limit = 0
+            root = repo_path / subpath if subpath else repo_path
+            if not root.is_dir():
+                raise MetricsCalculationError(f"Directory not found in repository: {subpath}")
+
+            files = (
+                (
+                    file_path.relative_to(repo_path),
+                    lambda file_path=file_path: self._count_lines_cached(
+                        lambda: file_blob_id(file_path),
+                        lambda: self._count_lines(file_path)
+                    ),
+                    file_path.read_bytes
+                )
+                for file_path in self._traverse_code_files(root)
+            )
+            return self._summarize(files)
 
-            # Traverse directory tree
-            for file_path in self._traverse_code_files(repo_path):
-                try:
-                    line_count = self._count_lines(file_path)
-                    total_lines += line_count
-                    total_files += 1
+        except Exception as e:
+            if isinstance(e, MetricsCalculationError):
+                raise
+            raise MetricsCalculationError(f"Metrics calculation failed: {str(e)}")
 
-                    if line_count < self.line_limit:
-                        files_under_limit += 1
+    def calculate_tree(self, git_dir: str, treeish: str = 'HEAD', subpath: str = '') -> Dict:
+        """
+        Calculate metrics from a commit tree without checking it out.
 
-                except Exception as e:
-                    # Skip files that can't be read, but log warning
-                    print(f"Warning: Could not read file {file_path}: {e}")
-                    continue
+        Walks the tree objects of a (bare) repository and counts lines from
+        blob contents, applying the same file and directory rules as
+        calculate(). Blobs a partial clone left out, or over its size limit,
+        are skipped rather than fetched.
 
-            # Calculate grade
-            grade = self._calculate_grade(files_under_limit, total_files)
+        Args:
+            git_dir: Path to the repository (e.g. a bare mirror)
+            treeish: Commit or ref to analyze
+            subpath: Only analyze this subdirectory ('' = whole repository)
+
+        Returns:
+            Dict with keys: total_lines, total_files, files_under_130, grade,
+                file_table
+
+        Raises:
+            MetricsCalculationError: If calculation fails
+        """
+        try:
+            if not Path(git_dir).exists():
+                raise MetricsCalculationError(f"Repository path does not exist: {git_dir}")
 
-            return {
-                'total_lines': total_lines,
-                'total_files': total_files,
-                'files_under_130': files_under_limit,
-                'grade': grade
-            }
+            # Blobs a partial clone left out are skipped, never fetched
+            readable = local_blob_ids(git_dir, treeish, timeout=CLONE_TIMEOUT)
+            tree = Repo(git_dir).commit(treeish).tree
+            if subpath:
+                try:
+                    tree = tree / subpath
+                except KeyError:
+                    tree = None
+                if getattr(tree, 'type', None) != 'tree':
+                    raise MetricsCalculationError(f"Directory not found in repository: {subpath}")
+            files = (
+                (
+                    blob.path,
+                    lambda blob=blob: self._count_lines_cached(
+                        lambda: blob.hexsha,
+                        lambda: self._count_blob_lines(blob)
+                    ),
+                    lambda blob=blob: blob.data_stream.read()
+                )
+                for blob in self._traverse_code_blobs(tree)
+                if blob.hexsha in readable
+            )
+            return self._summarize(files)
 
         except Exception as e:
             if isinstance(e, MetricsCalculationError):
                 raise
             raise MetricsCalculationError(f"Metrics calculation failed: {str(e)}")
 
+    def _summarize(self, files) -> Dict:
+        """
+        Count lines of code files and compute the grade.
+
+        Args:
+            files: Iterable of (path, count_lines, read) triples, where path is
+                relative to the repository root, count_lines() returns the
+                number of non-empty lines of the file and read() its contents
+
+        Returns:
+            Dict with keys: total_lines, total_files, files_under_130, grade,
+                line_cache_hits, line_cache_lookups, file_table (packed
+                per-file line counts, see file_table_store), timings (seconds
+                spent per stage, see timing.Tracer.add_metrics_timings) and,
+                if similarity is enabled, minhash (packed signature or None)
+        """
+        total_lines = 0
+        total_files = 0
+        files_under_limit = 0
+        file_lines = []
+        shingles = set()
+        timings = {'start': time.time(), 'pid': os.getpid(), 'tid': threading.get_ident()}
+
+        self._new_counts: Dict[str, int] = {}
+        self._cache_hits = 0
+        self._cache_lookups = 0
+
+        for file_path, count_lines, read in self._timed(files, timings, 'traverse'):
+            try:
+                with stage_timer(timings, 'count'):
+                    line_count = count_lines()
+                if self.similarity:
+                    with stage_timer(timings, 'similarity'):
+                        shingles.update(code_shingles(read()))
+                file_lines.append((file_path, line_count))
+                total_lines += line_count
+                total_files += 1
+
+                if line_count < self.line_limit:
+                    files_under_limit += 1
+
+            except Exception as e:
+                # Skip files that can't be read, but log warning
+                print(f"Warning: Could not read file {file_path}: {e}")
+                continue
+
+        # Share new line counts with later repositories and runs
+        if self.line_cache is not None:
+            with stage_timer(timings, 'count'):
+                self.line_cache.put_many(self._new_counts)
+
+        # Calculate grade
+        with stage_timer(timings, 'grade'):
+            grade = self._calculate_grade(files_under_limit, total_files)
+            file_table = pack_file_table(file_lines)
+
+        metrics = {
+            'total_lines': total_lines,
+            'total_files': total_files,
+            'files_under_130': files_under_limit,
+            'grade': grade,
+            'line_cache_hits': self._cache_hits,
+            'line_cache_lookups': self._cache_lookups,
+            'file_table': file_table,
+            'timings': timings
+        }
+
+        if self.similarity:
+            with stage_timer(timings, 'similarity'):
+                metrics['minhash'] = minhash_signature(shingles)
+
+        return metrics
+
+    def _timed(self, items: Iterable, timings: Dict, stage: str) -> Iterator:
+        """
+        Yield from an iterable, adding the time spent producing items to timings[stage].
+
+        Args:
+            items: Lazy iterable (e.g. a directory walk)
+            timings: Dictionary of stage name to seconds
+            stage: Stage name
+
+        Yields:
+            The items of the iterable
+        """
+        iterator = iter(items)
+        while True:
+            with stage_timer(timings, stage):
+                item = next(iterator, None)
+            if item is None:
+                return
+            yield item
+
+    def _count_lines_cached(self, blob_id: Callable[[], str], count_lines: Callable[[], int]) -> int:
+        """
+        Count lines of a file, reusing the count of identical contents.
+
+        Args:
+            blob_id: Returns the git blob ID of the file
+            count_lines: Returns the number of non-empty lines of the file
+
+        Returns:
+            Number of non-empty lines
+        """
+        if self.line_cache is None:
+            return count_lines()
+
+        key = blob_id()
+        self._cache_lookups += 1
+
+        lines = self._new_counts.get(key)
+        if lines is None:
+            lines = self.line_cache.get(key)
+        if lines is not None:
+            self._cache_hits += 1
+            return lines
+
+        lines = count_lines()
+        self._new_counts[key] = lines
+        return lines
+
     def _traverse_code_files(self, repo_path: Path):
         """
         Traverse repository and yield code file paths.
@@ -93,6 +301,26 @@ class MetricsCalculator:
                 if self._is_code_file(file_path):
                     yield file_path
 
+    def _traverse_code_blobs(self, tree) -> Iterator:
+        """
+        Traverse a git tree object and yield blobs of code files.
+
+        Args:
+            tree: GitPython Tree object
+
+        Yields:
+            Blob objects for code files (symlinks are skipped)
+        """
+        for blob in tree.blobs:
+            if blob.mode == _SYMLINK_MODE:
+                continue
+            if self._is_code_file(Path(blob.name)):
+                yield blob
+
+        for subtree in tree.trees:
+            if subtree.name not in self.exclude_dirs:
+                yield from self._traverse_code_blobs(subtree)
+
     def _is_code_file(self, file_path: Path) -> bool:
         """
         Check if a file is a code file (not config, docs, or binary).
@@ -143,38 +371,25 @@ class MetricsCalculator:
         Returns:
             Number of non-empty lines
         """
-        line_count = 0
-
-        try:
-            # Try UTF-8 first
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    # Strip whitespace
-                    stripped = line.strip()
+        return count_nonempty_lines(file_path)
 
-                    # Count non-empty lines (including comments)
-                    if stripped:
-                        line_count += 1
+    def _count_blob_lines(self, blob) -> int:
+        """
+        Count non-empty lines in a git blob, like _count_lines().
 
-        except Exception as e:
-            # Try with different encoding
-            try:
-                with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
-                    for line in f:
-                        stripped = line.strip()
-                        if stripped:
-                            line_count += 1
-            except:
-                raise Exception(f"Could not read file with any encoding: {e}")
+        Args:
+            blob: GitPython Blob object
 
-        return line_count
+        Returns:
+            Number of non-empty lines
+        """
+        stream = blob.data_stream
+        return count_nonempty_lines_in_chunks(iter(lambda: stream.read(CHUNK_SIZE), b''))
 
     def _calculate_grade(self, files_under_limit: int, total_files: int) -> float:
         """
         Calculate grade as percentage of files under line limit.
 
-        Formula: (files_under_limit / total_files) * 100
-
         Args:
             files_under_limit: Number of files with < LINE_LIMIT lines
             total_files: Total number of code files
@@ -182,8 +397,4 @@ class MetricsCalculator:
         Returns:
             Grade as float (0.00-100.00), rounded to 2 decimal places
         """
-        if total_files == 0:
-            return 0.00
-
-        percentage = (files_under_limit / total_files) * 100
-        return round(percentage, 2)
+        return calculate_grade(files_under_limit, total_files)
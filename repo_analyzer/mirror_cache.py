@@ -0,0 +1,309 @@
+"""
+Persistent cache of bare repository mirrors.
+
+Each repository is kept as a bare mirror keyed by its normalized URL. A
+regrade only fetches the new HEAD commit (`git fetch --depth=1`) instead of
+downloading the whole repository again, and the code files are written from
+the commit's blobs instead of a clone. The cache is bounded by size and
+evicts the least recently used mirrors.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from git import Repo
+
+from .config import (
+    MIRROR_CACHE_DIR,
+    MIRROR_CACHE_SIZE_MB,
+    CODE_EXTENSIONS,
+    CLONE_TIMEOUT,
+    MAX_REPO_SIZE_MB,
+    PARTIAL_CLONE_FILTER
+)
+from .git_runner import run_git, dir_size, local_blob_ids
+
+# Local ref holding the fetched remote HEAD in every mirror
+HEAD_REF = 'refs/analyzer/head'
+
+# Git file mode of symbolic links
+_SYMLINK_MODE = 0o120000
+
+# Marker file whose mtime records when a mirror was last used
+_LAST_USED_FILE = 'analyzer_last_used'
+
+
+def normalize_repo_url(url: str) -> str:
+    """
+    Canonicalize a repository URL so equivalent spellings share one key.
+
+    Handles the git@ SSH form, trailing slashes, a .git suffix, query
+    strings and, for GitHub, letter case and deep links such as
+    /tree/<branch> or /blob/<branch>/<path> (which point into the same
+    repository). Local repositories (file:// URLs and absolute paths) keep
+    their path.
+
+    Args:
+        url: Repository URL (HTTPS or git@ SSH form)
+
+    Returns:
+        Canonical URL, e.g. https://github.com/owner/repo
+    """
+    url = url.strip()
+
+    if url.startswith('git@'):
+        host, _, path = url[len('git@'):].partition(':')
+        url = f"https://{host}/{path}"
+
+    url = url.split('#', 1)[0].split('?', 1)[0]
+
+    scheme, sep, rest = url.partition('://')
+    # Local repositories (benchmarks): the path names a directory, so a
+    # .git suffix is kept
+    if scheme.lower() == 'file' and sep:
+        return 'file://' + rest.rstrip('/')
+    if not sep and os.path.isabs(url):
+        return url.rstrip('/') or url
+
+    if not sep:
+        return _strip_git_suffix(url.rstrip('/'))
+
+    host, _, path = rest.partition('/')
+    scheme, host = scheme.lower(), host.lower()
+    segments = [segment for segment in path.split('/') if segment]
+
+    if host in ('github.com', 'www.github.com'):
+        # GitHub names are case-insensitive; only owner/repo identify the repository
+        scheme, host = 'https', 'github.com'
+        segments = [segment.lower() for segment in segments[:2]]
+
+    if segments:
+        segments[-1] = _strip_git_suffix(segments[-1])
+        return f"{scheme}://{host}/{'/'.join(segments)}"
+    return f"{scheme}://{host}"
+
+
+def split_repo_link(link: str) -> Tuple[str, str]:
+    """
+    Split a repository link into the repository and a directory inside it.
+
+    GitHub /tree/<ref>/<path> links (as written to the Repo column by the
+    Gmail export) point into a subdirectory; the ref itself is not used,
+    since repositories are analyzed at their default branch.
+
+    Args:
+        link: Repository URL or /tree/ link
+
+    Returns:
+        Tuple of (repository URL, subdirectory relative to the repository
+        root); other links are returned unchanged with subdirectory ''
+    """
+    parsed = urlparse(link.strip())
+    if (parsed.hostname or '').lower() not in ('github.com', 'www.github.com'):
+        return link, ''
+
+    segments = [unquote(segment) for segment in parsed.path.split('/') if segment]
+    if len(segments) < 5 or segments[2] != 'tree':
+        return link, ''
+
+    path = [segment for segment in segments[4:] if segment not in ('.', '..')]
+    return normalize_repo_url(link), '/'.join(path)
+
+
+def _strip_git_suffix(name: str) -> str:
+    """Remove a trailing '.git' (and only that) from a repository name or URL."""
+    return name[:-len('.git')] if name.endswith('.git') else name
+
+
+class MirrorCache:
+    """Size-bounded LRU cache of bare repository mirrors."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: float = MIRROR_CACHE_SIZE_MB):
+        """
+        Initialize mirror cache.
+
+        Args:
+            cache_dir: Directory holding the mirrors (default: ~/.repoanalyzer/mirrors)
+            max_size_mb: Maximum total size of all mirrors in megabytes
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else MIRROR_CACHE_DIR
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+
+        # One lock per mirror; clone() may run in worker threads
+        self._lock = threading.Lock()
+        self._mirror_locks: Dict[str, threading.Lock] = {}
+
+    def mirror_path(self, url: str) -> Path:
+        """
+        Get the mirror directory for a repository URL.
+
+        Args:
+            url: Repository URL
+
+        Returns:
+            Path of the bare mirror (may not exist yet)
+        """
+        key = hashlib.sha1(normalize_repo_url(url).encode('utf-8')).hexdigest()
+        return self.cache_dir / key
+
+    def checkout(self, url: str, local_path: Path):
+        """
+        Fetch the remote HEAD into the mirror and extract it to local_path.
+
+        Args:
+            url: Repository URL
+            local_path: Destination directory for the working files
+
+        Raises:
+            GitCommandError: If fetching from the remote fails
+        """
+        mirror = self.mirror_path(url)
+
+        with self._mirror_lock(mirror):
+            self._fetch(url, mirror)
+            self.extract(mirror, local_path)
+
+        self.evict(keep=mirror)
+
+    def fetch(self, url: str) -> Path:
+        """
+        Create or refresh the mirror of a repository.
+
+        Only the remote HEAD commit is fetched (depth 1) into HEAD_REF, as a
+        partial clone without large blobs. The mirror is not evicted here, so
+        callers can read it until they call evict() themselves.
+
+        Args:
+            url: Repository URL
+
+        Returns:
+            Path of the bare mirror
+
+        Raises:
+            GitCommandError: If fetching from the remote fails
+            RepositoryTimeoutError: If the fetch exceeds CLONE_TIMEOUT
+            RepositoryTooLargeError: If the mirror grows beyond MAX_REPO_SIZE_MB
+        """
+        mirror = self.mirror_path(url)
+
+        with self._mirror_lock(mirror):
+            return self._fetch(url, mirror)
+
+    def _fetch(self, url: str, mirror: Path) -> Path:
+        if (mirror / 'HEAD').exists():
+            repo = Repo(mirror)
+            repo.git.remote('set-url', 'origin', url)
+        else:
+            mirror.mkdir(parents=True, exist_ok=True)
+            repo = Repo.init(mirror, bare=True)
+            repo.git.remote('add', 'origin', url)
+
+        # Mark the mirror as a partial clone of origin; reads skip missing blobs
+        # (see local_blob_ids) rather than fetching them from the promisor
+        with repo.config_writer() as config:
+            config.set_value('core', 'repositoryformatversion', '1')
+            config.set_value('extensions', 'partialClone', 'origin')
+            config.set_value('remote "origin"', 'promisor', 'true')
+            config.set_value('remote "origin"', 'partialclonefilter', PARTIAL_CLONE_FILTER)
+
+        try:
+            run_git(
+                ['fetch', '--depth=1', '--no-tags', f'--filter={PARTIAL_CLONE_FILTER}',
+                 'origin', f'+HEAD:{HEAD_REF}'],
+                cwd=mirror,
+                timeout=CLONE_TIMEOUT,
+                max_bytes=MAX_REPO_SIZE_MB * 1024 * 1024,
+                watch_dir=mirror
+            )
+        except Exception:
+            # Do not keep an empty mirror for a repository that never fetched
+            if not self._has_head(repo):
+                shutil.rmtree(mirror, ignore_errors=True)
+            raise
+
+        (mirror / _LAST_USED_FILE).touch()
+        return mirror
+
+    def extract(self, mirror: Path, local_path: Path):
+        """
+        Extract the code files of the mirrored HEAD commit.
+
+        Only paths matching CODE_EXTENSIONS are extracted, and only from
+        blobs already in the mirror: blobs left out by the partial clone
+        (datasets, binaries, files over the size limit) are skipped instead
+        of being fetched lazily.
+
+        Args:
+            mirror: Path of the bare mirror
+            local_path: Destination directory
+        """
+        local_path.mkdir(parents=True, exist_ok=True)
+        code_extensions = {ext.lower() for ext in CODE_EXTENSIONS}
+
+        readable = local_blob_ids(mirror, HEAD_REF, timeout=CLONE_TIMEOUT)
+        tree = Repo(mirror).commit(HEAD_REF).tree
+        for item in tree.traverse():
+            if item.type != 'blob' or item.mode == _SYMLINK_MODE:
+                continue
+            if item.hexsha not in readable:
+                continue
+            if Path(item.path).suffix.lower() not in code_extensions:
+                continue
+
+            file_path = local_path / item.path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, 'wb') as f:
+                shutil.copyfileobj(item.data_stream, f)
+
+    def evict(self, keep: Optional[Path] = None):
+        """
+        Delete least recently used mirrors until the cache fits max_bytes.
+
+        Args:
+            keep: Mirror that must not be evicted (the one just used)
+        """
+        if not self.cache_dir.exists():
+            return
+
+        with self._lock:
+            mirrors = []
+            for mirror in self.cache_dir.iterdir():
+                if not mirror.is_dir():
+                    continue
+                marker = mirror / _LAST_USED_FILE
+                last_used = marker.stat().st_mtime if marker.exists() else 0.0
+                mirrors.append((last_used, mirror, dir_size(mirror)))
+
+            total = sum(size for _, _, size in mirrors)
+            for _, mirror, size in sorted(mirrors, key=lambda item: item[0]):
+                if total <= self.max_bytes:
+                    break
+                if mirror == keep:
+                    continue
+                lock = self._mirror_locks.get(mirror.name)
+                if lock is not None and lock.locked():
+                    continue
+                shutil.rmtree(mirror, ignore_errors=True)
+                total -= size
+
+    def size_bytes(self) -> int:
+        """Total size of all mirrors in bytes."""
+        if not self.cache_dir.exists():
+            return 0
+        return dir_size(self.cache_dir)
+
+    def _mirror_lock(self, mirror: Path) -> threading.Lock:
+        with self._lock:
+            return self._mirror_locks.setdefault(mirror.name, threading.Lock())
+
+    def _has_head(self, repo: Repo) -> bool:
+        try:
+            repo.git.rev_parse('--verify', '--quiet', HEAD_REF)
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,113 @@
+"""
+Append-only journal of per-repository results of an analyze run.
+
+Every finished repository is appended as one JSON line and flushed to disk,
+so a run that dies part-way (Ctrl-C, sleep, out of memory) can be resumed:
+completed results are replayed and only the remaining rows are processed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .config import JOURNAL_DIR
+
+
+def journal_path(input_path: str) -> Path:
+    """
+    Get the journal file of an input Excel file.
+
+    Args:
+        input_path: Path to input Excel file
+
+    Returns:
+        Path below JOURNAL_DIR, unique per absolute input path
+    """
+    resolved = Path(input_path).resolve()
+    digest = hashlib.sha1(str(resolved).encode('utf-8')).hexdigest()[:12]
+    return JOURNAL_DIR / f"{resolved.stem}_{digest}.jsonl"
+
+
+class ProgressJournal:
+    """JSONL file with one record per completed repository."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize progress journal.
+
+        Args:
+            path: Path to the journal file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+
+    def load(self) -> Dict[Tuple[int, str], Dict]:
+        """
+        Read the results recorded by an earlier run.
+
+        A last line cut short by a crash is ignored.
+
+        Returns:
+            Dictionary of (row_index, url) to result dict
+        """
+        completed = {}
+        if not self.path.exists():
+            return completed
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    completed[(record['row_index'], record['url'])] = record['result']
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        return completed
+
+    def open(self, resume: bool = False):
+        """
+        Open the journal for appending.
+
+        Args:
+            resume: Keep the records of an earlier run (otherwise start empty)
+        """
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+        # Finish a line cut short by a crash, so the next record starts cleanly
+        if resume and self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def append(self, row_index: int, url: str, result: Dict):
+        """
+        Record the result of a repository and flush it to disk.
+
+        Args:
+            row_index: Excel row of the repository
+            url: Repository URL
+            result: Result dict of the repository
+        """
+        line = json.dumps({'row_index': row_index, 'url': url, 'result': result}, default=str)
+
+        self._file.write(line + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Close and delete the journal once the output is written."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
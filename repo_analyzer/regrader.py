@@ -0,0 +1,132 @@
+"""
+Recompute grades of a graded workbook from its stored per-file line counts.
+
+Changing the line limit or narrowing the extension list needs no clone and
+no line counting: grades, the results sheet and the summary sheet are
+rebuilt from the file table store written next to the workbook. The other
+sheets of the workbook (Similarity, Timing) are kept as they are.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .excel_manager import ExcelManager
+from .file_table_store import FileTableStore, sidecar_path, unpack_file_table
+from .metrics_calculator import calculate_grade
+from .config import STATUS_SUCCESS, STATUS_NO_CODE
+from .errors import FileTableNotFoundError
+
+
+def regrade_results(
+    results: List[Dict],
+    extensions: List[str],
+    line_limit: int,
+    allowed_extensions: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Recompute the metrics of results that carry a file table, in place.
+
+    Args:
+        results: Results read from a FileTableStore
+        extensions: Extension table of the store (extension id -> extension)
+        line_limit: Files with fewer non-empty lines count as under the limit
+        allowed_extensions: Only count files with these extensions (None = all)
+
+    Returns:
+        Number of results that were regraded; results without a file table
+        (failed repositories, results stored before file tables existed)
+        are left unchanged
+    """
+    allowed_ids = None
+    if allowed_extensions is not None:
+        allowed = {ext.lower() if ext.startswith('.') else f".{ext.lower()}" for ext in allowed_extensions}
+        allowed_ids = {idx for idx, ext in enumerate(extensions) if ext in allowed}
+
+    regraded = 0
+    for result in results:
+        if not result.get('file_table') or result.get('status') not in (STATUS_SUCCESS, STATUS_NO_CODE):
+            continue
+
+        _, extension_ids, line_counts = unpack_file_table(result['file_table'])
+        if allowed_ids is None:
+            counted = line_counts
+        else:
+            counted = [lines for ext_id, lines in zip(extension_ids, line_counts) if ext_id in allowed_ids]
+
+        total_files = len(counted)
+        files_under_limit = sum(1 for lines in counted if lines < line_limit)
+
+        result['total_files'] = total_files
+        result['files_under_130'] = files_under_limit
+        result['total_lines'] = sum(counted)
+        result['grade'] = calculate_grade(files_under_limit, total_files)
+        if total_files == 0:
+            result['status'] = STATUS_NO_CODE
+            result['error'] = 'No code files found in repository'
+        else:
+            result['status'] = STATUS_SUCCESS
+            result['error'] = ''
+
+        regraded += 1
+
+    return regraded
+
+
+def regrade_workbook(
+    workbook_path: str,
+    line_limit: int,
+    allowed_extensions: Optional[Iterable[str]] = None,
+    output_path: Optional[str] = None
+) -> Dict:
+    """
+    Regrade a graded workbook from its file table store.
+
+    Args:
+        workbook_path: Graded Excel file written by 'analyze'
+        line_limit: New line limit
+        allowed_extensions: Only count files with these extensions (None = all)
+        output_path: Where to write the regraded workbook (default: overwrite workbook_path)
+
+    Returns:
+        Dict with keys: total_repos, regraded, unchanged, output_path, processing_time
+
+    Raises:
+        FileTableNotFoundError: If the workbook has no file table store
+        ExcelInvalidFormatError: If writing the workbook fails
+    """
+    start_time = time.time()
+    source = sidecar_path(workbook_path)
+    if not source.exists():
+        raise FileTableNotFoundError(
+            f"No per-file line counts found for {workbook_path} (expected {source}); "
+            f"run 'analyze' again to create them"
+        )
+
+    store = FileTableStore(source)
+    try:
+        original_data, results, extensions = store.read()
+    finally:
+        store.close()
+
+    regraded = regrade_results(results, extensions, line_limit, allowed_extensions)
+
+    output_path = output_path or workbook_path
+    processing_time = time.time() - start_time
+    ExcelManager().rewrite_results(
+        workbook_path, output_path, original_data, results, processing_time, line_limit=line_limit
+    )
+
+    # Later regrades start from the same per-file counts
+    store = FileTableStore(sidecar_path(output_path))
+    try:
+        store.write(original_data, results, line_limit, extensions)
+    finally:
+        store.close()
+
+    return {
+        'total_repos': len(results),
+        'regraded': regraded,
+        'unchanged': len(results) - regraded,
+        'output_path': str(output_path),
+        'processing_time': time.time() - start_time
+    }
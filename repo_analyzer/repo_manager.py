@@ -2,40 +2,67 @@
 Repository manager for cloning and managing Git repositories.
 """
 
+import json
 import os
 import shutil
-import time
 import re
+import urllib.request
+from urllib.parse import urlparse
 from pathlib import Path
 from typing import Tuple, Optional
 import tempfile
+import threading
 from datetime import datetime
 
 try:
-    import git
-    from git import Repo, GitCommandError
+    from git import GitCommandError
 except ImportError:
     raise ImportError("GitPython is required. Install with: pip install GitPython")
 
-from .config import CLONE_TIMEOUT, RETRY_ATTEMPTS, RETRY_BACKOFF_BASE, TEMP_DIR_PREFIX
+from .config import (
+    CLONE_TIMEOUT,
+    LS_REMOTE_TIMEOUT,
+    RETRY_ATTEMPTS,
+    TEMP_DIR_PREFIX,
+    MAX_REPO_SIZE_MB,
+    PARTIAL_CLONE_FILTER
+)
+from .mirror_cache import MirrorCache, normalize_repo_url
+from .git_runner import run_git, code_path_patterns
+from .retry_queue import CircuitBreaker, backoff_delay
 from .errors import (
     RepositoryNotFoundError,
     RepositoryTimeoutError,
+    RepositoryTooLargeError,
     RepositoryAccessDeniedError,
     InvalidURLError,
     NetworkError
 )
 
+GITHUB_API_URL = 'https://api.github.com/repos/'
+
 
 class RepositoryManager:
     """Manage repository cloning and cleanup."""
 
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(
+        self,
+        temp_dir: Optional[str] = None,
+        mirror_cache: Optional[MirrorCache] = None,
+        checkout: bool = True,
+        allow_local: bool = False
+    ):
         """
         Initialize repository manager.
 
         Args:
             temp_dir: Custom temporary directory path. If None, creates one automatically.
+            mirror_cache: Persistent mirror cache. If given, repositories are
+                fetched into the cache and extracted instead of cloned.
+            checkout: Extract working files. If False (requires mirror_cache),
+                clone() only refreshes the mirror and returns its path.
+            allow_local: Also accept file:// URLs and local repository paths
+                (benchmark mode, see tests/bench_repo_analyzer.py)
         """
         if temp_dir is None:
             # Create temp directory with timestamp
@@ -46,11 +73,18 @@ class RepositoryManager:
 
         # Create temp directory if it doesn't exist
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.mirror_cache = mirror_cache
+        self.checkout = checkout or mirror_cache is None
+        self.allow_local = allow_local
         self.clone_count = 0
+        self._count_lock = threading.Lock()  # clone() may run in worker threads
+        self.circuit_breaker = CircuitBreaker()
 
     def clone(self, url: str) -> Tuple[Optional[str], bool, str]:
         """
-        Clone a GitHub repository with retries.
+        Clone a GitHub repository (a single attempt).
+
+        Transient failures are not retried here; see retry_delay().
 
         Args:
             url: GitHub repository URL (HTTPS)
@@ -70,37 +104,78 @@ class RepositoryManager:
         if not repo_name:
             return None, False, "Could not extract repository name from URL"
 
+        # Reject oversized repositories before downloading anything
+        size_error = self._check_repo_size(url)
+        if size_error:
+            return None, False, size_error
+
         # Create local path
-        self.clone_count += 1
-        local_path = self.temp_dir / f"repo_{self.clone_count}_{repo_name}"
+        with self._count_lock:
+            self.clone_count += 1
+            local_path = self.temp_dir / f"repo_{self.clone_count}_{repo_name}"
 
-        # Clone with retries
-        for attempt in range(1, RETRY_ATTEMPTS + 1):
-            try:
-                success, error = self._clone_once(url, local_path)
+        success, error = self._clone_once(url, local_path)
 
-                if success:
-                    return str(local_path), True, ""
+        # Any answer from the host (even "not found") closes its circuit
+        host = self._extract_host(url)
+        if not success and self._should_retry(error):
+            self.circuit_breaker.record_failure(host)
+        else:
+            self.circuit_breaker.record_success(host)
 
-                # Check if we should retry
-                if not self._should_retry(error) or attempt == RETRY_ATTEMPTS:
-                    return None, False, error
+        if not success:
+            return None, False, error
 
-                # Exponential backoff
-                backoff_time = RETRY_BACKOFF_BASE ** attempt
-                print(f"  Retry {attempt}/{RETRY_ATTEMPTS} in {backoff_time}s...")
-                time.sleep(backoff_time)
+        if not self.checkout:
+            return str(self.mirror_cache.mirror_path(url)), True, ""
+        return str(local_path), True, ""
 
-            except Exception as e:
-                error = str(e)
+    def retry_delay(self, url: str, error: str, attempt: int) -> Optional[float]:
+        """
+        Decide whether a failed clone should be retried later.
 
-                if attempt == RETRY_ATTEMPTS:
-                    return None, False, f"Clone failed after {RETRY_ATTEMPTS} attempts: {error}"
+        Args:
+            url: Repository URL
+            error: Error message of the failed attempt
+            attempt: Number of the attempt that failed (1 = first)
 
-                backoff_time = RETRY_BACKOFF_BASE ** attempt
-                time.sleep(backoff_time)
+        Returns:
+            Jittered backoff in seconds before the next attempt, or None if the
+            error is permanent, RETRY_ATTEMPTS is reached or the host's circuit
+            breaker is open
+        """
+        if attempt >= RETRY_ATTEMPTS or not self._should_retry(error):
+            return None
+
+        if self.circuit_breaker.is_open(self._extract_host(url)):
+            return None
 
-        return None, False, f"Clone failed after {RETRY_ATTEMPTS} attempts"
+        return backoff_delay(attempt)
+
+    def resolve_head(self, url: str) -> Optional[str]:
+        """
+        Resolve the remote HEAD commit without cloning (git ls-remote).
+
+        Args:
+            url: GitHub repository URL
+
+        Returns:
+            Commit SHA, or None if the URL is invalid or the remote cannot be reached
+        """
+        if not self._is_valid_github_url(url):
+            return None
+
+        try:
+            output = run_git(['ls-remote', url.strip(), 'HEAD'], timeout=LS_REMOTE_TIMEOUT)
+        except Exception:
+            return None
+
+        for line in output.splitlines():
+            sha, _, ref = line.partition('\t')
+            if ref == 'HEAD':
+                return sha
+
+        return None
 
     def _clone_once(self, url: str, local_path: Path) -> Tuple[bool, str]:
         """
@@ -118,24 +193,34 @@ class RepositoryManager:
             if local_path.exists():
                 shutil.rmtree(local_path)
 
-            # Clone with shallow depth for speed
-            # Note: GitPython's timeout parameter doesn't work reliably on Windows
-            # So we just clone without timeout for now
-            Repo.clone_from(
-                url,
-                local_path,
-                depth=1  # Shallow clone
-            )
+            if self.mirror_cache is not None:
+                # Refresh the cached mirror (and extract its HEAD)
+                if self.checkout:
+                    self.mirror_cache.checkout(url, local_path)
+                else:
+                    self.mirror_cache.fetch(url)
+                return True, ""
+
+            # Shallow partial clone under a hard deadline and size cap,
+            # checking out only code files
+            self._clone_code_files(url, local_path)
 
             return True, ""
 
+        except RepositoryTimeoutError:
+            return False, f"Clone timeout (>{CLONE_TIMEOUT // 60} min)"
+
+        except RepositoryTooLargeError:
+            return False, f"Repository too large (>{MAX_REPO_SIZE_MB} MB)"
+
         except GitCommandError as e:
             error_msg = str(e).lower()
 
             # Parse error type
             if '404' in error_msg or 'not found' in error_msg or 'repository not found' in error_msg:
                 return False, "Repository not found or deleted"
-            elif '403' in error_msg or 'forbidden' in error_msg:
+            elif ('403' in error_msg or 'forbidden' in error_msg
+                    or 'could not read username' in error_msg):
                 return False, "Private repository - access denied"
             elif 'timeout' in error_msg:
                 return False, "Clone timeout (>5 min)"
@@ -147,15 +232,88 @@ class RepositoryManager:
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
 
+    def _clone_code_files(self, url: str, local_path: Path):
+        """
+        Clone a repository, checking out only files with code extensions.
+
+        Uses a depth-1 partial clone (PARTIAL_CLONE_FILTER) and a sparse
+        checkout, so large non-code blobs are never downloaded. Every git
+        command runs under CLONE_TIMEOUT and MAX_REPO_SIZE_MB.
+
+        Args:
+            url: Repository URL
+            local_path: Local destination path
+
+        Raises:
+            GitCommandError: If a git command fails
+            RepositoryTimeoutError: If a git command exceeds CLONE_TIMEOUT
+            RepositoryTooLargeError: If the clone grows beyond MAX_REPO_SIZE_MB
+        """
+        limits = {
+            'timeout': CLONE_TIMEOUT,
+            'max_bytes': MAX_REPO_SIZE_MB * 1024 * 1024,
+            'watch_dir': local_path
+        }
+
+        run_git(
+            ['clone', '--depth=1', f'--filter={PARTIAL_CLONE_FILTER}', '--no-checkout',
+             url.strip(), str(local_path)],
+            **limits
+        )
+        run_git(['sparse-checkout', 'set', '--no-cone'] + code_path_patterns(), cwd=local_path, **limits)
+        run_git(['checkout'], cwd=local_path, **limits)
+
+    def _check_repo_size(self, url: str) -> Optional[str]:
+        """
+        Check the repository size reported by the GitHub API.
+
+        The check only runs when GITHUB_TOKEN is set: unauthenticated
+        requests are limited to 60 per hour, far fewer than a class of
+        clones. Without a token, or when the API cannot be reached or answers
+        with an error (e.g. 403 rate limited), the size is unknown (None) and
+        the size cap during the download applies instead.
+
+        Args:
+            url: GitHub repository URL
+
+        Returns:
+            Error message if the repository exceeds MAX_REPO_SIZE_MB, else None
+        """
+        if self._extract_host(url) not in ('github.com', 'www.github.com'):
+            return None  # Local repositories (benchmark mode) have no API entry
+
+        token = os.environ.get('GITHUB_TOKEN')
+        if not token:
+            return None
+
+        path = normalize_repo_url(url).split('github.com/', 1)[-1]
+        request = urllib.request.Request(GITHUB_API_URL + path)
+        request.add_header('Authorization', f'token {token}')
+
+        try:
+            with urllib.request.urlopen(request, timeout=LS_REMOTE_TIMEOUT) as response:
+                size_kb = json.load(response).get('size', 0)
+        except Exception:
+            return None
+
+        size_mb = size_kb / 1024
+        if size_mb > MAX_REPO_SIZE_MB:
+            return f"Repository too large ({size_mb:.0f} MB > {MAX_REPO_SIZE_MB} MB)"
+
+        return None
+
     def _is_valid_github_url(self, url: str) -> bool:
         """
         Validate GitHub URL format.
 
+        In benchmark mode (allow_local) file:// URLs and paths of local
+        directories are accepted as well.
+
         Args:
             url: URL to validate
 
         Returns:
-            True if valid GitHub URL
+            True if valid GitHub URL (or local repository in benchmark mode)
         """
         # Accept various GitHub URL formats
         patterns = [
@@ -168,6 +326,12 @@ class RepositoryManager:
             if re.match(pattern, url.strip()):
                 return True
 
+        if self.allow_local:
+            url = url.strip()
+            if url.startswith('file://'):
+                return bool(urlparse(url).path.strip('/'))
+            return os.path.isabs(url) and os.path.isdir(url)
+
         return False
 
     def _extract_repo_name(self, url: str) -> Optional[str]:
@@ -181,18 +345,33 @@ class RepositoryManager:
             Repository name or None if extraction fails
         """
         try:
-            # Remove trailing slashes and .git
-            url = url.strip().rstrip('/').rstrip('.git')
-
-            # Extract last part of URL
-            parts = url.split('/')
-            if len(parts) >= 2:
+            # Canonical form has no trailing slash or .git suffix (a plain
+            # rstrip('.git') would also eat names ending in g, i, t or '.')
+            parts = normalize_repo_url(url).split('/')
+            if len(parts) >= 2 and parts[-1]:
                 return parts[-1]
 
             return None
-        except:
+        except Exception:
             return None
 
+    def _extract_host(self, url: str) -> str:
+        """
+        Extract the host name from an HTTPS or SSH repository URL.
+
+        Args:
+            url: Repository URL
+
+        Returns:
+            Lower-case host name (empty string if there is none)
+        """
+        url = url.strip()
+        if '://' in url:
+            return (urlparse(url).hostname or '').lower()
+
+        # SSH form: git@github.com:owner/repo.git
+        return url.split('@', 1)[-1].split(':', 1)[0].lower()
+
     def _should_retry(self, error: str) -> bool:
         """
         Determine if error is transient and should be retried.
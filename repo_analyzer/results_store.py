@@ -0,0 +1,125 @@
+"""
+Persistent store of repository metrics keyed by commit.
+
+Metrics depend only on the repository contents and the metrics settings, so
+a result computed for (normalized URL, commit SHA, metrics config hash) can
+be reused on every later run until the student pushes a new commit or the
+settings change.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import CODE_EXTENSIONS, EXCLUDE_DIRS, LINE_LIMIT, RESULTS_STORE_PATH
+from .mirror_cache import normalize_repo_url
+
+# Metric fields persisted per repository
+METRIC_FIELDS = ('total_files', 'files_under_130', 'total_lines', 'grade')
+
+# Optional fields, persisted when present (packed per-file line counts,
+# MinHash signature)
+OPTIONAL_FIELDS = ('file_table', 'minhash')
+
+
+def metrics_config_hash() -> str:
+    """
+    Hash the settings that affect metrics, so changing them invalidates results.
+
+    Returns:
+        Hex digest of CODE_EXTENSIONS, EXCLUDE_DIRS and LINE_LIMIT
+    """
+    config = {
+        'code_extensions': sorted(ext.lower() for ext in CODE_EXTENSIONS),
+        'exclude_dirs': sorted(EXCLUDE_DIRS),
+        'line_limit': LINE_LIMIT,
+    }
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _store_key(url: str, subpath: str) -> str:
+    """Key of a repository (or one of its subdirectories) in the store."""
+    url = normalize_repo_url(url)
+    return f"{url}//{subpath}" if subpath else url
+
+
+class ResultsStore:
+    """SQLite-backed store of metrics per repository commit."""
+
+    def __init__(self, db_path: Optional[str] = None, config_hash: Optional[str] = None):
+        """
+        Initialize results store.
+
+        Args:
+            db_path: Path to the SQLite database (default: ~/.repoanalyzer/results.sqlite)
+            config_hash: Metrics config hash (default: metrics_config_hash())
+        """
+        self.db_path = Path(db_path) if db_path else RESULTS_STORE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.config_hash = config_hash or metrics_config_hash()
+
+        # Lookups run in clone worker threads
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            '  url TEXT NOT NULL,'
+            '  commit_sha TEXT NOT NULL,'
+            '  config_hash TEXT NOT NULL,'
+            '  metrics TEXT NOT NULL,'
+            '  updated REAL NOT NULL,'
+            '  PRIMARY KEY (url, commit_sha, config_hash)'
+            ')'
+        )
+        self.conn.commit()
+
+    def get(self, url: str, commit_sha: str, subpath: str = '') -> Optional[Dict]:
+        """
+        Look up stored metrics for a repository commit.
+
+        Args:
+            url: Repository URL
+            commit_sha: Commit SHA the metrics were calculated for
+            subpath: Subdirectory the metrics cover ('' = whole repository)
+
+        Returns:
+            Metrics dict with METRIC_FIELDS (and OPTIONAL_FIELDS stored with
+            them), or None if not stored
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT metrics FROM results WHERE url = ? AND commit_sha = ? AND config_hash = ?',
+                (_store_key(url, subpath), commit_sha, self.config_hash)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put(self, url: str, commit_sha: str, metrics: Dict, subpath: str = ''):
+        """
+        Store metrics for a repository commit.
+
+        Args:
+            url: Repository URL
+            commit_sha: Commit SHA the metrics were calculated for
+            metrics: Metrics dict (see MetricsCalculator.calculate)
+            subpath: Subdirectory the metrics cover ('' = whole repository)
+        """
+        data = {field: metrics[field] for field in METRIC_FIELDS}
+        data.update({field: metrics[field] for field in OPTIONAL_FIELDS if metrics.get(field)})
+        data = json.dumps(data)
+
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO results (url, commit_sha, config_hash, metrics, updated) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (_store_key(url, subpath), commit_sha, self.config_hash, data, time.time())
+            )
+            self.conn.commit()
+
+    def close(self):
+        """Close the store database."""
+        self.conn.close()
@@ -0,0 +1,126 @@
+"""
+Deferred retries of transient clone failures.
+
+A repository whose clone failed transiently is put back into a queue with a
+jittered exponential backoff instead of being retried after an inline sleep,
+so the rest of the batch proceeds while it waits. A per-host circuit breaker
+stops retrying a host that keeps failing to connect.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, CIRCUIT_BREAKER_THRESHOLD
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BACKOFF_BASE, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """
+    Jittered exponential backoff before the retry after a failed attempt.
+
+    The delay is drawn uniformly from the upper half of base ** attempt
+    (capped), so repositories that failed together are not retried together.
+
+    Args:
+        attempt: Number of the attempt that failed (1 = first)
+        base: Backoff base in seconds
+        cap: Maximum backoff in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    delay = min(cap, base ** attempt)
+    return random.uniform(delay / 2, delay)
+
+
+class CircuitBreaker:
+    """Count consecutive connection failures per host and open after a threshold."""
+
+    def __init__(self, threshold: int = CIRCUIT_BREAKER_THRESHOLD):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            threshold: Consecutive failures after which a host is no longer retried
+        """
+        self.threshold = threshold
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()  # Updated from clone worker threads
+
+    def record_failure(self, host: str):
+        """Count a connection failure of a host."""
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+
+    def record_success(self, host: str):
+        """Close the circuit of a host that was reached again."""
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def is_open(self, host: str) -> bool:
+        """
+        Check whether retries to a host are suspended.
+
+        Args:
+            host: Host name
+
+        Returns:
+            True if the host failed at least threshold times in a row
+        """
+        with self._lock:
+            return self._failures.get(host, 0) >= self.threshold
+
+
+class RetryQueue:
+    """Items waiting for a retry, ordered by the time they become due."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize retry queue.
+
+        Args:
+            clock: Monotonic time source (seconds)
+        """
+        self.clock = clock
+        self._heap = []
+        self._order = itertools.count()  # Keeps equal due times in scheduling order
+
+    def schedule(self, item: Any, delay: float):
+        """
+        Queue an item for a retry.
+
+        Args:
+            item: Item to retry (e.g. input row index and attempt number)
+            delay: Seconds from now until the item is due
+        """
+        heapq.heappush(self._heap, (self.clock() + delay, next(self._order), item))
+
+    def pop_ready(self) -> List[Any]:
+        """
+        Remove and return the items that are due.
+
+        Returns:
+            Due items, earliest first
+        """
+        now = self.clock()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap)[2])
+        return ready
+
+    def time_until_next(self) -> Optional[float]:
+        """
+        Get the time until the next item is due.
+
+        Returns:
+            Seconds (0 if an item is already due), or None if the queue is empty
+        """
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,262 @@
+"""
+Cross-submission similarity index (MinHash signatures in an LSH index).
+
+Each repository's code is reduced to a set of hashed token shingles and a
+fixed-size MinHash signature, whose agreement estimates the Jaccard
+similarity of two shingle sets. Signatures are split into bands and stored in
+SQLite buckets (locality-sensitive hashing), so finding the submissions that
+resemble a new one is a handful of bucket lookups instead of a comparison with
+every earlier submission. The index persists across lessons.
+"""
+
+import base64
+import hashlib
+import random
+import re
+import sqlite3
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .config import (
+    SIMILARITY_INDEX_PATH,
+    SHINGLE_SIZE,
+    MINHASH_PERMUTATIONS,
+    LSH_BANDS,
+    SIMILARITY_THRESHOLD
+)
+from .mirror_cache import normalize_repo_url
+
+# String literals, numbers, identifiers/keywords, then single symbols
+_TOKEN = re.compile(rb'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|\d[\w.]*|[A-Za-z_]\w*|[^\s\w]')
+
+# Universal hashing modulo a Mersenne prime: h(x) = (a * x + b) mod P
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # Fixed, so signatures stay comparable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(MINHASH_PERMUTATIONS)]
+
+
+def code_shingles(data: bytes) -> Set[int]:
+    """
+    Hash the token shingles of a code file.
+
+    Tokens are normalized so that formatting, literal values and letter case
+    do not matter: string literals become S, numbers N and identifiers are
+    lower-cased.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Set of 32-bit hashes of SHINGLE_SIZE consecutive tokens
+    """
+    tokens = []
+    for match in _TOKEN.finditer(data):
+        token = match.group()
+        first = token[:1]
+        if first in (b'"', b"'"):
+            tokens.append(b'S')
+        elif first.isdigit():
+            tokens.append(b'N')
+        else:
+            tokens.append(token.lower())
+
+    return {
+        zlib.crc32(b' '.join(tokens[start:start + SHINGLE_SIZE]))
+        for start in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+    } if tokens else set()
+
+
+def minhash_signature(shingles: Iterable[int]) -> Optional[str]:
+    """
+    Compute the MinHash signature of a shingle set.
+
+    Args:
+        shingles: Shingle hashes of all code files of a repository
+
+    Returns:
+        Signature packed as base64 text (JSON-safe, like file tables), or
+        None if there are no shingles
+    """
+    shingles = list(shingles)
+    if not shingles:
+        return None
+
+    signature = array('Q', (min([(a * x + b) % _PRIME for x in shingles]) for a, b in _PERMUTATIONS))
+    if sys.byteorder == 'big':
+        signature.byteswap()
+    return base64.b64encode(signature.tobytes()).decode('ascii')
+
+
+def unpack_signature(packed: str) -> array:
+    """Unpack a signature created by minhash_signature()."""
+    signature = array('Q')
+    signature.frombytes(base64.b64decode(packed))
+    if sys.byteorder == 'big':
+        signature.byteswap()
+    return signature
+
+
+def estimate_similarity(first: array, second: array) -> float:
+    """
+    Estimate the Jaccard similarity of two shingle sets from their signatures.
+
+    Args:
+        first: Signature of the first set
+        second: Signature of the second set
+
+    Returns:
+        Fraction of matching MinHash values (0.0-1.0)
+    """
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+def _band_keys(signature: array) -> List[str]:
+    """Hash each band of a signature into an LSH bucket key."""
+    rows = len(signature) // LSH_BANDS
+    return [
+        hashlib.sha1(signature[band * rows:(band + 1) * rows].tobytes()).hexdigest()[:16]
+        for band in range(LSH_BANDS)
+    ]
+
+
+class SimilarityIndex:
+    """SQLite-backed LSH index of repository MinHash signatures."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize similarity index.
+
+        Args:
+            db_path: Path to the SQLite database (default:
+                ~/.repoanalyzer/similarity.sqlite; ':memory:' for a single run)
+        """
+        if db_path == ':memory:':
+            self.db_path = db_path
+        else:
+            self.db_path = Path(db_path) if db_path else SIMILARITY_INDEX_PATH
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS signatures ('
+            '  url TEXT PRIMARY KEY,'
+            '  label TEXT NOT NULL,'
+            '  signature TEXT NOT NULL'
+            ')'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            '  band INTEGER NOT NULL,'
+            '  bucket TEXT NOT NULL,'
+            '  url TEXT NOT NULL,'
+            '  PRIMARY KEY (band, bucket, url)'
+            ')'
+        )
+        self.conn.commit()
+
+    def add(self, url: str, signature: str, label: str = ''):
+        """
+        Index (or re-index) the signature of a repository.
+
+        Args:
+            url: Repository URL
+            signature: Packed signature from minhash_signature()
+            label: Where the submission came from (e.g. the lesson's input file)
+        """
+        url = normalize_repo_url(url)
+        keys = _band_keys(unpack_signature(signature))
+
+        with self.conn:
+            self.conn.execute('DELETE FROM buckets WHERE url = ?', (url,))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO signatures (url, label, signature) VALUES (?, ?, ?)',
+                (url, label, signature)
+            )
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO buckets (band, bucket, url) VALUES (?, ?, ?)',
+                [(band, key, url) for band, key in enumerate(keys)]
+            )
+
+    def query(self, url: str, signature: str, threshold: float = SIMILARITY_THRESHOLD) -> List[Dict]:
+        """
+        Find indexed repositories similar to a signature.
+
+        Args:
+            url: Repository URL of the signature (excluded from the matches)
+            signature: Packed signature from minhash_signature()
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            List of dicts with keys: url, label, similarity (most similar first)
+        """
+        url = normalize_repo_url(url)
+        unpacked = unpack_signature(signature)
+
+        candidates = set()
+        for band, key in enumerate(_band_keys(unpacked)):
+            rows = self.conn.execute(
+                'SELECT url FROM buckets WHERE band = ? AND bucket = ?', (band, key)
+            ).fetchall()
+            candidates.update(row[0] for row in rows)
+        candidates.discard(url)
+
+        matches = []
+        for candidate in candidates:
+            label, packed = self.conn.execute(
+                'SELECT label, signature FROM signatures WHERE url = ?', (candidate,)
+            ).fetchone()
+            similarity = estimate_similarity(unpacked, unpack_signature(packed))
+            if similarity >= threshold:
+                matches.append({'url': candidate, 'label': label, 'similarity': similarity})
+
+        return sorted(matches, key=lambda match: (-match['similarity'], match['url']))
+
+    def close(self):
+        """Close the index database."""
+        self.conn.close()
+
+
+def find_similar_pairs(index: SimilarityIndex, results: List[Dict], label: str = '') -> List[Dict]:
+    """
+    Add the signatures of a run to the index and collect candidate pairs.
+
+    Each repository is compared with everything indexed before it (earlier
+    lessons and earlier rows of this run), so every pair is reported once.
+
+    Args:
+        index: Similarity index
+        results: Processing results ('minhash' is set for analyzed repositories)
+        label: Label of this run's submissions
+
+    Returns:
+        List of dicts with keys: url, other_url, other_label, similarity
+    """
+    pairs = []
+    seen = set()
+    reported = set()
+
+    for result in results:
+        signature = result.get('minhash')
+        url = normalize_repo_url(result['url'])
+        if not signature or url in seen:
+            continue
+        seen.add(url)
+
+        for match in index.query(url, signature):
+            # Rows indexed by an earlier run of the same lesson match both ways
+            key = frozenset((url, match['url']))
+            if key in reported:
+                continue
+            reported.add(key)
+            pairs.append({
+                'url': result['url'],
+                'other_url': match['url'],
+                'other_label': match['label'],
+                'similarity': match['similarity']
+            })
+        index.add(url, signature, label)
+
+    return sorted(pairs, key=lambda pair: -pair['similarity'])
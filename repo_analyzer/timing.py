@@ -0,0 +1,208 @@
+"""
+Per-stage timing spans of an analyze run.
+
+Spans are recorded per repository (resolve, clone, traverse, count,
+similarity, grade) and for the run (excel_write). They can be exported as a
+Chrome trace (chrome://tracing, Perfetto) and summarized per stage
+(count, total, p50, p95, max) for the Timing sheet.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Stages in pipeline order; the metrics stages are measured inside
+# MetricsCalculator (possibly in a worker process)
+STAGES = ['resolve', 'clone', 'traverse', 'count', 'similarity', 'grade', 'excel_write']
+METRICS_STAGES = ['traverse', 'count', 'similarity', 'grade']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Sample values
+        pct: Percentile (0-100)
+
+    Returns:
+        Smallest value with at least pct percent of the samples at or below it
+        (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def trace_path(workbook_path: str) -> Path:
+    """
+    Get the trace file belonging to a graded workbook.
+
+    Args:
+        workbook_path: Path to the graded Excel file
+
+    Returns:
+        Path of the trace, e.g. hw_graded.trace.json for hw_graded.xlsx
+    """
+    return Path(workbook_path).with_suffix('.trace.json')
+
+
+class Tracer:
+    """Thread-safe collector of timing spans."""
+
+    def __init__(self):
+        """Initialize tracer."""
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()  # Clone spans come from worker threads
+
+    @contextmanager
+    def span(self, stage: str, repo: Optional[str] = None):
+        """
+        Time a block of code as a span.
+
+        Args:
+            stage: Stage name (see STAGES)
+            repo: Repository URL the span belongs to (None for run-level spans)
+        """
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, start, time.perf_counter() - started, repo)
+
+    def add(
+        self,
+        stage: str,
+        start: float,
+        duration: float,
+        repo: Optional[str] = None,
+        pid: Optional[int] = None,
+        tid: Optional[int] = None
+    ):
+        """
+        Record a span.
+
+        Args:
+            stage: Stage name (see STAGES)
+            start: Start time (seconds since the epoch)
+            duration: Duration in seconds
+            repo: Repository URL the span belongs to
+            pid: Process the span ran in (default: this process)
+            tid: Thread the span ran in (default: the calling thread)
+        """
+        span = {
+            'stage': stage,
+            'repo': repo,
+            'start': start,
+            'duration': duration,
+            'pid': pid if pid is not None else os.getpid(),
+            'tid': tid if tid is not None else threading.get_ident()
+        }
+        with self._lock:
+            self.spans.append(span)
+
+    def add_metrics_timings(self, repo: str, timings: Dict):
+        """
+        Record the metrics stages measured by MetricsCalculator.
+
+        Traversal, counting and hashing are interleaved file by file, so each
+        stage's total is recorded as one span; in the trace the spans are laid
+        out back to back from the start of the calculation.
+
+        Args:
+            repo: Repository URL
+            timings: 'timings' entry of a metrics dict
+        """
+        start = timings['start']
+        for stage in METRICS_STAGES:
+            duration = timings.get(stage, 0.0)
+            self.add(stage, start, duration, repo, pid=timings['pid'], tid=timings['tid'])
+            start += duration
+
+    def stage_summary(self) -> List[Dict]:
+        """
+        Summarize spans per stage.
+
+        Returns:
+            List of dicts with keys: stage, count, total, p50, p95, max
+            (seconds), in STAGES order, for stages with spans
+        """
+        durations: Dict[str, List[float]] = {}
+        for span in self.spans:
+            durations.setdefault(span['stage'], []).append(span['duration'])
+
+        order = STAGES + sorted(set(durations) - set(STAGES))
+        return [
+            {
+                'stage': stage,
+                'count': len(durations[stage]),
+                'total': sum(durations[stage]),
+                'p50': percentile(durations[stage], 50),
+                'p95': percentile(durations[stage], 95),
+                'max': max(durations[stage])
+            }
+            for stage in order if stage in durations
+        ]
+
+    def repo_breakdown(self) -> List[Dict]:
+        """
+        Sum span durations per repository and stage.
+
+        Returns:
+            List of dicts with keys: repo and one key per stage (seconds),
+            in the order repositories were first seen
+        """
+        breakdown: Dict[str, Dict] = {}
+        for span in self.spans:
+            if span['repo'] is None:
+                continue
+            row = breakdown.setdefault(span['repo'], {'repo': span['repo']})
+            row[span['stage']] = row.get(span['stage'], 0.0) + span['duration']
+        return list(breakdown.values())
+
+    def write_chrome_trace(self, path: Path):
+        """
+        Export the spans in Chrome trace event format.
+
+        Args:
+            path: Output JSON file
+        """
+        events = [
+            {
+                'name': span['stage'],
+                'cat': 'repo' if span['repo'] else 'run',
+                'ph': 'X',
+                'ts': int(span['start'] * 1_000_000),
+                'dur': int(span['duration'] * 1_000_000),
+                'pid': span['pid'],
+                'tid': span['tid'],
+                'args': {'repo': span['repo']} if span['repo'] else {}
+            }
+            for span in self.spans
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+@contextmanager
+def stage_timer(timings: Dict, stage: str) -> Iterator[None]:
+    """
+    Add the duration of a block to timings[stage].
+
+    Args:
+        timings: Dictionary of stage name to seconds
+        stage: Stage name
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
@@ -0,0 +1,95 @@
+"""
+Benchmark writing and reading back email exports in each export format.
+
+Exports synthetic emails with ExcelExporter.create_excel to .xlsx, .csv,
+.jsonl, .parquet (if pyarrow is installed) and .sqlite, reads each file
+back with ExcelExporter.read_rows and reports the times and file sizes.
+
+Usage:
+    python tests/bench_export_formats.py [--rows 1000 10000 100000] [--repeat 1]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmailagent.excel_exporter import ExcelExporter
+from gmailagent.export_formats import EXCEL_EXTENSION, EXPORT_FORMATS
+
+
+def make_emails(count: int):
+    """Email dictionaries shaped like the ones the export pipeline writes"""
+    start = datetime(2025, 1, 1)
+    emails = []
+    for i in range(count):
+        owner = f"student{i % 977}"
+        emails.append({
+            'id': f"18c{i:013x}",
+            'thread_id': f"18c{i // 3:013x}",
+            'date': start + timedelta(minutes=i),
+            'subject': f"Homework {i % 20} submission - {owner}",
+            'urls': [f"https://github.com/{owner}/hw{i % 20}", "https://docs.python.org/3/"],
+            'repo': f"https://github.com/{owner}/hw{i % 20}",
+        })
+    return emails
+
+
+def available_extensions():
+    """Extensions whose libraries are installed"""
+    extensions = [EXCEL_EXTENSION]
+    for extension, export_format in EXPORT_FORMATS.items():
+        try:
+            export_format.check_available()
+        except ImportError:
+            print(f"Skipping {extension}: {export_format.name} support is not installed")
+            continue
+        extensions.append(extension)
+    return extensions
+
+
+def time_format(exporter: ExcelExporter, emails, path: Path, repeat: int):
+    """Best-of-repeat (write seconds, read seconds) for one export file"""
+    write_time = read_time = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        exporter.create_excel(emails, {}, str(path))
+        write_time = min(write_time, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, rows = exporter.read_rows(path)
+        read_time = min(read_time, time.perf_counter() - start)
+
+    assert len(rows) == len(emails)
+    return write_time, read_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    extensions = available_extensions()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = ExcelExporter(tmp)
+        for count in args.rows:
+            emails = make_emails(count)
+            print()
+            print(f"{count} rows")
+            print(f"{'format':<10} {'write':>9} {'read':>9} {'size':>9}")
+            print("-" * 40)
+            for extension in extensions:
+                path = Path(tmp) / f"emails{extension}"
+                write_time, read_time = time_format(exporter, emails, path, args.repeat)
+                size_mb = path.stat().st_size / 1024 / 1024
+                print(f"{extension:<10} {write_time:8.2f}s {read_time:8.2f}s {size_mb:7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark message listing and detail retrieval against the offline fake Gmail service.
+
+Usage:
+    python tests/bench_gmail_fetch.py [--messages 400] [--latency 0.02] [--list-messages 10000]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def run(mailbox, latency: float, **kwargs):
+    """Time a single retrieve_emails call, returning (seconds, round trips)"""
+    service = FakeGmailService(mailbox, latency=latency)
+    client = GmailClient(service, service_factory=lambda: service)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        emails = client.retrieve_emails(label='homework', max_results=len(mailbox), **kwargs)
+    elapsed = time.perf_counter() - start
+
+    assert len(emails) == len(mailbox)
+    return elapsed, service.round_trips
+
+
+def run_listing(mailbox, latency: float, shards: int):
+    """Time listing every message over date windows, returning (seconds to first ID, seconds, round trips)"""
+    service = FakeGmailService(mailbox, latency=latency)
+    client = GmailClient(service, service_factory=lambda: service)
+    dates = [int(message['internalDate']) // 1000 for message in mailbox]
+    query = f"label:homework after:{min(dates) - 1} before:{max(dates) + 1}"
+
+    start = time.perf_counter()
+    message_ids = client.iter_message_ids(query, len(mailbox), shards=shards)
+    first = next(message_ids)
+    first_elapsed = time.perf_counter() - start
+    listed = [first] + list(message_ids)
+    elapsed = time.perf_counter() - start
+
+    assert listed == service.message_order
+    return first_elapsed, elapsed, service.round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per round trip')
+    parser.add_argument('--list-messages', type=int, default=10000, help='Mailbox size for the listing benchmark')
+    args = parser.parse_args()
+
+    mailbox = make_mailbox(args.messages)
+    print(f"{args.messages} messages, {args.latency * 1000:.0f} ms per round trip")
+    print("-" * 50)
+
+    for label, kwargs in [
+        ('sequential', {'batch_size': 1}),
+        ('batch=50', {'batch_size': 50}),
+        ('batch=100', {'batch_size': 100}),
+        ('concurrency=8', {'concurrency': 8}),
+        ('concurrency=16', {'concurrency': 16}),
+    ]:
+        elapsed, round_trips = run(mailbox, args.latency, **kwargs)
+        print(f"{label:<14} {elapsed:8.2f}s  {round_trips:5d} round trips")
+
+    mailbox = make_mailbox(args.list_messages, body_size=0)
+    print()
+    print(f"Listing {args.list_messages} message IDs")
+    print("-" * 50)
+    for shards in [1, 4, 8, 16]:
+        first, elapsed, round_trips = run_listing(mailbox, args.latency, shards)
+        print(f"{'shards=' + str(shards):<14} {elapsed:8.2f}s  {round_trips:5d} round trips  "
+              f"(first ID after {first * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
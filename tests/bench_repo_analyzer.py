@@ -0,0 +1,179 @@
+"""
+Benchmark repo_analyzer end to end against synthetic local git repositories.
+
+Generates bare repositories on disk, serves them as file:// URLs (or plain
+paths) to RepositoryAnalyzer in benchmark mode and reports the wall time and
+the clone, metrics and Excel stage times. Results are written as JSON, so
+runs on different commits can be compared with --compare.
+
+Usage:
+    python tests/bench_repo_analyzer.py [--repos 20] [--files 30] [--workers 1 4]
+        [--encodings utf-8 latin-1 utf-16] [--vendored node_modules vendor]
+        [--output bench.json] [--compare baseline.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.timing import METRICS_STAGES
+from synthetic_repos import make_synthetic_repos
+
+# Columns of the printed table: stage group -> stages summed into it
+STAGE_GROUPS = {
+    'clone': ['resolve', 'clone'],
+    'metrics': METRICS_STAGES,
+    'excel': ['excel_write'],
+}
+
+
+def git_commit() -> str:
+    """Commit of the working tree being benchmarked ('+dirty' if modified)"""
+    repo_dir = Path(__file__).parent.parent
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_dir, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo_dir,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{sha}+dirty" if dirty else sha
+
+
+def write_input(path: Path, urls):
+    """Write an analyzer input workbook with one row per URL"""
+    wb = Workbook()
+    wb.active.append(['ID', 'Date', 'Subject', 'URL', 'Status'])
+    for i, url in enumerate(urls, start=1):
+        wb.active.append([i, '2024-01-01', f"Homework {i}", url, 'ready'])
+    wb.save(path)
+
+
+def run(input_path: Path, output_path: Path, workers: int):
+    """Analyze the input once, returning (wall seconds, stage summary, summary)"""
+    analyzer = RepositoryAnalyzer(workers=workers, use_cache=False, allow_local_repos=True)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = analyzer.analyze(str(input_path), str(output_path))
+    elapsed = time.perf_counter() - start
+
+    stages = {row.pop('stage'): row for row in analyzer.tracer.stage_summary()}
+    return elapsed, stages, summary
+
+
+def group_totals(stages):
+    """Sum stage totals per STAGE_GROUPS column"""
+    return {
+        group: sum(stages[stage]['total'] for stage in members if stage in stages)
+        for group, members in STAGE_GROUPS.items()
+    }
+
+
+def compare(report, baseline_path: Path):
+    """Print wall and stage time ratios against an earlier report"""
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    previous = {run['label']: run for run in baseline['runs']}
+
+    print()
+    print(f"Compared with {baseline['commit'][:12]} (ratio < 1 is faster)")
+    print("-" * 50)
+    for current in report['runs']:
+        before = previous.get(current['label'])
+        if before is None:
+            continue
+        ratios = [f"wall {current['wall'] / before['wall']:.2f}x"]
+        for group, total in group_totals(current['stages']).items():
+            old = group_totals(before['stages'])[group]
+            if old:
+                ratios.append(f"{group} {total / old:.2f}x")
+        print(f"{current['label']:<12} " + "  ".join(ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repos', type=int, default=20)
+    parser.add_argument('--files', type=int, default=30, help='Code files per repository')
+    parser.add_argument('--min-lines', type=int, default=10)
+    parser.add_argument('--max-lines', type=int, default=300)
+    parser.add_argument('--encodings', nargs='+', default=['utf-8', 'latin-1', 'utf-16'])
+    parser.add_argument('--vendored', nargs='*', default=['node_modules', 'vendor'],
+                        help='Vendored directories per repository (skipped by the analyzer)')
+    parser.add_argument('--vendored-files', type=int, default=20, help='Code files per vendored directory')
+    parser.add_argument('--transport', choices=['file', 'path'], default='file',
+                        help='Serve repositories as file:// URLs or as plain bare-repo paths')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help='JSON report (default: bench_repo_analyzer_<commit>.json)')
+    parser.add_argument('--compare', type=Path, help='Earlier JSON report to compare with')
+    args = parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {key: str(value) if isinstance(value, Path) else value
+                   for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'runs': []
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench_repo_analyzer_') as tmp:
+        tmp = Path(tmp)
+        start = time.perf_counter()
+        urls = make_synthetic_repos(
+            tmp, args.repos, files=args.files, lines=(args.min_lines, args.max_lines),
+            encodings=args.encodings, vendored_dirs=args.vendored,
+            vendored_files=args.vendored_files, transport=args.transport, seed=args.seed
+        )
+        report['generate_seconds'] = time.perf_counter() - start
+
+        input_path = tmp / 'bench_input.xlsx'
+        write_input(input_path, urls)
+
+        print(f"{args.repos} repositories x {args.files} code files, "
+              f"encodings {', '.join(args.encodings)}, served via {args.transport}")
+        print(f"{'run':<12} {'wall':>8} {'clone':>8} {'metrics':>8} {'excel':>8} {'repos/s':>8}")
+        print("-" * 60)
+
+        for workers in args.workers:
+            label = 'sequential' if workers == 1 else f"workers={workers}"
+            elapsed, stages, summary = run(input_path, tmp / f"bench_{workers}.xlsx", workers)
+            totals = group_totals(stages)
+            report['runs'].append({
+                'label': label,
+                'workers': workers,
+                'wall': elapsed,
+                'repos_per_second': args.repos / elapsed,
+                'successful': summary['successful'],
+                'stages': stages
+            })
+            print(f"{label:<12} {elapsed:7.2f}s {totals['clone']:7.2f}s {totals['metrics']:7.2f}s "
+                  f"{totals['excel']:7.2f}s {args.repos / elapsed:8.1f}")
+
+    print("(clone and metrics are summed over repositories, so they can exceed the wall time)")
+
+    output = args.output or Path(f"bench_repo_analyzer_{report['commit'][:12]}.json")
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Report: {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark URL extraction from HTML: streaming engine vs BeautifulSoup.
+
+Builds newsletter-style emails (nested tables, inline styles, scripts,
+tracking links and URLs in text), checks that both engines find the same
+URLs and reports the time per email.
+
+Usage:
+    python tests/bench_url_extraction.py [--emails 200] [--links 150] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmailagent.url_extractor import URLExtractor
+
+
+def make_newsletter(rng: random.Random, links: int) -> str:
+    """Render one newsletter-sized HTML email with the given number of links"""
+    parts = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Weekly digest</title>',
+        '<style>td { padding: 4px; background: url(https://cdn.example.com/bg.png); }</style>',
+        '<script>var tracker = "https://track.example.com/open?id=%d";</script></head><body>' % rng.randrange(10 ** 6),
+        '<table width="100%" cellpadding="0" cellspacing="0">',
+    ]
+    for i in range(links):
+        owner, repo = f"student{rng.randrange(500)}", f"hw{rng.randrange(20)}"
+        parts.append(
+            f'<tr><td class="item" style="font-family: Arial; color: #333">'
+            f'<a href="https://click.example.com/l?u={i}&amp;r={rng.randrange(10 ** 9)}">'
+            f'<img src="https://cdn.example.com/icon{i % 7}.png" alt="" width="16" height="16"></a> '
+            f'<b>Submission {i}</b> &mdash; repository: https://github.com/{owner}/{repo} '
+            f'(see <a href="https://github.com/{owner}/{repo}/tree/main">the code</a>).</td></tr>'
+        )
+        if i % 25 == 0:
+            parts.append('<!-- section break https://comment.example.com -->')
+    parts.append('</table><p>Unsubscribe: https://example.com/unsubscribe?u=1&amp;t=2</p></body></html>')
+    return ''.join(parts)
+
+
+def time_engine(engine: str, corpus, repeat: int):
+    """Best-of-repeat seconds to extract every email, and the extracted URLs"""
+    extractor = URLExtractor(engine=engine)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        urls = [extractor.extract_from_email('', html) for html in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--emails', type=int, default=200)
+    parser.add_argument('--links', type=int, default=150, help='Links per email')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_newsletter(rng, args.links) for _ in range(args.emails)]
+    size_kb = sum(len(html) for html in corpus) / len(corpus) / 1024
+    print(f"{args.emails} emails, {args.links} links each (~{size_kb:.0f} KB of HTML)")
+    print("-" * 50)
+
+    warnings.filterwarnings('ignore', module='bs4')
+    soup_time, soup_urls = time_engine('soup', corpus, args.repeat)
+    stream_time, stream_urls = time_engine('stream', corpus, args.repeat)
+
+    mismatches = sum(1 for a, b in zip(soup_urls, stream_urls) if a != b)
+    for label, elapsed in [('soup', soup_time), ('stream', stream_time)]:
+        print(f"{label:<8} {elapsed:8.2f}s  {elapsed / args.emails * 1000:7.2f} ms/email")
+    print(f"speedup  {soup_time / stream_time:8.1f}x")
+    print(f"parity   {len(corpus) - mismatches}/{len(corpus)} emails with identical URLs")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""
+Offline stand-in for the Gmail API service object.
+
+Implements just enough of the googleapiclient surface used by
+gmailagent.GmailClient (messages.list, messages.get, history.list,
+getProfile and batch requests)
+to exercise and benchmark the client without network access. Every
+execute() counts as one HTTP round trip and can simulate latency.
+"""
+
+import base64
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from typing import Dict, List, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+def make_message(
+    message_id: str,
+    subject: str = 'Homework',
+    sender: str = 'student@example.com',
+    date: Optional[datetime] = None,
+    plain: str = '',
+    html: str = '',
+) -> Dict:
+    """Build a raw Gmail API message resource (format='full')"""
+    date = date or datetime(2025, 12, 1, 12, 0, 0)
+
+    def encode(text: str) -> str:
+        return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii')
+
+    parts = []
+    if plain:
+        parts.append({'mimeType': 'text/plain', 'body': {'data': encode(plain)}})
+    if html:
+        parts.append({'mimeType': 'text/html', 'body': {'data': encode(html)}})
+
+    return {
+        'id': message_id,
+        'threadId': f"thread-{message_id}",
+        'snippet': plain[:50],
+        'internalDate': str(int(date.timestamp() * 1000)),
+        'payload': {
+            'mimeType': 'multipart/alternative',
+            'headers': [
+                {'name': 'Subject', 'value': subject},
+                {'name': 'From', 'value': sender},
+                {'name': 'To', 'value': 'teacher@example.com'},
+                {'name': 'Date', 'value': format_datetime(date)},
+            ],
+            'parts': parts,
+        },
+    }
+
+
+def make_mailbox(count: int, body_size: int = 200) -> List[Dict]:
+    """Build count messages, newest first, each linking to a GitHub repo"""
+    start = datetime(2025, 12, 1, 12, 0, 0)
+    filler = 'x' * body_size
+    messages = []
+    for idx in range(count):
+        url = f"https://github.com/student{idx}/homework"
+        messages.append(make_message(
+            f"msg{idx:05d}",
+            subject=f"Lesson {idx % 20} homework",
+            sender=f"student{idx}@example.com",
+            date=start - timedelta(minutes=idx),
+            plain=f"My submission: {url}\n{filler}",
+            html=f'<p>My submission: <a href="{url}">{url}</a></p><p>{filler}</p>',
+        ))
+    return messages
+
+
+def http_error(status: int, reason: str = '') -> HttpError:
+    """Build an HttpError as raised by googleapiclient"""
+    resp = httplib2.Response({'status': status})
+    resp.reason = reason or 'Error'
+    content = f'{{"error": {{"code": {status}, "message": "{resp.reason}"}}}}'.encode()
+    return HttpError(resp, content)
+
+
+class FakeRequest:
+    """A single deferred API call"""
+
+    def __init__(self, service: 'FakeGmailService', func):
+        self._service = service
+        self._func = func
+
+    def execute(self):
+        self._service._round_trip()
+        return self._func()
+
+
+class FakeBatch:
+    """Mimics googleapiclient.http.BatchHttpRequest"""
+
+    def __init__(self, service: 'FakeGmailService', callback=None):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request: FakeRequest, callback=None, request_id=None):
+        if len(self._requests) >= 1000:
+            raise ValueError('Too many requests in batch')
+        request_id = request_id if request_id is not None else str(len(self._requests))
+        self._requests.append((request_id, request, callback or self._callback))
+
+    def execute(self):
+        self._service._round_trip()
+        self._service.batch_sizes.append(len(self._requests))
+        for request_id, request, callback in self._requests:
+            try:
+                response, exception = request._func(), None
+            except HttpError as error:
+                response, exception = None, error
+            if callback:
+                callback(request_id, response, exception)
+
+
+class _Messages:
+    def __init__(self, service: 'FakeGmailService'):
+        self._service = service
+
+    def list(self, userId, q='', maxResults=100, pageToken=None, includeSpamTrash=False):
+        def run():
+            ids = self._service.matching_ids(q)
+            start = int(pageToken) if pageToken else 0
+            page = ids[start:start + maxResults]
+            result = {'messages': [{'id': mid, 'threadId': f"thread-{mid}"} for mid in page]}
+            if start + maxResults < len(ids):
+                result['nextPageToken'] = str(start + maxResults)
+            return result
+        return FakeRequest(self._service, run)
+
+    def get(self, userId, id, format='full', metadataHeaders=None):
+        def run():
+            service = self._service
+            with service._lock:
+                service.get_calls += 1
+                if service.rate_limited.get(id, 0) > 0:
+                    service.rate_limited[id] -= 1
+                    raise http_error(429, 'rateLimitExceeded')
+            if id in service.failing_ids or id not in service.messages:
+                raise http_error(404, 'Not Found')
+            with service._lock:
+                service.get_formats[format] = service.get_formats.get(format, 0) + 1
+            message = service.messages[id]
+            if format == 'metadata':
+                wanted = {name.lower() for name in metadataHeaders or []}
+                headers = [header for header in message['payload']['headers']
+                           if not wanted or header['name'].lower() in wanted]
+                metadata = {key: value for key, value in message.items() if key != 'payload'}
+                metadata['payload'] = {'mimeType': message['payload']['mimeType'], 'headers': headers}
+                return metadata
+            return message
+        return FakeRequest(self._service, run)
+
+
+class _History:
+    def __init__(self, service: 'FakeGmailService'):
+        self._service = service
+
+    def list(self, userId, startHistoryId, historyTypes=None, pageToken=None, maxResults=100):
+        def run():
+            service = self._service
+            start = int(startHistoryId)
+            if start < service.oldest_history_id:
+                raise http_error(404, 'Requested entity was not found.')
+            records = [record for record in service.history if int(record['id']) > start]
+            offset = int(pageToken) if pageToken else 0
+            result = {
+                'history': records[offset:offset + maxResults],
+                'historyId': str(service.history_id),
+            }
+            if offset + maxResults < len(records):
+                result['nextPageToken'] = str(offset + maxResults)
+            return result
+        return FakeRequest(self._service, run)
+
+
+class _Users:
+    def __init__(self, service: 'FakeGmailService'):
+        self._service = service
+
+    def messages(self):
+        return _Messages(self._service)
+
+    def history(self):
+        return _History(self._service)
+
+    def getProfile(self, userId):
+        return FakeRequest(self._service, lambda: {'historyId': str(self._service.history_id)})
+
+
+class FakeGmailService:
+    """In-memory Gmail service with round-trip accounting"""
+
+    def __init__(self, messages: List[Dict], latency: float = 0.0, failing_ids=(), rate_limited=None):
+        """
+        Args:
+            messages: Raw message resources, in messages.list order
+            latency: Seconds each HTTP round trip takes
+            failing_ids: Message IDs whose messages.get returns 404
+            rate_limited: Mapping of message ID to the number of 429
+                responses messages.get returns before succeeding
+        """
+        self.messages = {message['id']: message for message in messages}
+        self.message_order = [message['id'] for message in messages]
+        self.latency = latency
+        self.failing_ids = set(failing_ids)
+        self.rate_limited = dict(rate_limited or {})
+        self.round_trips = 0
+        self.get_calls = 0
+        self.get_formats: Dict[str, int] = {}
+        self.batch_sizes: List[int] = []
+        self.history_id = 1000
+        self.oldest_history_id = 1000
+        self.history: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add_message(self, message: Dict, matches_query: bool = True):
+        """
+        Deliver a new message (newest first) and record a history entry
+
+        Args:
+            message: Raw message resource
+            matches_query: Whether messages.list queries should return it
+                (history itself is never filtered)
+        """
+        self.history_id += 1
+        self.messages[message['id']] = message
+        if matches_query:
+            self.message_order.insert(0, message['id'])
+        self.history.append({
+            'id': str(self.history_id),
+            'messagesAdded': [{'message': {'id': message['id'], 'threadId': message['threadId']}}],
+        })
+
+    def matching_ids(self, query: str) -> List[str]:
+        """Message IDs returned by messages.list (honours after:<epoch> and before:<epoch> terms only)"""
+        ids = self.message_order
+        for term in query.split():
+            if term.startswith('after:') and term[6:].isdigit():
+                after = int(term[6:]) * 1000
+                ids = [mid for mid in ids if int(self.messages[mid]['internalDate']) > after]
+            elif term.startswith('before:') and term[7:].isdigit():
+                before = int(term[7:]) * 1000
+                ids = [mid for mid in ids if int(self.messages[mid]['internalDate']) < before]
+        return ids
+
+    def _round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def users(self):
+        return _Users(self)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
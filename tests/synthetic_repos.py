@@ -0,0 +1,136 @@
+"""
+Synthetic homework repositories for offline analyzer benchmarks.
+
+Builds bare git repositories on the local disk with a configurable number of
+code files, file sizes, text encodings and vendored directories (which the
+analyzer must skip), so repo_analyzer can be run end to end without GitHub.
+"""
+
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from git import Repo
+
+# Extension and line template per language; {name} and {value} vary per line
+LANGUAGES = [
+    ('.py', "{name} = compute({value}, 'café')"),
+    ('.js', "const {name} = compute({value}, 'naïve');"),
+    ('.java', "int {name} = compute({value}); // über"),
+    ('.cpp', "auto {name} = compute({value}); // déjà vu"),
+]
+
+# Files that are not code; the sparse checkout leaves them out
+DATA_FILES = {
+    'README.md': b'# Homework\n\nSynthetic submission.\n',
+    'data/input.csv': b'a,b,c\n1,2,3\n' * 200,
+}
+
+
+def make_code_file(rng: random.Random, template: str, lines: int, encoding: str) -> bytes:
+    """Render a code file with the given number of non-empty lines"""
+    body = []
+    for i in range(lines):
+        body.append(template.format(name=f"var_{rng.randrange(1000)}_{i}", value=rng.randrange(10 ** 6)))
+        if rng.random() < 0.1:
+            body.append('')
+    return ('\n'.join(body) + '\n').encode(encoding)
+
+
+def make_repo_files(
+    rng: random.Random,
+    files: int,
+    lines: Tuple[int, int],
+    encodings: Sequence[str],
+    vendored_dirs: Sequence[str],
+    vendored_files: int
+) -> Dict[str, bytes]:
+    """
+    Generate the files of one repository.
+
+    Args:
+        rng: Random generator (seeded, so runs are reproducible)
+        files: Number of code files outside vendored directories
+        lines: (min, max) non-empty lines per code file
+        encodings: Text encodings the code files are spread over
+        vendored_dirs: Directories (e.g. node_modules) to fill with extra code files
+        vendored_files: Number of code files per vendored directory
+
+    Returns:
+        Dict of relative path -> file contents
+    """
+    contents = dict(DATA_FILES)
+    for i in range(files):
+        ext, template = LANGUAGES[i % len(LANGUAGES)]
+        encoding = encodings[i % len(encodings)]
+        contents[f"src/pkg_{i % 5}/module_{i}{ext}"] = make_code_file(rng, template, rng.randint(*lines), encoding)
+
+    for vendored in vendored_dirs:
+        for i in range(vendored_files):
+            ext, template = LANGUAGES[i % len(LANGUAGES)]
+            contents[f"{vendored}/lib_{i}/index{ext}"] = make_code_file(rng, template, rng.randint(*lines), 'utf-8')
+
+    return contents
+
+
+def make_synthetic_repos(
+    root: Path,
+    count: int,
+    files: int = 20,
+    lines: Tuple[int, int] = (10, 300),
+    encodings: Sequence[str] = ('utf-8',),
+    vendored_dirs: Sequence[str] = ('node_modules',),
+    vendored_files: int = 10,
+    transport: str = 'file',
+    seed: int = 0
+) -> List[str]:
+    """
+    Create bare repositories under root/remotes.
+
+    Args:
+        root: Working directory of the benchmark
+        count: Number of repositories
+        files: Number of code files per repository (outside vendored directories)
+        lines: (min, max) non-empty lines per code file
+        encodings: Text encodings the code files are spread over
+        vendored_dirs: Vendored directories per repository
+        vendored_files: Code files per vendored directory
+        transport: 'file' for file:// URLs, 'path' for plain directory paths
+        seed: Random seed
+
+    Returns:
+        Repository URLs (or paths), one per repository
+    """
+    rng = random.Random(seed)
+    remotes = Path(root) / 'remotes'
+    work = Path(root) / 'work'
+    urls = []
+
+    for n in range(count):
+        work_path = work / f"student_{n:04d}"
+        repo = Repo.init(work_path)
+        with repo.config_writer() as config:
+            config.set_value('user', 'name', 'Student')
+            config.set_value('user', 'email', 'student@example.com')
+
+        contents = make_repo_files(rng, files, lines, encodings, vendored_dirs, vendored_files)
+        for name, data in contents.items():
+            path = work_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        repo.index.add(list(contents))
+        repo.index.commit('homework')
+
+        bare_path = remotes / f"student_{n:04d}.git"
+        bare = repo.clone(str(bare_path), bare=True)
+        with bare.config_writer() as config:
+            # Lets the analyzer's partial clone filter blobs as GitHub does
+            config.set_value('uploadpack', 'allowFilter', 'true')
+        repo.close()
+        bare.close()
+
+        urls.append(bare_path.resolve().as_uri() if transport == 'file' else str(bare_path.resolve()))
+
+    shutil.rmtree(work, ignore_errors=True)
+    return urls
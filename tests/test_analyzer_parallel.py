@@ -0,0 +1,96 @@
+"""
+Tests for parallel repository processing in repo_analyzer.RepositoryAnalyzer.
+"""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.config import STATUS_SUCCESS, STATUS_INVALID_URL, STATUS_NOT_FOUND
+
+
+def fake_clone(self, url):
+    """Stand-in for RepositoryManager.clone that builds a local repo"""
+    time.sleep(random.uniform(0, 0.05))
+
+    if 'missing' in url:
+        return None, False, 'Repository not found (404)'
+    if not self._is_valid_github_url(url):
+        return None, False, 'Invalid GitHub URL format'
+
+    with self._count_lock:
+        self.clone_count += 1
+        local_path = self.temp_dir / f"repo_{self.clone_count}"
+    local_path.mkdir()
+
+    # Repo N has N short files and one long file
+    index = int(url.rsplit('repo', 1)[1])
+    for i in range(index):
+        (local_path / f"short_{i}.py").write_text("x = 1\n" * 10)
+    (local_path / "long.py").write_text("x = 1\n" * 200)
+    return str(local_path), True, ''
+
+
+def test_parallel_results_keep_input_order(monkeypatch):
+    """Parallel mode returns the sequential results in input-row order"""
+    monkeypatch.setattr(RepositoryManager, 'clone', fake_clone)
+    data = [{'url': f"https://github.com/student/repo{i}"} for i in range(1, 9)]
+    data.insert(3, {'url': 'https://github.com/student/missing'})
+    data.insert(6, {'url': 'not a url'})
+
+    # Runs one after the other: both managers use a per-second temp dir
+    analyzer = RepositoryAnalyzer(workers=4, use_cache=False)
+    try:
+        parallel = analyzer._process_repositories_parallel(data)
+    finally:
+        analyzer.repo_manager.cleanup()
+    try:
+        sequential = analyzer._process_repositories_sequential(data)
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert parallel == sequential
+    assert [result['url'] for result in parallel] == [row['url'] for row in data]
+    assert parallel[3]['status'] == STATUS_NOT_FOUND
+    assert parallel[6]['status'] == STATUS_INVALID_URL
+    assert parallel[0]['status'] == STATUS_SUCCESS
+    assert parallel[0]['grade'] == 50.0
+
+
+def test_metrics_finish_before_slow_clone(monkeypatch):
+    """Rows are finished as their metrics complete, not after the last clone"""
+    others_finished = threading.Event()
+
+    def slow_tail_clone(self, url):
+        if url.endswith('repo9') and not others_finished.wait(10):
+            return None, False, 'Other rows were not finished while cloning'
+        return fake_clone(self, url)
+
+    monkeypatch.setattr(RepositoryManager, 'clone', slow_tail_clone)
+    data = [{'url': f"https://github.com/student/repo{i}"} for i in (1, 2, 9)]
+    finished = []
+
+    def on_result(idx, result):
+        finished.append(idx)
+        if len(finished) == 2:
+            others_finished.set()
+
+    analyzer = RepositoryAnalyzer(workers=2, use_cache=False)
+    try:
+        results = analyzer._process_repositories_parallel(data, on_result=on_result)
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert finished[-1] == 2
+    assert [result['status'] for result in results] == [STATUS_SUCCESS] * 3
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
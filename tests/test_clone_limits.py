@@ -0,0 +1,177 @@
+"""
+Tests for clone deadlines, size caps and partial clones in repo_analyzer.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from git import Repo
+
+from repo_analyzer import repo_manager
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.config import STATUS_TIMEOUT, STATUS_TOO_LARGE
+from repo_analyzer.errors import RepositoryTimeoutError, RepositoryTooLargeError
+from repo_analyzer.git_runner import run_git
+from repo_analyzer.metrics_calculator import MetricsCalculator
+from repo_analyzer.mirror_cache import MirrorCache, HEAD_REF
+from repo_analyzer.repo_manager import RepositoryManager
+
+posix_only = pytest.mark.skipif(sys.platform == 'win32', reason='uses shell aliases')
+
+
+def make_remote(path: Path) -> Repo:
+    """Repository with small code files, a large code file and a dataset"""
+    repo = Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Test')
+        config.set_value('user', 'email', 'test@example.com')
+        config.set_value('uploadpack', 'allowFilter', 'true')
+
+    files = {
+        'main.py': b'print(1)\n',
+        'src/App.JAVA': b'class App {}\n',
+        'src/generated.js': b'var a = 1;\n' * 2000,
+        'data/train.csv': b'1,2,3\n' * 5000,
+    }
+    for name, content in files.items():
+        file_path = path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
+    repo.index.add(list(files))
+    repo.index.commit('homework')
+    return repo
+
+
+def missing_objects(git_dir: Path, rev: str):
+    """Object IDs of the commit that the partial clone left out"""
+    output = run_git(['rev-list', '--objects', '--missing=print', rev], cwd=git_dir)
+    return {line[1:] for line in output.splitlines() if line.startswith('?')}
+
+
+@posix_only
+def without_timings(metrics: dict) -> dict:
+    """Metrics without the stage timings, which differ between runs"""
+    return {key: value for key, value in metrics.items() if key != 'timings'}
+
+
+def test_deadline_kills_git():
+    """A git command past its deadline is killed, including its children"""
+    start = time.monotonic()
+    with pytest.raises(RepositoryTimeoutError):
+        run_git(['-c', 'alias.slow=!sleep 30', 'slow'], timeout=0.5)
+    assert time.monotonic() - start < 5
+
+
+@posix_only
+def test_size_cap_stops_git(tmp_path):
+    """A git command is stopped once its target directory exceeds the cap"""
+    with pytest.raises(RepositoryTooLargeError):
+        run_git(
+            ['-c', 'alias.grow=!head -c 2000000 /dev/zero > blob && sleep 30', 'grow'],
+            cwd=tmp_path, timeout=20, max_bytes=1024 * 1024, watch_dir=tmp_path
+        )
+
+
+def test_clone_skips_large_non_code_blobs(tmp_path, monkeypatch):
+    """Clones check out code files only and never download the dataset"""
+    monkeypatch.setattr(repo_manager, 'PARTIAL_CLONE_FILTER', 'blob:limit=1k')
+    remote = make_remote(tmp_path / 'remote')
+    local_path = tmp_path / 'clone'
+
+    RepositoryManager(temp_dir=str(tmp_path / 'tmp'))._clone_code_files(
+        (tmp_path / 'remote').as_uri(), local_path
+    )
+
+    assert (local_path / 'src' / 'generated.js').exists()
+    assert (local_path / 'src' / 'App.JAVA').exists()
+    assert not (local_path / 'data').exists()
+
+    dataset = remote.head.commit.tree['data/train.csv'].hexsha
+    assert dataset in missing_objects(local_path, 'HEAD')
+    assert without_timings(MetricsCalculator().calculate(str(local_path))) == \
+        without_timings(MetricsCalculator().calculate(str(tmp_path / 'remote')))
+
+
+def test_mirror_is_partial(tmp_path, monkeypatch):
+    """Mirrors leave large blobs out; reading the mirror never fetches them"""
+    import repo_analyzer.git_runner as git_runner
+    import repo_analyzer.mirror_cache as mirror_cache
+    monkeypatch.setattr(mirror_cache, 'PARTIAL_CLONE_FILTER', 'blob:limit=1k')
+    monkeypatch.setattr(git_runner, 'PARTIAL_CLONE_FILTER', 'blob:limit=1k')
+    remote = make_remote(tmp_path / 'remote')
+    cache = MirrorCache(cache_dir=str(tmp_path / 'mirrors'))
+
+    mirror = cache.fetch((tmp_path / 'remote').as_uri())
+    tree = remote.head.commit.tree
+    large = {tree['data/train.csv'].hexsha, tree['src/generated.js'].hexsha}
+    assert large <= missing_objects(mirror, HEAD_REF)
+
+    # The large code file is skipped instead of fetched lazily
+    (tmp_path / 'remote' / 'src' / 'generated.js').unlink()
+    expected = MetricsCalculator().calculate(str(tmp_path / 'remote'))
+    metrics = MetricsCalculator().calculate_tree(str(mirror), HEAD_REF)
+    assert without_timings(metrics) == without_timings(expected)
+    assert large <= missing_objects(mirror, HEAD_REF)
+
+    cache.extract(mirror, tmp_path / 'extracted')
+    assert (tmp_path / 'extracted' / 'main.py').exists()
+    assert not (tmp_path / 'extracted' / 'src' / 'generated.js').exists()
+    assert not (tmp_path / 'extracted' / 'data').exists()
+    assert large <= missing_objects(mirror, HEAD_REF)
+
+
+def test_size_precheck_needs_token(tmp_path, monkeypatch):
+    """The GitHub API is only asked with a token; API errors mean unknown size"""
+    import io
+    import urllib.error
+    requests = []
+    answers = []
+
+    def urlopen(request, timeout=None):
+        requests.append(request)
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return io.BytesIO(json.dumps(answer).encode())
+
+    monkeypatch.setattr(repo_manager.urllib.request, 'urlopen', urlopen)
+    manager = RepositoryManager(temp_dir=str(tmp_path))
+    url = 'https://github.com/student/hw'
+
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    assert manager._check_repo_size(url) is None
+    assert requests == []
+
+    monkeypatch.setenv('GITHUB_TOKEN', 'secret')
+    answers.append({'size': (repo_manager.MAX_REPO_SIZE_MB + 1) * 1024})
+    assert 'too large' in manager._check_repo_size(url)
+    assert requests[0].get_header('Authorization') == 'token secret'
+
+    answers.append(urllib.error.HTTPError(url, 403, 'rate limit exceeded', {}, None))
+    assert manager._check_repo_size(url) is None
+
+
+def test_limits_are_distinct_statuses(tmp_path, monkeypatch):
+    """Timeouts and oversized repositories get their own status"""
+    manager = RepositoryManager(temp_dir=str(tmp_path))
+    analyzer = RepositoryAnalyzer(use_cache=False)
+
+    for error, status in ((RepositoryTimeoutError('expired'), STATUS_TIMEOUT),
+                          (RepositoryTooLargeError('too big'), STATUS_TOO_LARGE)):
+        def fail(url, local_path, error=error):
+            raise error
+
+        monkeypatch.setattr(manager, '_clone_code_files', fail)
+        success, message = manager._clone_once('https://github.com/student/hw', tmp_path / 'hw')
+
+        assert not success
+        assert analyzer._determine_status_from_error(message) == status
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,73 @@
+"""
+Tests for analyzing duplicate repository submissions once (repo_analyzer.analyzer).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.config import STATUS_SUCCESS, STATUS_INVALID_URL
+
+
+def make_clone(calls):
+    """Stand-in for RepositoryManager.clone that records the cloned URLs"""
+
+    def fake_clone(self, url):
+        calls.append(url)
+        if not self._is_valid_github_url(url):
+            return None, False, 'Invalid GitHub URL format'
+
+        local_path = self.temp_dir / f"repo_{len(calls)}"
+        local_path.mkdir()
+        (local_path / 'main.py').write_text("x = 1\n")
+        return str(local_path), True, ''
+
+    return fake_clone
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_url_variants_are_analyzed_once(monkeypatch, workers):
+    """Spellings of one repository share a clone; every row gets the result under its own URL"""
+    calls = []
+    monkeypatch.setattr(RepositoryManager, 'clone', make_clone(calls))
+    urls = [
+        'https://github.com/student/homework',
+        'https://github.com/student/other',
+        'https://github.com/student/homework.git',
+        'https://github.com/Student/homework/',
+        'https://github.com/student/homework/tree/main',
+        'not a url',
+        'not a url',
+    ]
+
+    analyzer = RepositoryAnalyzer(workers=workers, use_cache=False)
+    recorded = []
+    try:
+        results = analyzer._process_unique_repositories(
+            [{'url': url} for url in urls],
+            on_result=lambda idx, result: recorded.append(idx)
+        )
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert sorted(calls) == ['https://github.com/student/homework', 'https://github.com/student/other', 'not a url']
+    assert [result['url'] for result in results] == urls
+    assert [result['status'] for result in results] == [STATUS_SUCCESS] * 5 + [STATUS_INVALID_URL] * 2
+    assert sorted(recorded) == list(range(len(urls)))
+
+
+def test_extract_repo_name_keeps_trailing_letters(tmp_path):
+    """Only a literal .git suffix is removed from the repository name"""
+    manager = RepositoryManager(temp_dir=str(tmp_path))
+    assert manager._extract_repo_name('https://github.com/student/digit') == 'digit'
+    assert manager._extract_repo_name('https://github.com/student/tig.git') == 'tig'
+    assert manager._extract_repo_name('https://github.com/student/homework/') == 'homework'
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,109 @@
+"""
+Tests for exporting emails as CSV, JSON Lines, Parquet and SQLite.
+"""
+
+import importlib.util
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmailagent.cli import cli
+from gmailagent.excel_exporter import ExcelExporter
+from gmailagent.export_formats import ExportFormat, get_export_format
+
+FORMATS = [
+    '.csv',
+    '.jsonl',
+    pytest.param('.parquet', marks=pytest.mark.skipif(
+        importlib.util.find_spec('pyarrow') is None, reason='pyarrow is not installed')),
+    '.sqlite',
+]
+
+
+def _emails(count, offset=0):
+    return [
+        {
+            'id': f"msg{i:03d}",
+            'thread_id': f"thread{i % 3}",
+            'date': datetime(2025, 1, 1 + i % 28, 10, i % 60),
+            'subject': f"HW {i}, \"quoted\"\nsecond line — ünïcode",
+            'urls': [f"https://github.com/s{i}/hw"] if i % 2 else [],
+            'repo': f"https://github.com/s{i}/hw" if i % 2 else None,
+        }
+        for i in range(offset, offset + count)
+    ]
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def test_formats_read_back_like_excel(tmp_path, extension):
+    """Every format reads back the rows of the Excel export"""
+    exporter = ExcelExporter(str(tmp_path))
+    emails = _emails(30)
+    excel = exporter.create_excel(emails, {}, str(tmp_path / 'emails.xlsx'))
+    output = exporter.create_excel(emails, {}, str(tmp_path / f'emails{extension}'))
+
+    headers, rows = exporter.read_rows(Path(output))
+    assert headers == ExcelExporter.HEADERS
+    assert rows == exporter.read_rows(Path(excel))[1]
+
+    # Streamed rows keep the input order instead of newest first
+    streamed, count = exporter.create_excel_streaming(iter(emails), {}, str(tmp_path / f'stream{extension}'))
+    assert count == 30
+    assert sorted(exporter.read_rows(Path(streamed))[1], key=lambda row: row[6]) == \
+        sorted(rows, key=lambda row: row[6])
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def test_merge_and_render(tmp_path, extension):
+    """Exports merge in their own format and render to the styled Excel file"""
+    exporter = ExcelExporter(str(tmp_path))
+    output = exporter.create_excel(_emails(5), {}, str(tmp_path / f'emails{extension}'))
+    exporter.merge_into_excel(_emails(3, offset=4), output)
+
+    _, rows = exporter.read_rows(Path(output))
+    assert sorted(row[6] for row in rows) == [f"msg{i:03d}" for i in range(7)]
+
+    excel = exporter.create_excel_from_export(output)
+    assert excel == str(tmp_path / 'emails.xlsx')
+    assert exporter.read_rows(Path(excel))[1] == rows
+
+
+def test_unknown_format(tmp_path):
+    """Unsupported extensions are rejected before anything is fetched"""
+    assert get_export_format('emails.XLSX') is None
+    with pytest.raises(ValueError):
+        get_export_format('emails.txt')
+
+    result = CliRunner().invoke(cli, ['export', '--label', 'hw', '--output', str(tmp_path / 'emails.txt')])
+    assert result.exit_code == 2
+    assert 'Unsupported export format' in result.output
+
+
+def test_formats_must_implement_write_and_read():
+    """A format missing write or read cannot be instantiated"""
+    class WriteOnly(ExportFormat):
+        extension = '.txt'
+
+        def write(self, headers, rows, path):
+            return 0
+
+    with pytest.raises(TypeError):
+        WriteOnly()
+
+
+def test_render_command(tmp_path):
+    """The render command turns an export into an Excel file"""
+    output = ExcelExporter(str(tmp_path)).create_excel(_emails(4), {}, str(tmp_path / 'emails.jsonl'))
+
+    result = CliRunner().invoke(cli, ['render', output, '--output', str(tmp_path / 'styled.xlsx')])
+    assert result.exit_code == 0, result.output
+    assert len(ExcelExporter().read_rows(tmp_path / 'styled.xlsx')[1]) == 4
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,73 @@
+"""
+Tests for batched message-detail retrieval in gmailagent.GmailClient.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def test_batched_fetch_preserves_order():
+    """Batched retrieval returns emails in messages.list order"""
+    service = FakeGmailService(make_mailbox(120))
+    client = GmailClient(service)
+
+    emails = client.retrieve_emails(label='homework', batch_size=50)
+
+    assert [email['id'] for email in emails] == service.message_order
+    assert service.batch_sizes == [50, 50, 20]
+    # 1 list call + 3 batch calls instead of 120 individual gets
+    assert service.round_trips == 4
+
+
+def test_batched_fetch_matches_sequential():
+    """Batched and one-by-one retrieval produce identical results"""
+    mailbox = make_mailbox(30)
+    batched = GmailClient(FakeGmailService(mailbox)).retrieve_emails(label='hw', batch_size=7)
+    sequential = GmailClient(FakeGmailService(mailbox)).retrieve_emails(label='hw', batch_size=1)
+
+    assert batched == sequential
+
+
+def test_batched_fetch_reports_errors(capsys):
+    """Failed messages are reported and skipped, progress still counts them"""
+    service = FakeGmailService(make_mailbox(10), failing_ids={'msg00003', 'msg00007'})
+    client = GmailClient(service)
+    progress = []
+
+    emails = client.retrieve_emails(
+        label='homework',
+        batch_size=4,
+        progress_callback=lambda done, total: progress.append((done, total))
+    )
+
+    output = capsys.readouterr().out
+    assert 'Error retrieving message msg00003' in output
+    assert 'Error retrieving message msg00007' in output
+    assert len(emails) == 8
+    assert progress == [(idx, 10) for idx in range(1, 11)]
+
+
+def test_rate_limited_batch_items_are_retried(capsys):
+    """429s inside a batch are retried with backoff instead of dropped"""
+    backoffs = []
+    service = FakeGmailService(make_mailbox(10), rate_limited={'msg00002': 1, 'msg00006': 2})
+    client = GmailClient(service, sleep=backoffs.append)
+
+    emails = client.retrieve_emails(label='homework', batch_size=5)
+
+    assert [email['id'] for email in emails] == service.message_order
+    assert 'Error retrieving message' not in capsys.readouterr().out
+    # msg00006 is rate limited again on its first individual retry
+    assert len(backoffs) == 1
+    assert client.throttle.rate < client.throttle.max_rate
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,66 @@
+"""
+Tests for the on-disk Gmail message cache.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from gmailagent.message_cache import MessageCache
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def test_repeated_export_is_served_from_cache(tmp_path):
+    """A second export costs one messages.list call and no message fetches"""
+    mailbox = make_mailbox(40)
+    cache = MessageCache(str(tmp_path))
+
+    first = GmailClient(FakeGmailService(mailbox), cache=cache).retrieve_emails(label='homework')
+
+    service = FakeGmailService(mailbox)
+    progress = []
+    second = GmailClient(service, cache=cache).retrieve_emails(
+        label='homework',
+        progress_callback=lambda done, total: progress.append(done)
+    )
+
+    assert second == first
+    assert service.round_trips == 1
+    assert service.get_calls == 0
+    assert progress[-1] == 40
+
+
+def test_partial_overlap_fetches_only_missing(tmp_path):
+    mailbox = make_mailbox(30)
+    cache = MessageCache(str(tmp_path))
+    GmailClient(FakeGmailService(mailbox[:20]), cache=cache).retrieve_emails(label='homework')
+
+    service = FakeGmailService(mailbox)
+    emails = GmailClient(service, cache=cache).retrieve_emails(label='homework')
+
+    assert [email['id'] for email in emails] == service.message_order
+    assert service.get_calls == 10
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    emails = GmailClient(FakeGmailService(make_mailbox(10, body_size=2000))).fetch_emails(
+        [f"msg{idx:05d}" for idx in range(10)]
+    )
+    cache = MessageCache(str(tmp_path), max_size_mb=0.03)
+
+    cache.put_many(emails[:5])
+    cache.get_many(['msg00000'])
+    cache.put_many(emails[5:])
+
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.get('msg00000') is not None
+    assert cache.get('msg00001') is None
+    assert cache.get('msg00009') is not None
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
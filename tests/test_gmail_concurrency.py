@@ -0,0 +1,131 @@
+"""
+Tests for concurrent message fetching and quota throttling in gmailagent.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from gmailagent.throttle import TokenBucket, is_rate_limit_error
+from fake_gmail_service import FakeGmailService, make_mailbox, http_error
+
+
+class FakeClock:
+    """Manual clock whose sleep() just advances time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_concurrent_fetch_preserves_order():
+    """Thread-pool retrieval returns emails in messages.list order"""
+    service = FakeGmailService(make_mailbox(60), failing_ids={'msg00010'})
+    client = GmailClient(service, service_factory=lambda: service)
+    progress = []
+
+    emails = client.retrieve_emails(
+        label='homework',
+        concurrency=8,
+        progress_callback=lambda done, total: progress.append(done)
+    )
+
+    expected = [mid for mid in service.message_order if mid != 'msg00010']
+    assert [email['id'] for email in emails] == expected
+    assert progress == list(range(1, 61))
+
+
+def test_worker_services_come_from_factory():
+    """Each worker thread builds its own service object"""
+    mailbox = make_mailbox(20)
+    built = []
+
+    def factory():
+        service = FakeGmailService(mailbox)
+        built.append(service)
+        return service
+
+    client = GmailClient(FakeGmailService(mailbox), service_factory=factory)
+    emails = client.retrieve_emails(label='homework', concurrency=4)
+
+    assert len(emails) == 20
+    assert 1 <= len(built) <= 4
+    assert sum(service.get_calls for service in built) == 20
+
+
+def test_concurrency_requires_service_factory():
+    """Worker threads never share the caller's HTTP transport"""
+    client = GmailClient(FakeGmailService(make_mailbox(5)))
+
+    with pytest.raises(ValueError):
+        client.retrieve_emails(label='homework', concurrency=2)
+
+
+def test_rate_limited_messages_are_retried():
+    """429 responses slow the bucket down and the message is retried"""
+    backoffs = []
+    service = FakeGmailService(make_mailbox(5), rate_limited={'msg00002': 2})
+    client = GmailClient(service, service_factory=lambda: service, sleep=backoffs.append)
+
+    emails = client.retrieve_emails(label='homework', concurrency=2)
+
+    assert [email['id'] for email in emails] == service.message_order
+    assert service.get_calls == 7
+    assert len(backoffs) == 2
+    assert client.throttle.rate < client.throttle.max_rate
+
+
+def test_token_bucket_paces_requests():
+    """Acquiring beyond the burst capacity waits for the refill rate"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=250, clock=clock, sleep=clock.sleep)
+
+    for _ in range(100):
+        bucket.acquire(5)
+
+    # 250 units of burst, the remaining 250 units refill at 250 units/s
+    assert abs(clock.now - 1.0) < 1e-6
+
+
+def test_token_bucket_adapts_rate():
+    """Rate halves on rate-limit responses and recovers additively"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100, min_rate=10, clock=clock, sleep=clock.sleep)
+
+    # A burst of 429s from concurrent workers counts as one decrease
+    for _ in range(8):
+        bucket.slow_down()
+    assert bucket.rate == 50
+
+    clock.sleep(1.0)
+    bucket.slow_down()
+    assert bucket.rate == 25
+    for _ in range(5):
+        clock.sleep(1.0)
+        bucket.slow_down()
+    assert bucket.rate == 10
+
+    for _ in range(1000):
+        bucket.speed_up()
+    assert bucket.rate == 100
+
+
+def test_rate_limit_error_detection():
+    assert is_rate_limit_error(http_error(429))
+    assert is_rate_limit_error(http_error(403, 'userRateLimitExceeded'))
+    assert not is_rate_limit_error(http_error(403, 'Forbidden'))
+    assert not is_rate_limit_error(http_error(404, 'Not Found'))
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
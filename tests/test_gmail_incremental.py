@@ -0,0 +1,143 @@
+"""
+Tests for incremental (historyId based) Gmail export.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from click.testing import CliRunner
+from openpyxl import load_workbook
+
+from gmailagent import cli as cli_module, sync_state
+from gmailagent.excel_exporter import ExcelExporter
+from gmailagent.gmail_client import GmailClient
+from gmailagent.sync_state import SyncStateStore
+from gmailagent.url_extractor import extract_urls_from_emails
+from fake_gmail_service import FakeGmailService, make_mailbox, make_message
+
+
+def test_history_changes_return_only_new_messages():
+    """Only messages added after the recorded history ID are fetched"""
+    service = FakeGmailService(make_mailbox(50))
+    client = GmailClient(service)
+    history_id = client.get_history_id()
+    known_ids = set(service.message_order)
+
+    service.add_message(make_message('new1', date=datetime(2025, 12, 2, 9, 0)))
+    service.add_message(make_message('new2', date=datetime(2025, 12, 2, 10, 0)))
+    service.add_message(make_message('other', date=datetime(2025, 12, 2, 11, 0)), matches_query=False)
+    service.get_calls = 0
+
+    emails, latest = client.retrieve_new_emails('label:homework', history_id, known_ids)
+
+    assert sorted(email['id'] for email in emails) == ['new1', 'new2']
+    assert latest == str(service.history_id)
+    # Headers of the three candidates, full content only of the two matches
+    assert service.get_formats == {'metadata': 3, 'full': 2}
+
+
+def test_query_check_is_not_limited_by_max_results():
+    """Backdated new mail is found even if many known messages are newer"""
+    service = FakeGmailService(make_mailbox(50))
+    client = GmailClient(service)
+    history_id = client.get_history_id()
+    known_ids = set(service.message_order)
+
+    service.add_message(make_message('late', date=datetime(2025, 11, 1, 9, 0)))
+    # messages.list is newest first, so it lists the backdated message last
+    service.message_order.remove('late')
+    service.message_order.append('late')
+
+    emails, _ = client.retrieve_new_emails('label:homework', history_id, known_ids, max_results=10)
+
+    assert [email['id'] for email in emails] == ['late']
+
+
+def test_no_changes_costs_no_message_fetches():
+    service = FakeGmailService(make_mailbox(10))
+    client = GmailClient(service)
+    history_id = client.get_history_id()
+
+    emails, latest = client.retrieve_new_emails('label:homework', history_id, set(service.message_order))
+
+    assert emails == []
+    assert latest == history_id
+    assert service.get_calls == 0
+
+
+def test_expired_history_requests_full_export():
+    service = FakeGmailService(make_mailbox(5))
+    service.oldest_history_id = 2000
+    client = GmailClient(service)
+
+    emails, latest = client.retrieve_new_emails('label:homework', '1000', set())
+
+    assert emails is None and latest is None
+
+
+def test_merge_into_existing_export(tmp_path):
+    """New rows are merged into the previous export, newest first"""
+    exporter = ExcelExporter(str(tmp_path))
+    old = GmailClient(FakeGmailService(make_mailbox(3))).fetch_emails(['msg00000', 'msg00001', 'msg00002'])
+    output = exporter.create_excel(extract_urls_from_emails(old), {'label': 'homework'})
+
+    new = extract_urls_from_emails([GmailClient(FakeGmailService(
+        [make_message('new1', date=datetime(2025, 12, 2, 9, 0), plain='https://github.com/a/b')]
+    )).get_message_details('new1')])
+    exporter.merge_into_excel(new, output)
+
+    ws = load_workbook(output).active
+    rows = list(ws.iter_rows(min_row=2, values_only=True))
+    assert len(rows) == 4
+    assert rows[0][1] == '2025-12-02 09:00:00'
+    assert rows[0][3] == 'https://github.com/a/b'
+    assert [row[1] for row in rows] == sorted((row[1] for row in rows), reverse=True)
+
+
+def test_incremental_export_honours_output(tmp_path, monkeypatch):
+    """--output with --incremental writes the merged export there and leaves the old one alone"""
+    service = FakeGmailService(make_mailbox(4))
+
+    class FakeAuthenticator:
+        def get_service(self):
+            return service
+
+    monkeypatch.setattr(cli_module, 'GmailAuthenticator', FakeAuthenticator)
+    monkeypatch.setattr(sync_state, 'DEFAULT_SYNC_STATE_FILE', tmp_path / 'sync_state.json')
+    first, second = tmp_path / 'first.xlsx', tmp_path / 'second.csv'
+    export = ['export', '--label', 'homework', '--no-cache']
+
+    result = CliRunner().invoke(cli_module.cli, export + ['--output', str(first)])
+    assert result.exit_code == 0, result.output
+
+    service.add_message(make_message('new1', date=datetime(2025, 12, 2, 9, 0)))
+    result = CliRunner().invoke(cli_module.cli, export + ['--incremental', '--output', str(second)])
+    assert result.exit_code == 0, result.output
+
+    exporter = ExcelExporter()
+    assert len(exporter.read_rows(first)[1]) == 4
+    assert [row[6] for row in exporter.read_rows(second)[1]][0] == 'new1'
+    assert len(exporter.read_rows(second)[1]) == 5
+    assert sync_state.SyncStateStore().get('label:homework')['output_file'] == str(second)
+
+
+def test_sync_state_roundtrip(tmp_path):
+    store = SyncStateStore(str(tmp_path / 'state.json'))
+    assert store.get('label:homework') is None
+
+    store.save('label:homework', '1234', ['b', 'a', 'a'], 'exports/hw.xlsx')
+
+    state = store.get('label:homework')
+    assert state['history_id'] == '1234'
+    assert state['message_ids'] == ['a', 'b']
+    assert Path(state['output_file']).is_absolute()
+    assert store.get('label:other') is None
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,68 @@
+"""
+Tests for the metadata-first (two-phase) fetch mode of gmailagent.GmailClient.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from gmailagent.message_cache import MessageCache
+from gmailagent.message_filter import MessageFilter
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def test_full_content_only_for_matching_messages():
+    """Headers are fetched for all messages, bodies only for matches"""
+    service = FakeGmailService(make_mailbox(40))
+    client = GmailClient(service)
+
+    emails = client.retrieve_emails(
+        label='homework',
+        message_filter=MessageFilter(subject_pattern=r'^Lesson 1[0-9] ')
+    )
+
+    expected = [mid for mid in service.message_order if 10 <= int(mid[3:]) % 20 <= 19]
+    assert [email['id'] for email in emails] == expected
+    assert service.get_formats == {'metadata': 40, 'full': 20}
+    assert all(email['body_html'] for email in emails)
+
+
+def test_sender_allow_list():
+    service = FakeGmailService(make_mailbox(10))
+    client = GmailClient(service)
+
+    emails = client.retrieve_emails(
+        label='homework',
+        message_filter=MessageFilter(senders=['student3@example.com', 'STUDENT7@'])
+    )
+
+    assert [email['id'] for email in emails] == ['msg00003', 'msg00007']
+
+
+def test_filter_applies_to_cached_messages(tmp_path):
+    mailbox = make_mailbox(10)
+    cache = MessageCache(str(tmp_path))
+    GmailClient(FakeGmailService(mailbox), cache=cache).retrieve_emails(label='homework')
+
+    service = FakeGmailService(mailbox)
+    emails = GmailClient(service, cache=cache).retrieve_emails(
+        label='homework',
+        message_filter=MessageFilter(senders=['student5@'])
+    )
+
+    assert [email['id'] for email in emails] == ['msg00005']
+    assert service.get_calls == 0
+
+
+def test_invalid_subject_pattern():
+    with pytest.raises(ValueError):
+        MessageFilter(subject_pattern='lesson (')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,144 @@
+"""
+Tests for listing message IDs over parallel date windows.
+"""
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.gmail_client import GmailClient
+from gmailagent.query_planner import get_date_range, plan_date_windows
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+NOW = datetime(2025, 12, 10).timestamp()
+
+
+def _range_query(mailbox):
+    """Query whose epoch bounds cover every message of the mailbox"""
+    dates = [int(message['internalDate']) // 1000 for message in mailbox]
+    return f"label:homework after:{min(dates) - 1} before:{max(dates) + 1}"
+
+
+def test_plan_date_windows():
+    """Windows tile the query's range, newest first, overlapping by a second"""
+    assert get_date_range('after:2025/12/01 newer_than:3d', NOW) == (int(NOW) - 3 * 86400, int(NOW))
+    assert get_date_range('before:2025-12-05', NOW) == (None, int(datetime(2025, 12, 5).timestamp()))
+
+    windows = plan_date_windows('label:hw newer_than:4d', 4, NOW)
+    day = 86400
+    assert windows == [
+        (int(NOW) - day - 1, None),
+        (int(NOW) - 2 * day - 1, int(NOW) - day),
+        (int(NOW) - 3 * day - 1, int(NOW) - 2 * day),
+        (None, int(NOW) - 3 * day),
+    ]
+
+    # Nothing to split without a lower bound
+    assert plan_date_windows('label:hw before:2025/12/01', 4, NOW) == [(None, None)]
+    assert plan_date_windows('label:hw newer_than:4d', 1, NOW) == [(None, None)]
+
+
+def test_plan_queries_use_build_query():
+    """Window queries add epoch after:/before: terms to the original query"""
+    client = GmailClient(FakeGmailService([]))
+    queries = client.plan_queries('label:hw after:100 before:400', 3)
+    assert queries == [
+        'label:hw after:100 before:400 after:299',
+        'label:hw after:100 before:400 after:199 before:300',
+        'label:hw after:100 before:400 before:200',
+    ]
+    assert client.plan_queries('label:hw', 3) == ['label:hw']
+
+
+@pytest.mark.parametrize('shards', [2, 5, 16])
+def test_sharded_listing_matches_sequential(shards):
+    """Parallel windows list the same messages, in the same order, without duplicates"""
+    mailbox = make_mailbox(1200)
+    query = _range_query(mailbox)
+    service = FakeGmailService(mailbox)
+    client = GmailClient(service, service_factory=lambda: service)
+
+    expected = client.get_messages(query, 5000)
+    assert expected == service.message_order
+
+    assert client.get_messages(query, 5000, shards=shards) == expected
+    assert client.get_messages(query, 700, shards=shards) == expected[:700]
+
+
+def test_sharded_listing_needs_service_factory():
+    """Concurrent listing refuses to share one HTTP transport"""
+    mailbox = make_mailbox(10)
+    client = GmailClient(FakeGmailService(mailbox))
+    with pytest.raises(ValueError):
+        client.get_messages(_range_query(mailbox), shards=4)
+
+
+def test_first_window_streams_before_others_finish():
+    """IDs of the newest window are yielded while older windows are still listing"""
+    mailbox = make_mailbox(100)
+    query = _range_query(mailbox)
+    service = FakeGmailService(mailbox)
+    release = threading.Event()
+    listed_queries = []
+
+    class BlockingMessages:
+        def __init__(self, messages):
+            self._messages = messages
+
+        def list(self, q='', **kwargs):
+            listed_queries.append(q)
+            request = self._messages.list(q=q, **kwargs)
+            # Every window but the newest adds an inner before: bound
+            if q.count('before:') > 1:
+                run = request._func
+                request._func = lambda: release.wait(5) and run()
+            return request
+
+        def __getattr__(self, name):
+            return getattr(self._messages, name)
+
+    class BlockingUsers:
+        def messages(self):
+            return BlockingMessages(service.users().messages())
+
+        def __getattr__(self, name):
+            return getattr(service.users(), name)
+
+    class BlockingService:
+        def users(self):
+            return BlockingUsers()
+
+    client = GmailClient(service, service_factory=BlockingService)
+    message_ids = client.iter_message_ids(query, shards=4)
+
+    first = next(message_ids)
+    assert first == service.message_order[0]
+    assert not release.is_set()
+
+    release.set()
+    assert [first] + list(message_ids) == service.message_order
+    assert len(listed_queries) == 4
+
+
+def test_streaming_pipeline_consumes_listing_iterator():
+    """iter_emails fetches windows from an iterator of IDs"""
+    mailbox = make_mailbox(60)
+    service = FakeGmailService(mailbox)
+    client = GmailClient(service, service_factory=lambda: service)
+    progress = []
+
+    ids = client.iter_message_ids(_range_query(mailbox), shards=3)
+    emails = list(client.iter_emails(ids, lambda done, total: progress.append((done, total)), batch_size=25))
+
+    assert [email['id'] for email in emails] == service.message_order
+    assert progress[-1] == (60, None)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
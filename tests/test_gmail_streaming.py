@@ -0,0 +1,62 @@
+"""
+Tests for the streaming Gmail -> Excel export pipeline.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openpyxl import load_workbook
+
+from gmailagent.excel_exporter import ExcelExporter
+from gmailagent.gmail_client import GmailClient
+from gmailagent.pipeline import stream_emails_to_excel
+from gmailagent.url_extractor import extract_urls_from_emails
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def _rows(path):
+    ws = load_workbook(path).active
+    return list(ws.iter_rows(values_only=True))
+
+
+def test_streamed_export_matches_in_memory_export(tmp_path):
+    """Streaming writes the same rows as the list-based exporter"""
+    mailbox = make_mailbox(75)
+
+    emails = GmailClient(FakeGmailService(mailbox)).retrieve_emails(label='homework')
+    expected = ExcelExporter(str(tmp_path)).create_excel(
+        extract_urls_from_emails(emails), {}, str(tmp_path / 'memory.xlsx')
+    )
+
+    service = FakeGmailService(mailbox)
+    result = stream_emails_to_excel(
+        GmailClient(service), list(service.message_order), {}, str(tmp_path / 'stream.xlsx')
+    )
+
+    assert _rows(result['output_file']) == _rows(expected)
+    assert result['emails'] == 75
+    assert result['message_ids'] == service.message_order
+    assert load_workbook(result['output_file']).active.freeze_panes == 'A2'
+
+
+def test_iter_emails_fetches_one_window_at_a_time():
+    """Nothing beyond the current window is fetched before it is consumed"""
+    service = FakeGmailService(make_mailbox(100))
+    client = GmailClient(service)
+
+    emails = client.iter_emails(list(service.message_order), batch_size=10)
+    first = next(emails)
+
+    assert first['id'] == 'msg00000'
+    assert service.get_calls == 10
+
+    assert len(list(emails)) == 99
+    assert service.get_calls == 100
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
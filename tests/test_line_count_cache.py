@@ -0,0 +1,83 @@
+"""
+Tests for the content-addressed line count cache.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from git import Repo
+from openpyxl import load_workbook
+
+from repo_analyzer.excel_manager import ExcelManager
+from repo_analyzer.line_count_cache import LineCountCache, file_blob_id
+from repo_analyzer.metrics_calculator import MetricsCalculator
+
+TEMPLATE = {
+    'main.py': 'def main():\n\n    pass\n',
+    'lib/util.py': 'x = 1\n' * 200,
+    'lib/helpers.js': 'export const a = 1;\r\n\r\n',
+}
+
+
+def write_repo(path: Path, files: dict):
+    """Write files below path"""
+    for name, content in files.items():
+        file_path = path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content.encode('utf-8'))
+
+
+def test_file_blob_id_matches_git(tmp_path):
+    """Blob IDs of files on disk equal git's object IDs"""
+    repo = Repo.init(tmp_path)
+    write_repo(tmp_path, TEMPLATE)
+    repo.index.add(list(TEMPLATE))
+
+    for entry in repo.index.entries.values():
+        assert file_blob_id(tmp_path / entry.path) == entry.hexsha
+
+
+def test_identical_files_are_counted_once(tmp_path):
+    """Forks of the same template reuse the counts of the first repository"""
+    cache = LineCountCache(str(tmp_path / 'line_counts.sqlite'))
+    calculator = MetricsCalculator(line_cache=cache)
+
+    write_repo(tmp_path / 'fork1', TEMPLATE)
+    write_repo(tmp_path / 'fork2', dict(TEMPLATE, **{'main.py': 'print("changed")\n'}))
+
+    first = calculator.calculate(str(tmp_path / 'fork1'))
+    second = calculator.calculate(str(tmp_path / 'fork2'))
+
+    assert (first['line_cache_hits'], first['line_cache_lookups']) == (0, 3)
+    assert (second['line_cache_hits'], second['line_cache_lookups']) == (2, 3)
+
+    uncached = MetricsCalculator().calculate(str(tmp_path / 'fork2'))
+    for key in ('total_lines', 'total_files', 'files_under_130', 'grade'):
+        assert second[key] == uncached[key]
+
+    # Persisted for later runs
+    rerun = MetricsCalculator(line_cache=LineCountCache(str(tmp_path / 'line_counts.sqlite')))
+    assert rerun.calculate(str(tmp_path / 'fork2'))['line_cache_hits'] == 3
+
+
+def test_summary_sheet_reports_hit_rate(tmp_path):
+    """The Summary sheet shows the line count cache hit rate"""
+    output = tmp_path / 'graded.xlsx'
+    results = [{
+        'url': 'https://github.com/student/hw', 'grade': 100.0, 'total_files': 1,
+        'files_under_130': 1, 'total_lines': 3, 'status': 'Success', 'error': ''
+    }]
+    original = [{'id': '1', 'date': '', 'subject': '', 'url': 'https://github.com/student/hw'}]
+    stats = {'hits': 3, 'lookups': 4, 'hit_rate': 75.0}
+
+    ExcelManager().write_output(str(output), original, results, 1.0, line_cache_stats=stats)
+
+    rows = [tuple(row) for row in load_workbook(output)['Summary'].iter_rows(values_only=True)]
+    assert ('  Hit Rate:', '75.0%') in rows
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
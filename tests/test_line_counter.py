@@ -0,0 +1,122 @@
+"""
+Parity tests for the byte-level line counter in repo_analyzer.line_counter.
+
+Every case is compared against a copy of the original text-mode
+implementation of MetricsCalculator._count_lines.
+"""
+
+import codecs
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from repo_analyzer import line_counter
+from repo_analyzer.line_counter import (
+    count_nonempty_lines,
+    count_nonempty_lines_in_bytes,
+    count_nonempty_lines_in_chunks,
+)
+
+
+def reference_count_lines(file_path):
+    """Original text-mode implementation (UTF-8, errors ignored, strip())"""
+    line_count = 0
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if line.strip():
+                line_count += 1
+    return line_count
+
+
+# Every character str.strip() removes, plus look-alikes it keeps
+UNICODE_SPACES = [chr(code) for code in range(0x110000) if chr(code).isspace() and code > 0x7f]
+NOT_SPACES = ['\u200b', '\ufeff', '\x00', '\x7f', '\u180e', '\u2060']
+
+CASES = {
+    'empty': b'',
+    'no_trailing_newline': b'a = 1\nb = 2',
+    'blank_lines': b'\n\n\na\n\n\n',
+    'crlf': b'a\r\n\r\nb\r\n',
+    'cr_only': b'a\r\rb\r',
+    'mixed_newlines': b'a\r\n\rb\n\r\nc\r',
+    'ascii_whitespace': b' \t\n\x0b\n\x0c\n\x1c\x1d\n\x1e\x1f\n \t x\n',
+    'vertical_tab_inside_line': b'a\x0bb\n\x0b\n',
+    'utf8_bom': codecs.BOM_UTF8 + b'\n' + codecs.BOM_UTF8 + b'x\n',
+    'nbsp_and_nel': '\u00a0\n\u0085\n \u00a0 x\n'.encode('utf-8'),
+    'unicode_spaces': '\n'.join(UNICODE_SPACES).encode('utf-8') + b'\n',
+    'unicode_spaces_one_line': ''.join(UNICODE_SPACES).encode('utf-8'),
+    'not_spaces': '\n'.join(NOT_SPACES).encode('utf-8'),
+    'line_separator_is_not_a_break': 'a\u2028b\n\u2028\n'.encode('utf-8'),
+    'cjk_and_cyrillic': '# комментарий\n\n変数 = 1\n'.encode('utf-8'),
+    'latin1': 'caf\xe9\n\xa0\n\xe9\n'.encode('latin-1'),
+    'invalid_only': b'\xff\xfe\n\x80\n\xc3\n',
+    'invalid_around_spaces': b'\xe4 \xb8\xad\n\xc2 \xa0\n',
+    'truncated_sequence_before_break': b'\xe4\xb8\n\xe4\xb8\xad\n',
+    'utf16': 'a = 1\n\nb = 2\n'.encode('utf-16'),
+    'nul_bytes': b'\x00\n\x00\x00\n\n',
+}
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_parity_with_text_reader(tmp_path, name):
+    """Byte-level count equals the original text-mode count"""
+    file_path = tmp_path / name
+    file_path.write_bytes(CASES[name])
+
+    expected = reference_count_lines(file_path)
+    assert count_nonempty_lines(file_path) == expected
+    assert count_nonempty_lines_in_bytes(CASES[name]) == expected
+
+
+def random_contents(rng, size):
+    """Random mix of line breaks, whitespace, text and invalid bytes"""
+    pieces = [
+        b'\n', b'\r', b'\r\n', b' ', b'\t', b'\x0b', b'\x0c', b'\x1c', b'\x1f',
+        b'x', b'#', b'\x00', b'\xff', b'\xc3', b'\xa0', b'\x85', b'\xe3',
+        '\u00a0'.encode('utf-8'), '\u3000'.encode('utf-8'), '\u0085'.encode('utf-8'),
+        '\u2028'.encode('utf-8'), '\u00e9'.encode('utf-8'), '中'.encode('utf-8'),
+        codecs.BOM_UTF8,
+    ]
+    return b''.join(rng.choice(pieces) for _ in range(size))
+
+
+def test_parity_random(tmp_path):
+    """Random byte soups count the same as the text reader"""
+    rng = random.Random(1234)
+    for index in range(300):
+        data = random_contents(rng, rng.randint(0, 200))
+        file_path = tmp_path / f"random_{index}"
+        file_path.write_bytes(data)
+
+        assert count_nonempty_lines(file_path) == reference_count_lines(file_path), data
+
+
+def test_chunks_split_anywhere():
+    """Any chunking of the contents gives the same count"""
+    rng = random.Random(99)
+    for _ in range(200):
+        data = random_contents(rng, 300)
+        expected = count_nonempty_lines_in_bytes(data)
+        chunk_size = rng.randint(1, 40)
+        chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+
+        assert count_nonempty_lines_in_chunks(chunks) == expected
+
+
+def test_large_file_uses_mmap(tmp_path, monkeypatch):
+    """Files above the threshold are counted in chunks of a mapping"""
+    monkeypatch.setattr(line_counter, 'MMAP_THRESHOLD', 1024)
+    monkeypatch.setattr(line_counter, 'CHUNK_SIZE', 1000)
+    rng = random.Random(7)
+    file_path = tmp_path / 'generated.py'
+    file_path.write_bytes(random_contents(rng, 20000))
+
+    assert count_nonempty_lines(file_path) == reference_count_lines(file_path)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,70 @@
+"""
+Tests for benchmark mode: analyzing synthetic local repositories.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from repo_analyzer import progress_journal
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.mirror_cache import normalize_repo_url
+from repo_analyzer.config import STATUS_SUCCESS
+from synthetic_repos import make_synthetic_repos
+
+
+def test_local_urls_need_benchmark_mode(tmp_path):
+    """file:// URLs and local paths are only accepted with allow_local"""
+    bare = tmp_path / 'student.git'
+    bare.mkdir()
+    default = RepositoryManager(temp_dir=str(tmp_path / 'tmp'))
+    benchmark = RepositoryManager(temp_dir=str(tmp_path / 'tmp'), allow_local=True)
+
+    for url in (bare.as_uri(), str(bare)):
+        assert not default._is_valid_github_url(url)
+        assert benchmark._is_valid_github_url(url)
+
+    assert not benchmark._is_valid_github_url(str(tmp_path / 'missing'))
+    assert not benchmark._is_valid_github_url('https://gitlab.com/student/homework')
+    assert benchmark._is_valid_github_url('https://github.com/student/homework')
+
+    # The .git suffix of a local directory is part of its path
+    assert normalize_repo_url(bare.as_uri() + '/') == bare.as_uri()
+    assert normalize_repo_url(str(bare)) == str(bare)
+    assert benchmark._check_repo_size(bare.as_uri()) is None
+
+
+@pytest.mark.parametrize('transport', ['file', 'path'])
+def test_analyze_synthetic_repos(tmp_path, monkeypatch, transport):
+    """Synthetic repositories are cloned and graded without vendored files"""
+    monkeypatch.setattr(progress_journal, 'JOURNAL_DIR', tmp_path / 'journals')
+    urls = make_synthetic_repos(
+        tmp_path, 2, files=6, lines=(5, 200), encodings=['utf-8', 'latin-1'],
+        vendored_dirs=['node_modules', 'vendor'], vendored_files=3, transport=transport
+    )
+
+    input_path = tmp_path / 'input.xlsx'
+    wb = Workbook()
+    wb.active.append(['ID', 'URL', 'Status'])
+    for i, url in enumerate(urls, start=1):
+        wb.active.append([i, url, 'ready'])
+    wb.save(input_path)
+
+    analyzer = RepositoryAnalyzer(use_cache=False, allow_local_repos=True)
+    summary = analyzer.analyze(str(input_path), str(tmp_path / 'graded.xlsx'))
+
+    assert summary['successful'] == 2
+    rows = list(load_workbook(tmp_path / 'graded.xlsx')['Graded Results'].iter_rows(min_row=2, values_only=True))
+    assert [row[5] for row in rows] == [6, 6]
+    assert all(row[8] == STATUS_SUCCESS for row in rows)
+    assert {span['stage'] for span in analyzer.tracer.spans} >= {'clone', 'count', 'excel_write'}
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
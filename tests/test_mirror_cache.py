@@ -0,0 +1,102 @@
+"""
+Tests for the persistent bare-mirror cache in repo_analyzer.MirrorCache.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from git import Repo
+
+from repo_analyzer.mirror_cache import MirrorCache, normalize_repo_url
+
+
+def make_remote(path: Path, files: dict) -> Repo:
+    """Create a local repository with one commit of the given files"""
+    repo = Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Test')
+        config.set_value('user', 'email', 'test@example.com')
+    commit(repo, files)
+    return repo
+
+
+def commit(repo: Repo, files: dict):
+    """Write files into the working tree and commit them"""
+    for name, content in files.items():
+        file_path = Path(repo.working_tree_dir) / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    repo.index.add(list(files))
+    repo.index.commit('update')
+
+
+def test_normalize_repo_url():
+    """Equivalent URL spellings share one cache key"""
+    expected = 'https://github.com/student/homework'
+    assert normalize_repo_url('https://github.com/student/homework') == expected
+    assert normalize_repo_url('https://GitHub.com/student/homework/') == expected
+    assert normalize_repo_url('https://github.com/student/homework.git') == expected
+    assert normalize_repo_url('git@github.com:student/homework.git') == expected
+    assert normalize_repo_url('https://github.com/Student/HomeWork/tree/main/src') == expected
+    assert normalize_repo_url('http://www.github.com/student/homework?tab=readme') == expected
+
+
+def test_regrade_fetches_new_head(tmp_path):
+    """A second checkout reuses the mirror and sees the pushed fix"""
+    remote = make_remote(tmp_path / 'remote', {'main.py': 'print(1)\n', 'pkg/util.py': 'x = 1\n'})
+    url = (tmp_path / 'remote').as_uri()
+    cache = MirrorCache(cache_dir=str(tmp_path / 'mirrors'))
+
+    cache.checkout(url, tmp_path / 'first')
+    assert (tmp_path / 'first' / 'main.py').read_text() == 'print(1)\n'
+    assert (tmp_path / 'first' / 'pkg' / 'util.py').exists()
+    assert not (tmp_path / 'first' / '.git').exists()
+
+    commit(remote, {'main.py': 'print(2)\n'})
+    cache.checkout(url + '/', tmp_path / 'second')
+
+    assert (tmp_path / 'second' / 'main.py').read_text() == 'print(2)\n'
+    assert len(list((tmp_path / 'mirrors').iterdir())) == 1
+
+
+def test_failed_fetch_leaves_no_mirror(tmp_path):
+    """A repository that cannot be fetched is not kept in the cache"""
+    cache = MirrorCache(cache_dir=str(tmp_path / 'mirrors'))
+    url = (tmp_path / 'missing').as_uri()
+
+    try:
+        cache.checkout(url, tmp_path / 'out')
+        assert False, 'expected fetch to fail'
+    except Exception:
+        pass
+
+    assert not cache.mirror_path(url).exists()
+
+
+def test_lru_eviction(tmp_path):
+    """Least recently used mirrors are evicted beyond the size limit"""
+    urls = []
+    for name in ('a', 'b', 'c'):
+        make_remote(tmp_path / name, {'data.py': name * 200_000})
+        urls.append((tmp_path / name).as_uri())
+
+    cache = MirrorCache(cache_dir=str(tmp_path / 'mirrors'))
+    for url in urls:
+        cache.checkout(url, tmp_path / 'out' / url[-1])
+    mirror_size = cache.size_bytes() // 3
+
+    # Reuse 'a' so that 'b' is the least recently used mirror
+    cache.checkout(urls[0], tmp_path / 'out' / 'a2')
+    cache.max_bytes = int(mirror_size * 2.5)
+    cache.evict()
+
+    assert cache.mirror_path(urls[0]).exists()
+    assert not cache.mirror_path(urls[1]).exists()
+    assert cache.mirror_path(urls[2]).exists()
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,139 @@
+"""
+Tests for the analyze progress journal and --resume (repo_analyzer.progress_journal).
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer import progress_journal
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.progress_journal import ProgressJournal
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.config import STATUS_SUCCESS
+
+URLS = [f"https://github.com/student/repo{i}" for i in range(1, 6)]
+
+
+def write_input(path: Path):
+    """Write an input workbook with one ready row per URL"""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['ID', 'URL', 'Status'])
+    for i, url in enumerate(URLS, start=1):
+        ws.append([i, url, 'ready'])
+    wb.save(path)
+
+
+def make_clone(calls, crash_at=None):
+    """Stand-in for RepositoryManager.clone; raises KeyboardInterrupt on the crash_at URL"""
+
+    def fake_clone(self, url):
+        if url == crash_at:
+            raise KeyboardInterrupt
+        calls.append(url)
+        local_path = self.temp_dir / f"repo_{len(calls)}"
+        local_path.mkdir()
+        (local_path / 'main.py').write_text("x = 1\n")
+        return str(local_path), True, ''
+
+    return fake_clone
+
+
+def test_load_ignores_truncated_last_line(tmp_path):
+    """A record cut short by a crash is skipped and the next record starts on a new line"""
+    journal = ProgressJournal(tmp_path / 'run.jsonl')
+    journal.open()
+    journal.append(2, URLS[0], {'url': URLS[0], 'grade': 100.0})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"row_index": 3, "url": "https://github.com/stu')
+
+    assert list(journal.load()) == [(2, URLS[0])]
+
+    journal.open(resume=True)
+    journal.append(3, URLS[1], {'url': URLS[1], 'grade': 50.0})
+    journal.close()
+    assert list(journal.load()) == [(2, URLS[0]), (3, URLS[1])]
+
+
+def test_resume_processes_only_remaining_rows(tmp_path, monkeypatch):
+    """An interrupted run keeps its finished rows; --resume analyzes only the rest"""
+    monkeypatch.setattr(progress_journal, 'JOURNAL_DIR', tmp_path / 'journals')
+    input_path = tmp_path / 'input.xlsx'
+    output_path = tmp_path / 'output.xlsx'
+    write_input(input_path)
+
+    calls = []
+    monkeypatch.setattr(RepositoryManager, 'clone', make_clone(calls, crash_at=URLS[3]))
+    with pytest.raises(KeyboardInterrupt):
+        RepositoryAnalyzer(use_cache=False).analyze(str(input_path), str(output_path))
+    assert calls == URLS[:3]
+    assert not output_path.exists()
+
+    calls.clear()
+    monkeypatch.setattr(RepositoryManager, 'clone', make_clone(calls))
+    summary = RepositoryAnalyzer(use_cache=False).analyze(str(input_path), str(output_path), resume=True)
+
+    assert calls == URLS[3:]
+    assert summary['successful'] == len(URLS)
+
+    ws = load_workbook(output_path)['Graded Results']
+    headers = [cell.value for cell in ws[1]]
+    statuses = [row[headers.index('Status')] for row in ws.iter_rows(min_row=2, values_only=True)]
+    assert statuses == [STATUS_SUCCESS] * len(URLS)
+
+    # The journal is removed once the output is written
+    assert not list((tmp_path / 'journals').iterdir())
+
+
+def test_resume_after_interrupt_during_clones(tmp_path, monkeypatch):
+    """Parallel runs journal each row as its metrics finish, so a crash mid-clone keeps them"""
+    monkeypatch.setattr(progress_journal, 'JOURNAL_DIR', tmp_path / 'journals')
+    input_path = tmp_path / 'input.xlsx'
+    output_path = tmp_path / 'output.xlsx'
+    write_input(input_path)
+
+    journaled = []
+    three_journaled = threading.Event()
+    append = ProgressJournal.append
+
+    def record_append(self, row_index, url, result):
+        append(self, row_index, url, result)
+        journaled.append(url)
+        if len(journaled) >= 3:
+            three_journaled.set()
+
+    calls = []
+    clone = make_clone(calls)
+
+    def crash_after_metrics(self, url):
+        if url == URLS[3]:
+            # Ctrl-C while this clone is still running
+            three_journaled.wait(10)
+            raise KeyboardInterrupt
+        return clone(self, url)
+
+    monkeypatch.setattr(ProgressJournal, 'append', record_append)
+    monkeypatch.setattr(RepositoryManager, 'clone', crash_after_metrics)
+    with pytest.raises(KeyboardInterrupt):
+        RepositoryAnalyzer(workers=2, use_cache=False).analyze(str(input_path), str(output_path))
+    finished = set(journaled)
+    assert len(finished) >= 3
+    assert finished <= set(calls)
+
+    calls.clear()
+    monkeypatch.setattr(RepositoryManager, 'clone', make_clone(calls))
+    summary = RepositoryAnalyzer(workers=2, use_cache=False).analyze(str(input_path), str(output_path), resume=True)
+
+    assert sorted(calls) == sorted(set(URLS) - finished)
+    assert summary['successful'] == len(URLS)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,149 @@
+"""
+Tests for per-file line count storage and regrading (repo_analyzer.regrader).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer import progress_journal
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.file_table_store import pack_file_table, unpack_file_table, sidecar_path, EXTENSIONS
+from repo_analyzer.regrader import regrade_workbook
+from repo_analyzer.errors import FileTableNotFoundError
+from repo_analyzer.config import STATUS_SUCCESS, STATUS_NO_CODE
+
+# Non-empty line counts of the files of each repository
+REPOS = {
+    'https://github.com/student/small': {'a.py': 20, 'b.py': 110, 'web/app.js': 150},
+    'https://github.com/student/large': {'main.py': 125, 'util.py': 300},
+    'https://github.com/student/docs': {'notes.py': 5},
+}
+
+
+def fake_clone(self, url):
+    """Stand-in for RepositoryManager.clone that writes the files of REPOS"""
+    with self._count_lock:
+        self.clone_count += 1
+        local_path = self.temp_dir / f"repo_{self.clone_count}"
+
+    for name, lines in REPOS[url].items():
+        path = local_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n" * lines)
+    return str(local_path), True, ''
+
+
+def analyze(tmp_path, monkeypatch, **options) -> Path:
+    """Analyze REPOS into a graded workbook and return its path"""
+    monkeypatch.setattr(progress_journal, 'JOURNAL_DIR', tmp_path / 'journals')
+    monkeypatch.setattr(RepositoryManager, 'clone', fake_clone)
+
+    input_path = tmp_path / 'input.xlsx'
+    wb = Workbook()
+    wb.active.append(['ID', 'URL', 'Status'])
+    for i, url in enumerate(REPOS, start=1):
+        wb.active.append([i, url, 'ready'])
+    wb.save(input_path)
+
+    output_path = tmp_path / 'graded.xlsx'
+    RepositoryAnalyzer(use_cache=False, **options).analyze(str(input_path), str(output_path))
+    return output_path
+
+
+def read_results(path: Path):
+    """Read the header and (grade, total files, files under limit, total lines, status) per row"""
+    ws = load_workbook(path)['Graded Results']
+    headers = [cell.value for cell in ws[1]]
+    rows = [row[4:9] for row in ws.iter_rows(min_row=2, values_only=True)]
+    return headers, rows
+
+
+def test_pack_roundtrip_is_order_independent():
+    """Packing sorts by path hash and keeps extension ids and line counts"""
+    files = [('src/main.py', 12), ('app.JS', 0), ('big.rs', 70000)]
+    packed = pack_file_table(files)
+
+    assert pack_file_table(reversed(files)) == packed
+    path_hashes, extension_ids, lines = unpack_file_table(packed)
+    assert list(path_hashes) == sorted(path_hashes)
+    assert sorted(zip((EXTENSIONS[i] for i in extension_ids), lines)) == [('.js', 0), ('.py', 12), ('.rs', 70000)]
+    assert all(len(column) == 0 for column in unpack_file_table(pack_file_table([])))
+
+
+def test_regrade_with_new_line_limit(tmp_path, monkeypatch):
+    """Regrading recomputes grades from the sidecar without cloning"""
+    graded = analyze(tmp_path, monkeypatch)
+    assert sidecar_path(graded).exists()
+    _, rows = read_results(graded)
+    assert rows[0][:3] == (66.67, 3, 2)
+    assert rows[1][:3] == (50.0, 2, 1)
+
+    monkeypatch.setattr(RepositoryManager, 'clone', lambda self, url: pytest.fail('regrade must not clone'))
+    summary = regrade_workbook(str(graded), line_limit=100, output_path=str(tmp_path / 'regraded.xlsx'))
+
+    assert summary['regraded'] == 3
+    headers, rows = read_results(tmp_path / 'regraded.xlsx')
+    assert 'Files <100' in headers
+    assert rows[0][:3] == (33.33, 3, 1)
+    assert rows[1][:3] == (0.0, 2, 0)
+    assert rows[2][:3] == (100.0, 1, 1)
+
+
+def test_regrade_with_extension_subset(tmp_path, monkeypatch):
+    """Files outside the chosen extensions are left out of the grade"""
+    graded = analyze(tmp_path, monkeypatch)
+
+    regrade_workbook(str(graded), line_limit=130, allowed_extensions=['js'])
+    _, rows = read_results(graded)
+
+    assert rows[0] == (0.0, 1, 0, 150, STATUS_SUCCESS)
+    assert rows[1][3:] == (0, STATUS_NO_CODE)
+
+    # The sidecar keeps every file, so a later regrade can widen the list again
+    regrade_workbook(str(graded), line_limit=130)
+    _, rows = read_results(graded)
+    assert rows[1] == (50.0, 2, 1, 425, STATUS_SUCCESS)
+
+
+def test_regrade_keeps_other_sheets(tmp_path, monkeypatch):
+    """Similarity and Timing sheets and the line cache statistics survive a regrade"""
+    stats = {'hits': 4, 'lookups': 6, 'hit_rate': 66.7}
+    monkeypatch.setattr(RepositoryAnalyzer, '_line_cache_stats', lambda self: stats)
+    graded = analyze(tmp_path, monkeypatch, similarity=True)
+
+    def sheets(path):
+        wb = load_workbook(path)
+        return {ws.title: [row for row in ws.iter_rows(values_only=True)] for ws in wb}
+
+    before = sheets(graded)
+    assert set(before) == {'Graded Results', 'Summary', 'Similarity', 'Timing'}
+    assert len(before['Similarity']) > 1
+
+    regrade_workbook(str(graded), line_limit=100)
+    after = sheets(graded)
+
+    assert load_workbook(graded).sheetnames == ['Graded Results', 'Summary', 'Similarity', 'Timing']
+    assert after['Similarity'] == before['Similarity']
+    assert after['Timing'] == before['Timing']
+    assert ('  Files From Cache:', '4 of 6') in after['Summary']
+    assert ('  Hit Rate:', '66.7%') in after['Summary']
+    assert after['Graded Results'] != before['Graded Results']
+
+
+def test_regrade_without_sidecar(tmp_path):
+    """Workbooks without stored line counts are reported"""
+    workbook = tmp_path / 'old.xlsx'
+    Workbook().save(workbook)
+
+    with pytest.raises(FileTableNotFoundError):
+        regrade_workbook(str(workbook), line_limit=100)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
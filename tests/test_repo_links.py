@@ -0,0 +1,123 @@
+"""
+Tests for resolving GitHub links to repositories (gmailagent.url_extractor)
+and analyzing the linked subdirectory (repo_analyzer).
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmailagent.excel_exporter import ExcelExporter
+from gmailagent.url_extractor import (
+    resolve_github_url,
+    select_repository,
+    URL_KIND_REPOSITORY,
+    URL_KIND_DEEP_LINK,
+    URL_KIND_GITHUB,
+    URL_KIND_OTHER
+)
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.mirror_cache import split_repo_link
+from repo_analyzer.config import STATUS_SUCCESS, STATUS_INVALID_URL
+
+
+@pytest.mark.parametrize('url, kind, repo, subpath', [
+    ('https://github.com/Student/HW', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student/hw.git', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student/hw?tab=readme-ov-file', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student/hw/issues/3', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student/hw/tree/main', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student/hw/tree/main/hw3/', URL_KIND_DEEP_LINK, 'https://github.com/student/hw', 'hw3'),
+    ('https://github.com/student/hw/blob/main/hw3/src/app.py', URL_KIND_DEEP_LINK,
+     'https://github.com/student/hw', 'hw3/src'),
+    ('https://raw.githubusercontent.com/student/hw/main/hw%203/a.py', URL_KIND_DEEP_LINK,
+     'https://github.com/student/hw', 'hw 3'),
+    ('https://github.com/student/hw/tree/main/../..', URL_KIND_REPOSITORY, 'https://github.com/student/hw', ''),
+    ('https://github.com/student', URL_KIND_GITHUB, '', ''),
+    ('https://github.com/settings/profile', URL_KIND_GITHUB, '', ''),
+    ('https://gist.github.com/student/abc123', URL_KIND_GITHUB, '', ''),
+    ('https://docs.python.org/3/', URL_KIND_OTHER, '', ''),
+])
+def test_resolve_github_url(url, kind, repo, subpath):
+    """URLs are classified and deep links mapped to repository plus directory"""
+    resolved = resolve_github_url(url)
+    assert (resolved['kind'], resolved['repo'], resolved['subpath']) == (kind, repo, subpath)
+
+
+def test_repo_column_roundtrip():
+    """The Repo column value splits back into repository and directory"""
+    link = select_repository(['https://docs.python.org', 'https://github.com/a/b/blob/dev/hw%203/x.py'])
+    assert link == 'https://github.com/a/b/tree/dev/hw%203'
+    assert split_repo_link(link) == ('https://github.com/a/b', 'hw 3')
+    assert split_repo_link('https://github.com/a/b') == ('https://github.com/a/b', '')
+    assert select_repository(['https://github.com/a']) is None
+
+
+def test_export_writes_repo_column(tmp_path):
+    """Exports get a Repo column; merging fills it in for older exports"""
+    old_export = tmp_path / 'old.xlsx'
+    wb = Workbook()
+    wb.active.append(['ID', 'Date', 'Subject', 'URL', 'Status'])
+    wb.active.append(['1', '2025-01-01 10:00:00', 'HW', 'https://github.com/a/old/tree/main/hw1', 'ready'])
+    wb.save(old_export)
+
+    email = {
+        'date': datetime(2025, 1, 2, 10, 0),
+        'subject': 'HW',
+        'urls': ['https://github.com/a/new?tab=readme'],
+        'repo': 'https://github.com/a/new'
+    }
+    ExcelExporter(str(tmp_path)).merge_into_excel([email, dict(email, urls=[], repo=None)], str(old_export))
+
+    ws = load_workbook(old_export).active
+    assert [cell.value for cell in ws[1]] == ExcelExporter.HEADERS
+    rows = [row[3:6] for row in ws.iter_rows(min_row=2, values_only=True)]
+    assert rows == [
+        ('https://github.com/a/new?tab=readme', 'https://github.com/a/new', 'ready'),
+        (None, None, 'ready'),
+        ('https://github.com/a/old/tree/main/hw1', 'https://github.com/a/old/tree/main/hw1', 'ready'),
+    ]
+
+
+def test_analyzer_uses_repo_column(monkeypatch):
+    """Rows without a repository are skipped; deep links analyze their directory only"""
+    calls = []
+
+    def fake_clone(self, url):
+        calls.append(url)
+        local_path = self.temp_dir / f"repo_{len(calls)}"
+        for name, lines in {'hw1/a.py': 10, 'hw2/b.py': 200, 'hw2/c.py': 20}.items():
+            (local_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (local_path / name).write_text("x = 1\n" * lines)
+        return str(local_path), True, ''
+
+    monkeypatch.setattr(RepositoryManager, 'clone', fake_clone)
+    rows = [
+        {'url': 'see my repo', 'repo': ''},
+        {'url': 'https://github.com/a/b/tree/main/hw2', 'repo': 'https://github.com/a/b/tree/main/hw2'},
+        {'url': 'https://github.com/a/b', 'repo': 'https://github.com/a/b'},
+        {'url': 'https://github.com/a/b/tree/main/missing', 'repo': 'https://github.com/a/b/tree/main/missing'},
+    ]
+
+    analyzer = RepositoryAnalyzer(use_cache=False)
+    try:
+        results = analyzer._process_unique_repositories(rows)
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert calls == ['https://github.com/a/b'] * 3
+    assert [result['url'] for result in results] == [row['url'] for row in rows]
+    assert [result['status'] for result in results][:3] == [STATUS_INVALID_URL, STATUS_SUCCESS, STATUS_SUCCESS]
+    assert (results[1]['total_files'], results[1]['files_under_130']) == (2, 1)
+    assert results[2]['total_files'] == 3
+    assert 'Directory not found in repository: missing' in results[3]['error']
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
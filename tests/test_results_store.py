@@ -0,0 +1,68 @@
+"""
+Tests for reusing stored results of unchanged repositories.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.results_store import ResultsStore
+
+METRICS = {'total_files': 4, 'files_under_130': 3, 'total_lines': 400, 'grade': 75.0}
+
+
+def test_store_is_keyed_by_url_commit_and_config(tmp_path):
+    """Results are shared by URL spellings but not across commits or settings"""
+    db_path = str(tmp_path / 'results.sqlite')
+    store = ResultsStore(db_path)
+    store.put('https://github.com/student/hw.git', 'a' * 40, dict(METRICS, extra=1))
+
+    assert store.get('https://github.com/student/hw', 'a' * 40) == METRICS
+    assert store.get('https://github.com/student/hw', 'b' * 40) is None
+    assert ResultsStore(db_path, config_hash='other').get('https://github.com/student/hw', 'a' * 40) is None
+
+
+def test_unchanged_repository_is_not_cloned(tmp_path, monkeypatch):
+    """A regrade reuses the stored result while the remote HEAD is unchanged"""
+    heads = {'url': 'a' * 40}
+    clones = []
+
+    def fake_clone(self, url):
+        clones.append(url)
+        local_path = self.temp_dir / f"repo_{len(clones)}"
+        local_path.mkdir()
+        (local_path / 'main.py').write_text("x = 1\n" * 10)
+        return str(local_path), True, ''
+
+    monkeypatch.setattr(RepositoryManager, 'resolve_head', lambda self, url: heads['url'])
+    monkeypatch.setattr(RepositoryManager, 'clone', fake_clone)
+
+    analyzer = RepositoryAnalyzer(use_cache=False)
+    analyzer.results_store = ResultsStore(str(tmp_path / 'results.sqlite'))
+    data = [{'url': 'https://github.com/student/hw'}]
+
+    def run():
+        try:
+            return analyzer._process_repositories_sequential(data)
+        finally:
+            analyzer.repo_manager.cleanup()
+
+    first = run()
+    second = run()
+    assert len(clones) == 1
+    assert second == first
+    assert first[0]['grade'] == 100.0
+    assert analyzer.reused_results == 1
+
+    # The student pushes a fix
+    heads['url'] = 'b' * 40
+    run()
+    assert len(clones) == 2
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,152 @@
+"""
+Tests for deferred clone retries (repo_analyzer.retry_queue).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer import repo_manager as repo_manager_module
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.retry_queue import CircuitBreaker, RetryQueue, backoff_delay
+from repo_analyzer.config import (
+    CIRCUIT_BREAKER_THRESHOLD,
+    RETRY_ATTEMPTS,
+    STATUS_NETWORK_ERROR,
+    STATUS_SUCCESS
+)
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_queue_releases_items_when_due():
+    """Items come out in due order, only once their delay has passed"""
+    clock = FakeClock()
+    queue = RetryQueue(clock=clock)
+    queue.schedule('late', 5)
+    queue.schedule('early', 1)
+    queue.schedule('early too', 1)
+
+    assert queue.pop_ready() == []
+    assert queue.time_until_next() == 1
+
+    clock.now = 2
+    assert queue.pop_ready() == ['early', 'early too']
+    assert queue.time_until_next() == 3
+
+    clock.now = 10
+    assert queue.pop_ready() == ['late']
+    assert not queue
+    assert queue.time_until_next() is None
+
+
+def test_backoff_is_jittered_and_capped():
+    """Delays grow exponentially, vary between calls and respect the cap"""
+    delays = [backoff_delay(3, base=2, cap=60) for _ in range(50)]
+    assert all(4 <= delay <= 8 for delay in delays)
+    assert len(set(delays)) > 1
+
+    assert all(30 <= backoff_delay(10, base=2, cap=60) <= 60 for _ in range(50))
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    """A host is suspended after the threshold and closed again by a success"""
+    breaker = CircuitBreaker(threshold=3)
+    for _ in range(2):
+        breaker.record_failure('github.com')
+    assert not breaker.is_open('github.com')
+
+    breaker.record_failure('github.com')
+    assert breaker.is_open('github.com')
+    assert not breaker.is_open('gitlab.com')
+
+    breaker.record_success('github.com')
+    assert not breaker.is_open('github.com')
+
+
+def test_retry_delay_policy(tmp_path):
+    """Only transient errors are retried, up to RETRY_ATTEMPTS, while the circuit is closed"""
+    manager = RepositoryManager(temp_dir=str(tmp_path))
+    url = 'https://github.com/student/repo'
+
+    assert manager.retry_delay(url, 'Network connection failed', 1) is not None
+    assert manager.retry_delay(url, 'Repository not found or deleted', 1) is None
+    assert manager.retry_delay(url, 'Network connection failed', RETRY_ATTEMPTS) is None
+
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+        manager.circuit_breaker.record_failure('github.com')
+    assert manager.retry_delay(url, 'Network connection failed', 1) is None
+
+
+def make_flaky_clone(calls, failures):
+    """Stand-in for RepositoryManager.clone; URLs fail as often as given in failures"""
+
+    def fake_clone(self, url):
+        calls.append(url)
+        if failures.get(url, 0) > 0:
+            failures[url] -= 1
+            return None, False, 'Network connection failed'
+
+        local_path = self.temp_dir / f"repo_{len(calls)}"
+        local_path.mkdir()
+        (local_path / 'main.py').write_text("x = 1\n")
+        return str(local_path), True, ''
+
+    return fake_clone
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_flaky_repository_does_not_stall_batch(monkeypatch, workers):
+    """A transient failure is retried after the other repositories, without an inline sleep"""
+    monkeypatch.setattr(repo_manager_module, 'backoff_delay', lambda attempt: 0.2)
+
+    urls = [f"https://github.com/student/repo{i}" for i in range(4)]
+    calls = []
+    monkeypatch.setattr(RepositoryManager, 'clone', make_flaky_clone(calls, {urls[0]: 1}))
+
+    analyzer = RepositoryAnalyzer(workers=workers, use_cache=False)
+    try:
+        if workers > 1:
+            results = analyzer._process_repositories_parallel([{'url': url} for url in urls])
+        else:
+            results = analyzer._process_repositories_sequential([{'url': url} for url in urls])
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert [result['status'] for result in results] == [STATUS_SUCCESS] * 4
+    assert sorted(calls[:4]) == sorted(urls)
+    assert calls[4] == urls[0]
+
+
+def test_permanently_failing_repository_gives_up(monkeypatch):
+    """After RETRY_ATTEMPTS transient failures the repository is reported as failed"""
+    monkeypatch.setattr(repo_manager_module, 'backoff_delay', lambda attempt: 0.0)
+
+    url = 'https://github.com/student/flaky'
+    calls = []
+    monkeypatch.setattr(RepositoryManager, 'clone', make_flaky_clone(calls, {url: 100}))
+
+    analyzer = RepositoryAnalyzer(use_cache=False)
+    try:
+        results = analyzer._process_repositories_sequential([{'url': url}])
+    finally:
+        analyzer.repo_manager.cleanup()
+
+    assert len(calls) == RETRY_ATTEMPTS
+    assert results[0]['status'] == STATUS_NETWORK_ERROR
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
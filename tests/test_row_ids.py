@@ -0,0 +1,73 @@
+"""
+Tests for stable row IDs and the hidden Gmail ID columns of exports.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gmailagent.excel_exporter import ExcelExporter, row_id
+from gmailagent.gmail_client import GmailClient
+from fake_gmail_service import FakeGmailService, make_mailbox
+
+
+def _email(message_id, day, urls):
+    return {
+        'id': message_id,
+        'thread_id': f"thread-{message_id}",
+        'date': datetime(2025, 1, day, 10, 0),
+        'subject': f"HW {message_id}",
+        'urls': urls,
+    }
+
+
+def _rows(path):
+    return list(load_workbook(path).active.iter_rows(min_row=2, values_only=True))
+
+
+def test_row_id_is_stable():
+    """The same message gets the same ID; unknown messages get a fresh one"""
+    assert row_id('18c0ffee') == row_id('18c0ffee')
+    assert row_id('18c0ffee') != row_id('18c0ffef')
+    assert row_id(None) != row_id(None)
+
+
+def test_exports_share_row_ids(tmp_path):
+    """Two exports of the same messages have the same IDs and hidden Gmail IDs"""
+    emails = GmailClient(FakeGmailService(make_mailbox(5))).retrieve_emails(label='homework')
+    exporter = ExcelExporter(str(tmp_path))
+    first = exporter.create_excel(emails, {}, str(tmp_path / 'first.xlsx'))
+    second, _ = exporter.create_excel_streaming(emails, {}, str(tmp_path / 'second.xlsx'))
+
+    assert _rows(first) == _rows(second)
+    for row, email in zip(_rows(first), emails):
+        assert row[0] == row_id(email['id'])
+        assert row[6:] == (email['id'], email['thread_id'])
+
+    for path in (first, second):
+        dimensions = load_workbook(path).active.column_dimensions
+        assert [letter for letter in 'ABCDEFGH' if dimensions[letter].hidden] == ['G', 'H']
+
+
+def test_merge_replaces_rows_of_the_same_message(tmp_path):
+    """Re-exported messages replace their earlier row instead of duplicating it"""
+    exporter = ExcelExporter(str(tmp_path))
+    path = exporter.create_excel(
+        [_email('a', 1, []), _email('b', 2, ['https://github.com/s/old'])], {}, str(tmp_path / 'emails.xlsx')
+    )
+
+    exporter.merge_into_excel([_email('b', 2, ['https://github.com/s/new']), _email('c', 3, [])], path)
+
+    rows = _rows(path)
+    assert [(row[6], row[3]) for row in rows] == [('c', None), ('b', 'https://github.com/s/new'), ('a', None)]
+    assert [row[0] for row in rows] == [row_id('c'), row_id('b'), row_id('a')]
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
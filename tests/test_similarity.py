@@ -0,0 +1,131 @@
+"""
+Tests for the submission similarity index (repo_analyzer.similarity).
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer.similarity import (
+    SimilarityIndex,
+    code_shingles,
+    estimate_similarity,
+    find_similar_pairs,
+    minhash_signature,
+    unpack_signature
+)
+from repo_analyzer.metrics_calculator import MetricsCalculator
+from repo_analyzer.excel_manager import ExcelManager
+from repo_analyzer.analyzer import RepositoryAnalyzer
+
+
+def make_program(seed: int, functions: int = 30) -> str:
+    """Generate a distinct Python program"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(functions):
+        name = f"f{seed}_{i}"
+        ops = [rng.choice(['+', '-', '*']) for _ in range(3)]
+        lines.append(f"def {name}(a, b):")
+        lines.append(f"    c = a {ops[0]} b {ops[1]} {rng.randint(1, 99)}")
+        lines.append(f"    return c {ops[2]} {name}_helper(a)")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def signature_of(text: str) -> str:
+    return minhash_signature(code_shingles(text.encode('utf-8')))
+
+
+def test_normalization_ignores_formatting_case_and_literals():
+    """Reformatted code with renamed literals has the same shingles"""
+    original = b'def Total(items):\n    return sum(items) + 1  # "x"\n'
+    reformatted = b'def total( items ):\n\n\treturn sum( items )+42 # \'y\'\n'
+    assert code_shingles(original) == code_shingles(reformatted)
+    assert code_shingles(b'') == set()
+    assert minhash_signature([]) is None
+
+
+def test_estimate_tracks_jaccard_similarity():
+    """Signature agreement approximates the true Jaccard similarity"""
+    first = set(range(0, 2000))
+    second = set(range(1000, 3000))  # Jaccard 1/3
+    estimate = estimate_similarity(
+        unpack_signature(minhash_signature(first)),
+        unpack_signature(minhash_signature(second))
+    )
+    assert abs(estimate - 1 / 3) < 0.12
+
+
+def test_copied_submissions_are_paired(tmp_path):
+    """Copies are reported once, across runs, and unrelated code is not"""
+    base = make_program(1)
+    copy = base.replace('return c', 'return  c').upper()
+    results = [
+        {'url': 'https://github.com/alice/hw1', 'minhash': signature_of(base)},
+        {'url': 'https://github.com/bob/hw1', 'minhash': signature_of(copy)},
+        {'url': 'https://github.com/carol/hw1', 'minhash': signature_of(make_program(2))},
+        {'url': 'https://github.com/dave/hw1', 'minhash': None},
+    ]
+
+    index = SimilarityIndex(str(tmp_path / 'similarity.sqlite'))
+    pairs = find_similar_pairs(index, results, label='lesson1')
+    assert [(pair['url'], pair['other_url']) for pair in pairs] == [
+        ('https://github.com/bob/hw1', 'https://github.com/alice/hw1')
+    ]
+    assert pairs[0]['similarity'] > 0.9
+    index.close()
+
+    # The index persists: a later lesson finds the earlier submission
+    index = SimilarityIndex(str(tmp_path / 'similarity.sqlite'))
+    later = [{'url': 'https://github.com/erin/hw2', 'minhash': signature_of(base)}]
+    pairs = find_similar_pairs(index, later, label='lesson2')
+    assert {pair['other_url'] for pair in pairs} == {'https://github.com/alice/hw1', 'https://github.com/bob/hw1'}
+    assert {pair['other_label'] for pair in pairs} == {'lesson1'}
+
+    # Rerunning a lesson reports each pair once
+    assert len(find_similar_pairs(index, results, label='lesson1')) == 3
+    index.close()
+
+
+def test_calculator_computes_signature(tmp_path):
+    """The metrics walk produces the signature when similarity is enabled"""
+    (tmp_path / 'main.py').write_text(make_program(3))
+    (tmp_path / 'notes.txt').write_text(make_program(4))
+
+    metrics = MetricsCalculator(similarity=True).calculate(str(tmp_path))
+    assert metrics['minhash'] == signature_of(make_program(3))
+    assert 'minhash' not in MetricsCalculator().calculate(str(tmp_path))
+
+
+def test_similarity_is_opt_in():
+    """Without similarity, file contents are never read (cached line counts suffice)"""
+    def read():
+        raise AssertionError('file contents read')
+
+    files = [('a.py', lambda: 10, read), ('b.py', lambda: 200, read)]
+    metrics = MetricsCalculator()._summarize(files)
+    assert (metrics['total_files'], metrics['files_under_130']) == (2, 1)
+    assert not RepositoryAnalyzer(use_cache=False).similarity
+
+
+def test_similarity_sheet(tmp_path):
+    """Pairs are written to their own sheet"""
+    output = tmp_path / 'out.xlsx'
+    results = [{'url': 'https://github.com/a/b', 'status': 'Success', 'grade': 100.0}]
+    pairs = [{'url': 'https://github.com/a/b', 'other_url': 'https://github.com/c/d',
+              'other_label': 'lesson1', 'similarity': 0.875}]
+    ExcelManager().write_output(str(output), [{'url': 'https://github.com/a/b'}], results, 1.0,
+                                similar_pairs=pairs)
+
+    rows = list(load_workbook(output)['Similarity'].iter_rows(values_only=True))
+    assert rows[1] == ('https://github.com/a/b', 'https://github.com/c/d', 'lesson1', '87.5%')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
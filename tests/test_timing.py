@@ -0,0 +1,102 @@
+"""
+Tests for per-stage timing spans and trace export (repo_analyzer.timing).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repo_analyzer import progress_journal
+from repo_analyzer.analyzer import RepositoryAnalyzer
+from repo_analyzer.repo_manager import RepositoryManager
+from repo_analyzer.timing import Tracer, percentile, trace_path
+
+URLS = [f"https://github.com/student/repo{i}" for i in range(1, 4)]
+
+
+def fake_clone(self, url):
+    """Stand-in for RepositoryManager.clone that builds a small local repo"""
+    with self._count_lock:
+        self.clone_count += 1
+        local_path = self.temp_dir / f"repo_{self.clone_count}"
+    local_path.mkdir()
+    for i in range(5):
+        (local_path / f"module_{i}.py").write_text("value = 1\n" * 50)
+    return str(local_path), True, ''
+
+
+def test_percentile_nearest_rank():
+    """p50/p95 follow the nearest-rank definition"""
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile(values, 100) == 20.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_stage_summary_and_breakdown():
+    """Spans are aggregated per stage and summed per repository"""
+    tracer = Tracer()
+    for i, duration in enumerate([1.0, 2.0, 3.0, 4.0]):
+        tracer.add('clone', 100.0 + i, duration, repo=URLS[i % 2])
+    tracer.add_metrics_timings(URLS[0], {'start': 200.0, 'pid': 7, 'tid': 8, 'count': 0.5, 'traverse': 0.25})
+    with tracer.span('excel_write'):
+        pass
+
+    summary = {stage['stage']: stage for stage in tracer.stage_summary()}
+    assert list(summary) == ['clone', 'traverse', 'count', 'similarity', 'grade', 'excel_write']
+    assert summary['clone']['count'] == 4
+    assert summary['clone']['total'] == 10.0
+    assert summary['clone']['p50'] == 2.0
+    assert summary['clone']['max'] == 4.0
+
+    breakdown = {row['repo']: row for row in tracer.repo_breakdown()}
+    assert breakdown[URLS[0]]['clone'] == 4.0
+    assert breakdown[URLS[0]]['count'] == 0.5
+    assert breakdown[URLS[1]]['clone'] == 6.0
+
+    # Metrics stages are laid out back to back from the calculation start
+    spans = [span for span in tracer.spans if span['pid'] == 7]
+    assert [(span['stage'], span['start']) for span in spans] == [
+        ('traverse', 200.0), ('count', 200.25), ('similarity', 200.75), ('grade', 200.75)
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_analyze_writes_timing_sheet_and_trace(tmp_path, monkeypatch, workers):
+    """A run produces a Timing sheet and a Chrome trace with spans for every repository"""
+    monkeypatch.setattr(progress_journal, 'JOURNAL_DIR', tmp_path / 'journals')
+    monkeypatch.setattr(RepositoryManager, 'clone', fake_clone)
+
+    input_path = tmp_path / 'input.xlsx'
+    wb = Workbook()
+    wb.active.append(['ID', 'URL', 'Status'])
+    for i, url in enumerate(URLS, start=1):
+        wb.active.append([i, url, 'ready'])
+    wb.save(input_path)
+
+    output_path = tmp_path / 'graded.xlsx'
+    RepositoryAnalyzer(workers=workers, use_cache=False).analyze(str(input_path), str(output_path))
+
+    rows = list(load_workbook(output_path)['Timing'].iter_rows(values_only=True))
+    assert rows[0][:6] == ('Stage', 'Spans', 'Total (s)', 'p50 (s)', 'p95 (s)', 'Max (s)')
+    stages = {row[0]: row[1] for row in rows[1:] if row and row[0] and not row[0].startswith('http')}
+    assert stages['clone'] == len(URLS)
+    assert stages['count'] == len(URLS)
+    assert {row[0] for row in rows if row and str(row[0]).startswith('http')} == set(URLS)
+
+    trace = json.loads(trace_path(output_path).read_text())
+    events = trace['traceEvents']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+    assert {event['args']['repo'] for event in events if event['name'] == 'count'} == set(URLS)
+    assert [event['name'] for event in events if event['cat'] == 'run'] == ['excel_write']
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
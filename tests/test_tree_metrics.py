@@ -0,0 +1,70 @@
+"""
+Tests for clone-free metrics read from git tree and blob objects.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from git import Repo
+
+from repo_analyzer.metrics_calculator import MetricsCalculator
+from repo_analyzer.mirror_cache import MirrorCache, HEAD_REF
+
+FILES = {
+    'main.py': 'import os\n\n\nprint(os.name)\n',
+    'crlf.js': 'let a = 1;\r\n\r\nlet b = 2;\r\n',
+    'old_mac.c': 'int a;\r\rint b;\r',
+    'long.java': 'class A {}\n' * 150,
+    'tabs.go': '\t\n   \npackage main\n \t \n',
+    'bom.ts': '\ufeff\nexport {}\n',
+    'latin1.rb': b'puts "caf\xe9"\n\n'.decode('latin-1'),
+    'src/pkg/util.py': 'def f():\n    return 1\n',
+    'node_modules/lib/index.js': 'module.exports = 1;\n',
+    'src/build/gen.py': 'x = 1\n',
+    'README.py': 'x = 1\n',
+    'notes.txt': 'not code\n',
+}
+
+
+def make_remote(path: Path) -> Repo:
+    """Create a local repository with one commit of FILES"""
+    repo = Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'Test')
+        config.set_value('user', 'email', 'test@example.com')
+    for name, content in FILES.items():
+        file_path = path / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        encoding = 'latin-1' if name == 'latin1.rb' else 'utf-8'
+        file_path.write_bytes(content.encode(encoding))
+    repo.index.add(list(FILES))
+    repo.index.commit('homework')
+    return repo
+
+
+def test_tree_metrics_match_checkout(tmp_path):
+    """Tree and checkout backends produce identical metrics"""
+    make_remote(tmp_path / 'remote')
+    cache = MirrorCache(cache_dir=str(tmp_path / 'mirrors'))
+    url = (tmp_path / 'remote').as_uri()
+
+    mirror = cache.fetch(url)
+    cache.extract(mirror, tmp_path / 'checkout')
+    calculator = MetricsCalculator()
+
+    from_files = calculator.calculate(str(tmp_path / 'checkout'))
+    from_tree = calculator.calculate_tree(str(mirror), HEAD_REF)
+
+    # Stage timings differ between runs
+    from_files.pop('timings')
+    from_tree.pop('timings')
+    assert from_tree == from_files
+    assert from_tree['total_files'] == 8
+    assert from_tree['files_under_130'] == 7
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,77 @@
+"""
+Tests for the streaming HTML engine of gmailagent.url_extractor.
+"""
+
+import random
+import sys
+import warnings
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gmailagent.url_extractor import URLExtractor
+
+# Markup the two engines must treat alike
+CASES = [
+    '<a href="https://github.com/a/b">repo</a> and https://github.com/c/d.',
+    '<p>see https://github.com/a/b</p><p>next</p>',  # Adjacent text nodes join
+    '<a href="https://x.com/?a=1&amp;b=2">x</a> <a href="/relative">r</a> <a href>e</a>',
+    '<script>var u = "https://script.com";</script><style>a{background:url(https://css.com)}</style>',
+    '<!-- https://comment.com --><![CDATA[https://cdata.com]]> <title>https://title.com</title>',
+    '<template><p>https://template.com</p></template><ruby>x<rt>https://rt.com</ruby> https://after.com',
+    '&lt;https://lt.com&gt; https://x.com/&foo;bar https://y.com/&copy;&#47;z (https://z.com)',
+    '<A HREF="HTTPS://UP.com">up</A><a href="https://d.com" href="https://e.com">dup</a><a href=https://u.com/>',
+    'unclosed <a href="https://open.com">https://text.com <script>https://never.com',
+]
+
+FUZZ_PIECES = [
+    '<p>', '</p>', '<a href="https://gh.com/a/b">', '</a>', 'https://github.com/x/y', ' see ',
+    '<script>', '"https://s.com"', '</script>', '<template>', '</template>', '<rt>', '</rt>',
+    '<!-- https://c.com -->', '<![CDATA[https://cd.com]]>', '&amp;', '&nbsp;', '&foo;', '&#150;',
+    '<br/>', '<template/>', 'https://x.org/q=1.', ' (https://y.org)', '<', '>', '</x>',
+]
+
+
+@pytest.fixture(autouse=True)
+def quiet_bs4():
+    """BeautifulSoup warns about markup that looks like a URL"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+@pytest.mark.parametrize('html', CASES)
+def test_stream_engine_matches_beautifulsoup(html):
+    """Both engines find the same URLs in the same order"""
+    expected = URLExtractor(engine='soup').extract_from_html(html)
+    assert URLExtractor().extract_from_html(html) == expected
+
+
+def test_stream_engine_matches_beautifulsoup_on_random_markup():
+    """Parity holds on fragments of markup in random order"""
+    rng = random.Random(0)
+    stream, soup = URLExtractor(), URLExtractor(engine='soup')
+    for _ in range(500):
+        html = ''.join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(1, 20)))
+        assert stream.extract_from_html(html) == soup.extract_from_html(html), html
+
+
+def test_extract_from_email_dedups_across_bodies():
+    """HTML URLs come first, plain-text duplicates are dropped"""
+    urls = URLExtractor().extract_from_email(
+        'Repo: https://github.com/a/b, docs https://docs.com',
+        '<a href="https://github.com/a/b">repo</a> https://github.com/a/b'
+    )
+    assert urls == ['https://github.com/a/b', 'https://docs.com']
+
+
+def test_unknown_engine():
+    """Engine names are validated"""
+    with pytest.raises(ValueError):
+        URLExtractor(engine='lxml')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))